@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+
+from fastapi.responses import JSONResponse
+
+from app.core.errors import build_error_body
+
+BROWSE = "browse"
+AUTH = "auth"
+CHECKOUT = "checkout"
+
+# Streams stay open for minutes and hold no connection, so they are not admitted per request.
+EXEMPT_PATHS = ("/health", "/metrics", "/docs", "/redoc", "/openapi.json", "/products/stream")
+
+
+@dataclass
+class RouteClass:
+    name: str
+    limit: int
+    queue_limit: int
+    queue_timeout: float
+    uses_reserve: bool = False
+    in_flight: int = 0
+    waiters: deque = field(default_factory=deque)
+
+
+def classify(method: str, path: str) -> str | None:
+    if path.startswith(EXEMPT_PATHS):
+        return None
+    if path.startswith("/auth"):
+        return AUTH
+    if path.startswith("/purchases") and method == "POST":
+        return CHECKOUT
+    if path.endswith("/reservation"):
+        return CHECKOUT
+    return BROWSE
+
+
+class AdmissionController:
+    # Runs on the event loop only, so plain counters are safe without locks.
+    def __init__(self, capacity: int, checkout_reserved: int, classes: list[RouteClass]):
+        self.capacity = capacity
+        self.checkout_reserved = checkout_reserved
+        self.classes = {route_class.name: route_class for route_class in classes}
+        self.in_flight = 0
+        self.rejected: dict[str, int] = {route_class.name: 0 for route_class in classes}
+
+    def _has_room(self, route_class: RouteClass) -> bool:
+        if route_class.in_flight >= route_class.limit:
+            return False
+        ceiling = self.capacity if route_class.uses_reserve else self.capacity - self.checkout_reserved
+        return self.in_flight < ceiling
+
+    def _grant(self, route_class: RouteClass) -> None:
+        route_class.in_flight += 1
+        self.in_flight += 1
+
+    async def acquire(self, name: str) -> bool:
+        route_class = self.classes[name]
+        if not route_class.waiters and self._has_room(route_class):
+            self._grant(route_class)
+            return True
+        if len(route_class.waiters) >= route_class.queue_limit:
+            self.rejected[name] += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        route_class.waiters.append(waiter)
+        try:
+            await asyncio.wait({waiter}, timeout=route_class.queue_timeout)
+        except asyncio.CancelledError:
+            if waiter.done():
+                self.release(name)
+            else:
+                waiter.cancel()
+                route_class.waiters.remove(waiter)
+            raise
+        if waiter.done():
+            return True
+        waiter.cancel()
+        route_class.waiters.remove(waiter)
+        self.rejected[name] += 1
+        return False
+
+    def release(self, name: str) -> None:
+        route_class = self.classes[name]
+        route_class.in_flight -= 1
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        # Reserved-capacity classes are served first so a browse backlog cannot starve them.
+        ordered = sorted(self.classes.values(), key=lambda route_class: not route_class.uses_reserve)
+        for route_class in ordered:
+            while route_class.waiters and self._has_room(route_class):
+                waiter = route_class.waiters.popleft()
+                if waiter.done():
+                    continue
+                self._grant(route_class)
+                waiter.set_result(True)
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, controller: AdmissionController, retry_after: int = 1):
+        self.app = app
+        self.controller = controller
+        self.retry_after = retry_after
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = classify(scope["method"], scope["path"])
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.controller.acquire(name):
+            body = build_error_body(
+                status_code=503,
+                message="Server is busy, please retry shortly",
+                path=scope["path"],
+                details={"route_class": name},
+                code="SERVICE_UNAVAILABLE",
+            )
+            response = JSONResponse(
+                status_code=503, content=body, headers={"Retry-After": str(self.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(name)
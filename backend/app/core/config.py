@@ -16,5 +16,83 @@ class Settings(BaseSettings):
     admin_password: str = "Admin1234!"
     admin_nickname: str = "market-admin"
 
+    metrics_enabled: bool = True
+    slow_query_threshold_ms: float | None = None
+    slow_query_log_size: int = 200
+    slow_query_explain_top: int = 20
+
+    admission_enabled: bool = True
+    admission_capacity: int = 15
+    admission_checkout_reserved: int = 4
+    admission_browse_limit: int = 11
+    admission_auth_limit: int = 4
+    admission_browse_queue: int = 64
+    admission_auth_queue: int = 16
+    admission_checkout_queue: int = 32
+    admission_browse_timeout_seconds: float = 0.5
+    admission_auth_timeout_seconds: float = 1.0
+    admission_checkout_timeout_seconds: float = 2.0
+    admission_retry_after_seconds: int = 1
+
+    reservation_minutes: int = 10
+    reservation_sweep_batch: int = 500
+    reservation_sweep_interval_seconds: float = 30.0
+
+    outbox_poll_interval_seconds: float = 1.0
+    outbox_batch_size: int = 500
+    outbox_retention_days: int = 7
+    changes_settle_seconds: float = 2.0
+
+    archive_enabled: bool = True
+    archive_after_days: int = 180
+    archive_batch_size: int = 500
+    archive_interval_seconds: float = 3600.0
+
+    moderation_chunk_size: int = 500
+    moderation_lease_seconds: float = 60.0
+    report_auto_blind_threshold: int = 5
+    duplicate_listing_policy: str = "flag"
+    duplicate_listing_threshold: float = 0.8
+    price_anomaly_enabled: bool = True
+    price_anomaly_threshold: float = 3.5
+    price_anomaly_min_samples: int = 30
+    price_anomaly_interval_seconds: float = 3600.0
+
+    idempotency_ttl_hours: int = 24
+    idempotency_cache_size: int = 10000
+    idempotency_wait_seconds: float = 10.0
+    idempotency_lock_timeout_seconds: float = 60.0
+
+    purchases_partitioned: bool = False
+    purchase_partitions_ahead: int = 3
+    purchase_partition_interval_seconds: float = 86400.0
+
+    facet_cache_size: int = 1024
+    facet_cache_ttl_seconds: float = 60.0
+    seller_cache_size: int = 10000
+    seller_cache_ttl_seconds: float = 300.0
+
+    like_flush_interval_seconds: float = 5.0
+    view_flush_interval_seconds: float = 5.0
+    popularity_half_life_hours: float = 24.0
+    popularity_window_days: int = 7
+    popularity_interval_seconds: float = 300.0
+
+    similar_items_enabled: bool = True
+    similar_items_dimensions: int = 128
+    similar_items_memory_mb: int = 320
+
+    suggest_enabled: bool = True
+    suggest_max_results: int = 10
+
+    saved_search_limit: int = 20
+    saved_search_queue_size: int = 10000
+    saved_search_batch_size: int = 100
+
+    pubsub_transport: str = "local"
+    stream_max_ids: int = 100
+    stream_max_pending: int = 64
+    stream_heartbeat_seconds: float = 15.0
+
 
 settings = Settings()
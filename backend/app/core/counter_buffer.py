@@ -0,0 +1,77 @@
+import logging
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class CounterBuffer:
+    # Per-worker write coalescing for hot counters: increments for the same key are
+    # merged in memory and written in one batch every interval, so a popular row is
+    # updated once per flush instead of once per event. A failed flush is merged
+    # back and retried; an unclean exit loses at most one interval of increments.
+    def __init__(
+        self, flush: Callable[[dict[Hashable, int]], None], interval: float, name: str = "counter-buffer"
+    ):
+        self._flush = flush
+        self.interval = interval
+        self.name = name
+        self._pending: defaultdict[Hashable, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def add(self, key: Hashable, delta: int) -> None:
+        with self._lock:
+            self._pending[key] += delta
+
+    def pending(self, key: Hashable) -> int:
+        with self._lock:
+            return self._pending.get(key, 0)
+
+    def discard(self, key: Hashable) -> None:
+        # For rows that are going away; their pending increments have nothing to land on.
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                deltas = {key: delta for key, delta in self._pending.items() if delta}
+                self._pending.clear()
+            if not deltas:
+                return 0
+            try:
+                self._flush(deltas)
+            except Exception:
+                with self._lock:
+                    for key, delta in deltas.items():
+                        self._pending[key] += delta
+                raise
+            return len(deltas)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("final %s flush failed", self.name)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("%s flush failed", self.name)
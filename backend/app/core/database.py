@@ -1,7 +1,18 @@
-from sqlalchemy import create_engine
+import math
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import current_request
 
 
 connect_args = {}
@@ -9,6 +20,23 @@ if settings.database_url.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
 
 engine = create_engine(settings.database_url, future=True, connect_args=connect_args)
+
+# Radius search evaluates the haversine formula in SQL. SQLite only ships these
+# with SQLITE_ENABLE_MATH_FUNCTIONS, so builds without them get Python ones.
+SQLITE_MATH_FUNCTIONS = {"sin": math.sin, "cos": math.cos, "radians": math.radians}
+
+
+def _install_math_functions(dbapi_connection, connection_record) -> None:
+    try:
+        dbapi_connection.execute("SELECT sin(0), cos(0), radians(0)").fetchall()
+    except sqlite3.OperationalError:
+        for name, function in SQLITE_MATH_FUNCTIONS.items():
+            dbapi_connection.create_function(name, 1, function, deterministic=True)
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _install_math_functions)
+
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 Base = declarative_base()
 
@@ -19,3 +47,95 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def _originating_method() -> str | None:
+    frame = sys._getframe(2)
+    service = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.repositories."):
+            return frame.f_code.co_qualname
+        if service is None and module.startswith("app.services."):
+            service = frame.f_code.co_qualname
+        frame = frame.f_back
+    return service
+
+
+class SlowQueryRecorder:
+    def __init__(self, threshold_ms: float, capacity: int, explain_top: int):
+        self.threshold = threshold_ms / 1000
+        self.explain_top = explain_top
+        self.entries: deque[dict] = deque(maxlen=capacity)
+        self._plans: dict[str, list[str]] = {}
+        self._worst: list[float] = []
+        self._lock = threading.Lock()
+        self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._local = threading.local()
+        self.engine: Engine | None = None
+
+    def install(self, target: Engine) -> None:
+        self.engine = target
+        event.listen(target, "before_cursor_execute", self._before)
+        event.listen(target, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._slow_query_started
+        if elapsed < self.threshold or getattr(self._local, "explaining", False):
+            return
+        request = current_request.get()
+        entry = {
+            "statement": statement,
+            "duration_ms": round(elapsed * 1000, 3),
+            "route": f"{request.method} {request.route}" if request else None,
+            "method": _originating_method(),
+            "captured_at": datetime.now(timezone.utc).isoformat(),
+            "plan": self._plans.get(statement),
+        }
+        self.entries.append(entry)
+        if not executemany and entry["plan"] is None and self._is_worst(elapsed):
+            self._explainer.submit(self._explain, entry, statement, parameters)
+
+    def _is_worst(self, elapsed: float) -> bool:
+        with self._lock:
+            if len(self._worst) < self.explain_top:
+                self._worst.append(elapsed)
+                self._worst.sort()
+                return True
+            if elapsed <= self._worst[0]:
+                return False
+            self._worst[0] = elapsed
+            self._worst.sort()
+            return True
+
+    def _explain(self, entry: dict, statement: str, parameters) -> None:
+        prefix = "EXPLAIN QUERY PLAN " if self.engine.dialect.name == "sqlite" else "EXPLAIN "
+        self._local.explaining = True
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.exec_driver_sql(prefix + statement, parameters).all()
+            plan = [" ".join(str(value) for value in row) for row in rows]
+        except Exception as exc:
+            plan = [f"EXPLAIN failed: {exc.__class__.__name__}"]
+        finally:
+            self._local.explaining = False
+        if len(self._plans) >= self.entries.maxlen:
+            self._plans.pop(next(iter(self._plans)))
+        self._plans[statement] = plan
+        entry["plan"] = plan
+
+    def snapshot(self) -> list[dict]:
+        return sorted(list(self.entries), key=lambda entry: entry["duration_ms"], reverse=True)
+
+
+slow_query_log: SlowQueryRecorder | None = None
+if settings.slow_query_threshold_ms is not None:
+    slow_query_log = SlowQueryRecorder(
+        settings.slow_query_threshold_ms,
+        settings.slow_query_log_size,
+        settings.slow_query_explain_top,
+    )
+    slow_query_log.install(engine)
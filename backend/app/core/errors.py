@@ -18,6 +18,8 @@ def _error_code_from_status(status_code: int) -> str:
         return "NOT_FOUND"
     if status_code == 409:
         return "CONFLICT"
+    if status_code == 410:
+        return "GONE"
     if status_code == 422:
         return "VALIDATION_ERROR"
     return "INTERNAL_SERVER_ERROR" if status_code >= 500 else "ERROR"
@@ -0,0 +1,127 @@
+import math
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_NEXT = {char: following for char, following in zip(_BASE32, _BASE32[1:])}
+_VALUES = {char: value for value, char in enumerate(_BASE32)}
+
+PRECISION = 9
+KM_PER_DEGREE = math.pi / 180 * 6371.0088
+
+
+def encode(latitude: float, longitude: float, precision: int = PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    value = 0
+    even = True
+    for bit in range(precision * 5):
+        bounds, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        if bit % 5 == 4:
+            chars.append(_BASE32[value])
+            value = 0
+    return "".join(chars)
+
+
+def decode_bounds(geohash: str) -> tuple[float, float, float, float]:
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _VALUES[char]
+        for shift in range(4, -1, -1):
+            bounds = lng_range if even else lat_range
+            middle = (bounds[0] + bounds[1]) / 2
+            if value >> shift & 1:
+                bounds[0] = middle
+            else:
+                bounds[1] = middle
+            even = not even
+    return lat_range[0], lat_range[1], lng_range[0], lng_range[1]
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    # (latitude, longitude) extent of one cell in degrees; longitude gets the odd bit.
+    bits = precision * 5
+    return 180 / 2 ** (bits // 2), 360 / 2 ** (bits - bits // 2)
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> tuple[float, float, float, float]:
+    lat_delta = radius_km / KM_PER_DEGREE
+    lng_delta = lat_delta / max(math.cos(math.radians(latitude)), 1e-6)
+    return (
+        max(latitude - lat_delta, -90.0),
+        min(latitude + lat_delta, 90.0),
+        max(longitude - lng_delta, -180.0),
+        min(longitude + lng_delta, 180.0),
+    )
+
+
+def covering_prefixes(latitude: float, longitude: float, radius_km: float, max_cells: int = 48) -> list[str]:
+    # The finest geohash cells that cover the circle's bounding box with at most
+    # max_cells cells. Sample points one cell apart hit every row and column.
+    south, north, west, east = bounding_box(latitude, longitude, radius_km)
+    precision = PRECISION
+    while precision > 1:
+        height, width = cell_size(precision)
+        if (math.ceil((north - south) / height) + 1) * (math.ceil((east - west) / width) + 1) <= max_cells:
+            break
+        precision -= 1
+    height, width = cell_size(precision)
+    prefixes = set()
+    lat = south
+    while True:
+        lng = west
+        while True:
+            prefixes.add(encode(min(lat, north), min(lng, east), precision))
+            if lng >= east:
+                break
+            lng += width
+        if lat >= north:
+            break
+        lat += height
+    return sorted(prefixes)
+
+
+def cover_circle(
+    latitude: float, longitude: float, radius_km: float, max_cells: int = 48
+) -> tuple[list[str], list[str]]:
+    # Splits the covering into cells wholly inside the circle, whose rows need no
+    # distance check, and boundary cells, whose rows do; cells outside it are dropped.
+    inside: list[str] = []
+    boundary: list[str] = []
+    for cell in covering_prefixes(latitude, longitude, radius_km, max_cells):
+        south, north, west, east = decode_bounds(cell)
+        nearest = distance_km(latitude, longitude, min(max(latitude, south), north), min(max(longitude, west), east))
+        if nearest > radius_km:
+            continue
+        # Over a cell the distance is convex along each axis, so its maximum is at a corner.
+        farthest = max(distance_km(latitude, longitude, lat, lng) for lat in (south, north) for lng in (west, east))
+        (inside if farthest <= radius_km else boundary).append(cell)
+    return inside, boundary
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    # Smallest geohash string above every hash starting with prefix, so a prefix
+    # match becomes an index range (geohash >= prefix AND geohash < bound).
+    while prefix and prefix[-1] == _BASE32[-1]:
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + _NEXT[prefix[-1]]
+
+
+def distance_km(latitude: float, longitude: float, other_latitude: float, other_longitude: float) -> float:
+    half_lat = math.sin(math.radians(other_latitude - latitude) / 2)
+    half_lng = math.sin(math.radians(other_longitude - longitude) / 2)
+    haversine = half_lat**2 + (
+        math.cos(math.radians(latitude)) * math.cos(math.radians(other_latitude)) * half_lng**2
+    )
+    return 2 * math.degrees(math.asin(min(1.0, math.sqrt(haversine)))) * KM_PER_DEGREE
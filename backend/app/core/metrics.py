@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+BACKGROUND_ROUTE = "<background>"
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestContext:
+    __slots__ = ("scope", "method", "statements", "db_seconds")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.method = scope.get("method", "")
+        self.statements = 0
+        self.db_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+current_request: ContextVar[RequestContext | None] = ContextVar("current_request", default=None)
+
+
+class _RouteStats:
+    __slots__ = (
+        "latency_buckets",
+        "latency_sum",
+        "count",
+        "statement_buckets",
+        "statements",
+        "db_seconds",
+        "status_counts",
+    )
+
+    def __init__(self):
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.count = 0
+        self.statement_buckets = [0] * (len(STATEMENT_BUCKETS) + 1)
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.status_counts: dict[int, int] = {}
+
+
+class _Shard:
+    __slots__ = ("routes",)
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str], _RouteStats] = {}
+
+    def stats(self, method: str, route: str) -> _RouteStats:
+        key = (method, route)
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = _RouteStats()
+        return stats
+
+
+# Each thread only ever writes its own shard, so the hot path takes no lock;
+# shards are summed when /metrics is scraped.
+class MetricsRegistry:
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: list[_Shard] = []
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            self._shards.append(shard)
+        return shard
+
+    def observe_request(self, ctx: RequestContext, status: int, seconds: float) -> None:
+        stats = self._shard().stats(ctx.method, ctx.route)
+        stats.count += 1
+        stats.latency_sum += seconds
+        stats.latency_buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        stats.statement_buckets[bisect_left(STATEMENT_BUCKETS, ctx.statements)] += 1
+        stats.statements += ctx.statements
+        stats.db_seconds += ctx.db_seconds
+        stats.status_counts[status] = stats.status_counts.get(status, 0) + 1
+
+    def observe_background_statement(self, seconds: float) -> None:
+        stats = self._shard().stats("", BACKGROUND_ROUTE)
+        stats.statements += 1
+        stats.db_seconds += seconds
+
+    def _aggregate(self) -> dict[tuple[str, str], _RouteStats]:
+        merged: dict[tuple[str, str], _RouteStats] = {}
+        for shard in list(self._shards):
+            for key, stats in list(shard.routes.items()):
+                total = merged.get(key)
+                if total is None:
+                    total = merged[key] = _RouteStats()
+                total.count += stats.count
+                total.latency_sum += stats.latency_sum
+                total.statements += stats.statements
+                total.db_seconds += stats.db_seconds
+                for index, value in enumerate(stats.latency_buckets):
+                    total.latency_buckets[index] += value
+                for index, value in enumerate(stats.statement_buckets):
+                    total.statement_buckets[index] += value
+                for status, value in list(stats.status_counts.items()):
+                    total.status_counts[status] = total.status_counts.get(status, 0) + value
+        return merged
+
+    def render(self) -> str:
+        merged = sorted(self._aggregate().items())
+        requests = [(key, stats) for key, stats in merged if key[1] != BACKGROUND_ROUTE]
+        lines = [
+            "# HELP http_requests_total Completed HTTP requests.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route), stats in requests:
+            for status, value in sorted(stats.status_counts.items()):
+                lines.append(
+                    f'http_requests_total{{method="{method}",route="{_escape(route)}",'
+                    f'status="{status}"}} {value}'
+                )
+
+        lines += [
+            "# HELP http_request_duration_seconds Request latency per route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), stats in requests:
+            labels = f'method="{method}",route="{_escape(route)}"'
+            lines += _histogram_lines(
+                "http_request_duration_seconds",
+                labels,
+                LATENCY_BUCKETS,
+                stats.latency_buckets,
+                stats.latency_sum,
+                stats.count,
+            )
+
+        lines += [
+            "# HELP http_request_db_statements SQL statements executed per request.",
+            "# TYPE http_request_db_statements histogram",
+        ]
+        for (method, route), stats in requests:
+            labels = f'method="{method}",route="{_escape(route)}"'
+            lines += _histogram_lines(
+                "http_request_db_statements",
+                labels,
+                STATEMENT_BUCKETS,
+                stats.statement_buckets,
+                stats.statements,
+                stats.count,
+            )
+
+        lines += [
+            "# HELP db_statements_total SQL statements executed, by originating route.",
+            "# TYPE db_statements_total counter",
+        ]
+        for (method, route), stats in merged:
+            lines.append(
+                f'db_statements_total{{method="{method}",route="{_escape(route)}"}} '
+                f"{stats.statements}"
+            )
+        lines += [
+            "# HELP db_statement_seconds_total Time spent in SQL statements, by originating route.",
+            "# TYPE db_statement_seconds_total counter",
+        ]
+        for (method, route), stats in merged:
+            lines.append(
+                f'db_statement_seconds_total{{method="{method}",route="{_escape(route)}"}} '
+                f"{stats.db_seconds:.6f}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        for shard in list(self._shards):
+            shard.routes.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _histogram_lines(name, labels, bounds, buckets, total, count) -> list[str]:
+    lines = []
+    cumulative = 0
+    for bound, value in zip(bounds, buckets):
+        cumulative += value
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+    lines.append(f"{name}_sum{{{labels}}} {round(total, 6)}")
+    lines.append(f"{name}_count{{{labels}}} {count}")
+    return lines
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(scope)
+        token = current_request.set(ctx)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            registry.observe_request(ctx, status, time.perf_counter() - started)
+            current_request.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_started
+    ctx = current_request.get()
+    if ctx is None:
+        registry.observe_background_statement(elapsed)
+        return
+    ctx.statements += 1
+    ctx.db_seconds += elapsed
+
+
+def instrument_engine(engine: Engine) -> None:
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,62 @@
+import zlib
+
+import numpy as np
+
+from app.core.text import normalize
+
+PERMUTATIONS = 128
+# 16 bands of 8 rows: pairs above ~0.8 Jaccard share a band with probability > 0.94,
+# pairs below 0.5 do so less than 6% of the time.
+BANDS = 16
+ROWS = PERMUTATIONS // BANDS
+SHINGLE_SIZE = 4
+
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Stored signatures and band keys depend on these draws, so the seed is fixed.
+_rng = np.random.default_rng(48)
+_A = _rng.integers(1, (1 << 61) - 1, size=(PERMUTATIONS, 1), dtype=np.uint64)
+_B = _rng.integers(0, (1 << 61) - 1, size=(PERMUTATIONS, 1), dtype=np.uint64)
+_ROW_MIX = _rng.integers(1, 1 << 63, size=ROWS, dtype=np.uint64) | np.uint64(1)
+_BAND_SALT = _rng.integers(0, 1 << 63, size=BANDS, dtype=np.uint64)
+
+
+def shingles(text: str) -> set[str]:
+    # Character shingles survive the small edits reposters make (a changed price,
+    # an extra emoji) better than whole words, and work for Korean without a tokenizer.
+    compact = " ".join(normalize(text).split())
+    if len(compact) <= SHINGLE_SIZE:
+        return {compact}
+    return {compact[start : start + SHINGLE_SIZE] for start in range(len(compact) - SHINGLE_SIZE + 1)}
+
+
+def signature(text: str) -> np.ndarray:
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(text)), dtype=np.uint64
+    )
+    # (a * x + b) mod p per permutation; the uint64 product wraps, which only
+    # reshuffles the hash family.
+    permuted = ((_A * hashes + _B) % _PRIME) & _MAX_HASH
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_keys(signatures: np.ndarray) -> np.ndarray:
+    # One signed 64-bit key per band (for BIGINT columns); works on a single
+    # signature or a (n, PERMUTATIONS) batch.
+    bands = signatures.astype(np.uint64).reshape(*signatures.shape[:-1], BANDS, ROWS)
+    keys = (bands * _ROW_MIX).sum(axis=-1, dtype=np.uint64) + _BAND_SALT
+    return keys.view(np.int64)
+
+
+def pack(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def unpack(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4")
+
+
+def similarity(signature: np.ndarray, others: np.ndarray) -> np.ndarray:
+    # Share of equal MinHash values estimates the Jaccard similarity of the shingle sets.
+    return (others == signature).mean(axis=-1)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ProductChange:
+    product_id: int
+    event: str
+    status: str | None = None
+    price: int | None = None
+    is_blinded: bool | None = None
+
+    @classmethod
+    def from_product(cls, product, event: str, **overrides) -> "ProductChange":
+        values = {"status": product.status, "price": product.price, "is_blinded": product.is_blinded}
+        values.update(overrides)
+        values["status"] = getattr(values["status"], "value", values["status"])
+        return cls(product_id=product.id, event=event, **values)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, payload: str) -> "ProductChange":
+        return cls(**json.loads(payload))
+
+
+class Subscription:
+    def __init__(self, product_ids: frozenset[int], loop: asyncio.AbstractEventLoop, max_pending: int):
+        self.product_ids = product_ids
+        self.loop = loop
+        self.queue: asyncio.Queue[ProductChange] = asyncio.Queue(maxsize=max_pending)
+        self.overflowed = False
+
+    def _put(self, change: ProductChange) -> None:
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            # Slow consumers are told to refetch instead of buffering without bound.
+            self.overflowed = True
+
+
+class LocalTransport:
+    def start(self, deliver) -> None:
+        self._deliver = deliver
+
+    def send(self, change: ProductChange) -> None:
+        self._deliver(change)
+
+    def stop(self) -> None:
+        pass
+
+
+class PostgresNotifyTransport:
+    channel = "product_changes"
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self, deliver) -> None:
+        self._deliver = deliver
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._listen, name="pubsub-listen", daemon=True)
+        self._thread.start()
+
+    def _listen(self) -> None:
+        import psycopg
+
+        dsn = self.engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        while not self._stopped.is_set():
+            try:
+                with psycopg.connect(dsn, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {self.channel}")
+                    while not self._stopped.is_set():
+                        for notify in conn.notifies(timeout=1.0):
+                            self._deliver(ProductChange.from_json(notify.payload))
+            except Exception:
+                logger.exception("product change listener failed; reconnecting")
+                self._stopped.wait(1.0)
+
+    def send(self, change: ProductChange) -> None:
+        from sqlalchemy import text
+
+        with self.engine.begin() as conn:
+            conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": change.to_json()},
+            )
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+class ProductChangeBroker:
+    def __init__(self, max_pending: int = 64):
+        self.max_pending = max_pending
+        self._by_product: dict[int, set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._transport = None
+        self.use_transport(LocalTransport())
+
+    def use_transport(self, transport) -> None:
+        if self._transport is not None:
+            self._transport.stop()
+        self._transport = transport
+        transport.start(self.dispatch)
+
+    def stop(self) -> None:
+        self.use_transport(LocalTransport())
+
+    def publish(self, change: ProductChange) -> None:
+        try:
+            self._transport.send(change)
+        except Exception:
+            # Change notifications are best effort; the write itself has already committed.
+            logger.exception("failed to publish product change %s", change)
+
+    def dispatch(self, change: ProductChange) -> None:
+        with self._lock:
+            subscribers = tuple(self._by_product.get(change.product_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, change)
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+    def subscribe(self, product_ids) -> Subscription:
+        subscription = Subscription(
+            frozenset(product_ids), asyncio.get_running_loop(), self.max_pending
+        )
+        with self._lock:
+            for product_id in subscription.product_ids:
+                self._by_product.setdefault(product_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for product_id in subscription.product_ids:
+                subscribers = self._by_product.get(product_id)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_product[product_id]
+
+    def subscriber_count(self, product_id: int) -> int:
+        return len(self._by_product.get(product_id, ()))
+
+
+broker = ProductChangeBroker(max_pending=settings.stream_max_pending)
@@ -0,0 +1,20 @@
+import re
+import unicodedata
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    return _WORD.findall(normalize(text))
+
+
+def fold(text: str) -> str:
+    # Decomposed, accent-free form for prefix matching: Hangul syllables become
+    # conjoining jamo, so a syllable still being composed ("자저") is a prefix
+    # of the finished word ("자전거").
+    decomposed = unicodedata.normalize("NFKD", normalize(text))
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
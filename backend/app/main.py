@@ -1,7 +1,16 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-
+from fastapi.responses import PlainTextResponse
+
+from app.core.admission import (
+    AUTH,
+    BROWSE,
+    CHECKOUT,
+    AdmissionController,
+    AdmissionMiddleware,
+    RouteClass,
+)
 from app.core.config import settings
 from app.core.database import Base, SessionLocal, engine
 from app.core.errors import (
@@ -10,13 +19,70 @@ from app.core.errors import (
     service_error_response,
     validation_error_response,
 )
+from app.core.metrics import MetricsMiddleware, instrument_engine, registry
+from app.core.pubsub import PostgresNotifyTransport, broker
 from app.core.security import hash_password
 from app.models import User, UserRole
-from app.routers import admin, auth, cart, products, purchases
+from app.models.entities import PARTITION_PURCHASES
+from app.routers import (
+    admin,
+    auth,
+    cart,
+    likes,
+    notifications,
+    products,
+    purchases,
+    saved_searches,
+    sellers,
+)
+from app.services.archive_service import product_archiver
 from app.services.errors import ServiceError
+from app.services.like_service import like_counter
+from app.services.moderation_service import moderation_runner
+from app.services.outbox_service import outbox_poller
+from app.services.partition_service import purchase_partitions
+from app.services.popularity_service import popularity_ranker, view_counter
+from app.services.price_anomaly_service import price_anomaly_job
+from app.services.recommendation_service import similar_items
+from app.services.reservation_service import reservation_sweeper
+from app.services.saved_search_service import saved_search_alerts
+from app.services.suggest_service import suggest_index
 
 app = FastAPI(title=settings.app_name)
 
+if settings.admission_enabled:
+    # Sized to the connection pool (5 + 10 overflow) so requests queue here, not on the pool.
+    admission = AdmissionController(
+        capacity=settings.admission_capacity,
+        checkout_reserved=settings.admission_checkout_reserved,
+        classes=[
+            RouteClass(
+                BROWSE,
+                limit=settings.admission_browse_limit,
+                queue_limit=settings.admission_browse_queue,
+                queue_timeout=settings.admission_browse_timeout_seconds,
+            ),
+            RouteClass(
+                AUTH,
+                limit=settings.admission_auth_limit,
+                queue_limit=settings.admission_auth_queue,
+                queue_timeout=settings.admission_auth_timeout_seconds,
+            ),
+            RouteClass(
+                CHECKOUT,
+                limit=settings.admission_capacity,
+                queue_limit=settings.admission_checkout_queue,
+                queue_timeout=settings.admission_checkout_timeout_seconds,
+                uses_reserve=True,
+            ),
+        ],
+    )
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission,
+        retry_after=settings.admission_retry_after_seconds,
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[origin.strip() for origin in settings.cors_origins.split(",") if origin.strip()],
@@ -25,10 +91,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.metrics_enabled:
+    instrument_engine(engine)
+    app.add_middleware(MetricsMiddleware)
+
 
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
+    if PARTITION_PURCHASES:
+        # Create this month's partition before the first checkout can insert.
+        purchase_partitions.run()
+        purchase_partitions.start()
 
     db = SessionLocal()
     try:
@@ -45,12 +119,51 @@ def on_startup():
     finally:
         db.close()
 
+    reservation_sweeper.start()
+    moderation_runner.resume()
+    outbox_poller.start()
+    saved_search_alerts.start()
+    like_counter.start()
+    view_counter.start()
+    popularity_ranker.start()
+    if settings.price_anomaly_enabled:
+        price_anomaly_job.start()
+    if settings.archive_enabled:
+        product_archiver.start()
+    if settings.similar_items_enabled:
+        similar_items.start()
+    if settings.suggest_enabled:
+        suggest_index.start()
+    if settings.pubsub_transport == "postgres":
+        broker.use_transport(PostgresNotifyTransport(engine))
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    reservation_sweeper.stop()
+    moderation_runner.stop()
+    outbox_poller.stop()
+    saved_search_alerts.stop()
+    # Flushes this worker's pending like and view counts before exit.
+    like_counter.stop()
+    view_counter.stop()
+    popularity_ranker.stop()
+    price_anomaly_job.stop()
+    product_archiver.stop()
+    purchase_partitions.stop()
+    broker.stop()
+
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.exception_handler(ServiceError)
 def handle_service_error(request: Request, exc: ServiceError):
     return service_error_response(request, exc)
@@ -73,6 +186,10 @@ def handle_internal_error(request: Request, _: Exception):
 
 app.include_router(auth.router)
 app.include_router(products.router)
+app.include_router(sellers.router)
 app.include_router(cart.router)
+app.include_router(likes.router)
 app.include_router(purchases.router)
+app.include_router(saved_searches.router)
+app.include_router(notifications.router)
 app.include_router(admin.router)
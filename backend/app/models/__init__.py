@@ -1,14 +1,59 @@
-from app.models.entities import CartItem, Product, ProductImage, Purchase, User
-from app.models.enums import ProductCategory, ProductCondition, ProductStatus, UserRole
+from app.models.entities import (
+    ArchivedProduct,
+    ArchivedProductImage,
+    CartItem,
+    IdempotencyKey,
+    ModerationJob,
+    Notification,
+    Product,
+    ProductEvent,
+    ProductImage,
+    ProductLike,
+    ProductReport,
+    ProductReportStats,
+    ProductSignature,
+    ProductSignatureBand,
+    ProductViewCount,
+    Purchase,
+    SavedSearch,
+    SellerStats,
+    User,
+)
+from app.models.enums import (
+    ModerationAction,
+    ModerationJobStatus,
+    ProductCategory,
+    ProductCondition,
+    ProductEventType,
+    ProductStatus,
+    UserRole,
+)
 
 __all__ = [
     "User",
     "Product",
     "ProductImage",
+    "ProductEvent",
+    "ArchivedProduct",
+    "ArchivedProductImage",
     "CartItem",
+    "ProductLike",
+    "ProductViewCount",
+    "ProductReport",
+    "ProductReportStats",
+    "ProductSignature",
+    "ProductSignatureBand",
     "Purchase",
+    "IdempotencyKey",
+    "ModerationJob",
+    "SavedSearch",
+    "SellerStats",
+    "Notification",
     "UserRole",
     "ProductCategory",
     "ProductCondition",
     "ProductStatus",
+    "ProductEventType",
+    "ModerationAction",
+    "ModerationJobStatus",
 ]
@@ -1,20 +1,34 @@
 from datetime import datetime
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     Numeric,
     String,
     Text,
     UniqueConstraint,
+    and_,
+    literal_column,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.config import settings
 from app.core.database import Base
-from app.models.enums import ProductCategory, ProductCondition, ProductStatus, UserRole
+from app.models.enums import (
+    ModerationAction,
+    ModerationJobStatus,
+    ProductCategory,
+    ProductCondition,
+    ProductStatus,
+    UserRole,
+)
 
 
 class User(Base):
@@ -27,7 +41,9 @@ class User(Base):
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), default=UserRole.USER)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
-    products: Mapped[list["Product"]] = relationship(back_populates="seller")
+    products: Mapped[list["Product"]] = relationship(
+        back_populates="seller", foreign_keys="Product.seller_id"
+    )
 
 
 class Product(Base):
@@ -47,13 +63,95 @@ class Product(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    reserved_by_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
+    reserved_until: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
+    # Denormalized from product_likes; written only by the like counter's batched flush.
+    like_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    # Decayed recent views, recomputed by the popularity ranker from product_view_counts.
+    popularity_score: Mapped[float] = mapped_column(Float, default=0.0, server_default="0")
+    # Robust z-score of log(price) within its category and condition; NULL until
+    # the group has enough listings. Strongly negative means priced far below market.
+    price_anomaly_score: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Optional pickup location. geohash (precision 9, about 5m) is derived from the
+    # coordinates and indexed so radius searches start from a few prefix ranges.
+    latitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    longitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    geohash: Mapped[str | None] = mapped_column(String(12), nullable=True)
 
-    seller: Mapped["User"] = relationship(back_populates="products")
+    seller: Mapped["User"] = relationship(back_populates="products", foreign_keys=[seller_id])
     images: Mapped[list["ProductImage"]] = relationship(
         back_populates="product", cascade="all, delete-orphan"
     )
 
 
+# Nearly every buyer-facing query wants listings that are on sale and visible. The
+# predicate is rendered with literals (the Enum column stores member names) so the
+# planner can match it against the partial indexes below even for prepared queries.
+BUYABLE_PRODUCT = and_(
+    Product.status == literal_column(f"'{ProductStatus.ON_SALE.name}'"),
+    Product.is_blinded.is_(False),
+)
+
+Index(
+    "ix_products_buyable_created",
+    Product.created_at,
+    postgresql_where=BUYABLE_PRODUCT,
+    sqlite_where=BUYABLE_PRODUCT,
+)
+Index(
+    "ix_products_buyable_category_created",
+    Product.category,
+    Product.created_at,
+    postgresql_where=BUYABLE_PRODUCT,
+    sqlite_where=BUYABLE_PRODUCT,
+)
+Index(
+    "ix_products_buyable_price",
+    Product.price,
+    postgresql_where=BUYABLE_PRODUCT,
+    sqlite_where=BUYABLE_PRODUCT,
+)
+Index(
+    "ix_products_buyable_popularity",
+    Product.popularity_score,
+    Product.created_at,
+    postgresql_where=BUYABLE_PRODUCT,
+    sqlite_where=BUYABLE_PRODUCT,
+)
+Index("ix_products_popularity", Product.popularity_score, Product.created_at)
+# Radius searches count and rank on this index alone: it carries the coordinates
+# for the exact distance check, and is_blinded leads so the visibility filter is
+# part of the range scan rather than a row lookup.
+Index("ix_products_geohash", Product.is_blinded, Product.geohash, Product.latitude, Product.longitude)
+Index(
+    "ix_products_buyable_price_anomaly",
+    Product.price_anomaly_score,
+    postgresql_where=BUYABLE_PRODUCT,
+    sqlite_where=BUYABLE_PRODUCT,
+)
+Index(
+    "ix_products_category_status_price",
+    Product.category,
+    Product.status,
+    Product.price,
+)
+Index(
+    "ix_products_seller_status_created",
+    Product.seller_id,
+    Product.status,
+    Product.created_at.desc(),
+    Product.id,
+)
+# Sold listings in sale order (updated_at is stamped by the sale), for the archiver.
+SOLD_PRODUCT = Product.status == literal_column(f"'{ProductStatus.SOLD.name}'")
+Index(
+    "ix_products_sold_updated",
+    Product.updated_at,
+    postgresql_where=SOLD_PRODUCT,
+    sqlite_where=SOLD_PRODUCT,
+)
+
+
 class ProductImage(Base):
     __tablename__ = "product_images"
 
@@ -64,6 +162,48 @@ class ProductImage(Base):
     product: Mapped["Product"] = relationship(back_populates="images")
 
 
+class ArchivedProduct(Base):
+    __tablename__ = "archived_products"
+
+    # Same columns and ids as products, so archived rows read like sold products.
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    seller_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    title: Mapped[str] = mapped_column(String(120))
+    price: Mapped[int] = mapped_column(Integer)
+    description: Mapped[str] = mapped_column(Text)
+    category: Mapped[ProductCategory] = mapped_column(Enum(ProductCategory))
+    condition: Mapped[ProductCondition] = mapped_column(Enum(ProductCondition))
+    status: Mapped[ProductStatus] = mapped_column(Enum(ProductStatus))
+    is_blinded: Mapped[bool] = mapped_column(Boolean, default=False)
+    blind_reason: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    updated_at: Mapped[datetime] = mapped_column(DateTime)
+    reserved_by_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    reserved_until: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    like_count: Mapped[int] = mapped_column(Integer, default=0)
+    popularity_score: Mapped[float] = mapped_column(Float, default=0.0)
+    price_anomaly_score: Mapped[float | None] = mapped_column(Float, nullable=True)
+    latitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    longitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    geohash: Mapped[str | None] = mapped_column(String(12), nullable=True)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    seller: Mapped["User"] = relationship(foreign_keys=[seller_id])
+    images: Mapped[list["ArchivedProductImage"]] = relationship(
+        cascade="all, delete-orphan", order_by="ArchivedProductImage.id"
+    )
+
+
+class ArchivedProductImage(Base):
+    __tablename__ = "archived_product_images"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("archived_products.id", ondelete="CASCADE"), index=True
+    )
+    image_url: Mapped[str] = mapped_column(String(500))
+
+
 class CartItem(Base):
     __tablename__ = "cart_items"
     __table_args__ = (UniqueConstraint("user_id", "product_id", name="uq_cart_user_product"),)
@@ -78,17 +218,201 @@ class CartItem(Base):
     product: Mapped["Product"] = relationship()
 
 
+class ProductLike(Base):
+    __tablename__ = "product_likes"
+    __table_args__ = (UniqueConstraint("user_id", "product_id", name="uq_like_user_product"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    product: Mapped["Product"] = relationship()
+
+
+class ProductReport(Base):
+    __tablename__ = "product_reports"
+    __table_args__ = (UniqueConstraint("product_id", "reporter_id", name="uq_report_product_reporter"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"))
+    reporter_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    reason: Mapped[str] = mapped_column(String(255))
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class ProductReportStats(Base):
+    __tablename__ = "product_report_stats"
+
+    # One row per reported product, bumped in the report's transaction. The
+    # moderation queue reads it through ix_report_stats_priority.
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    report_count: Mapped[int] = mapped_column(Integer, default=0)
+    last_reported_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    product: Mapped["Product"] = relationship()
+
+
+Index(
+    "ix_report_stats_priority",
+    ProductReportStats.report_count.desc(),
+    ProductReportStats.last_reported_at.desc(),
+)
+
+
+class ProductSignature(Base):
+    __tablename__ = "product_signatures"
+
+    # MinHash of title + description, packed as little-endian uint32 values.
+    # duplicate_of points at the oldest listing of the seller's duplicate cluster.
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    signature: Mapped[bytes] = mapped_column(LargeBinary)
+    duplicate_of: Mapped[int | None] = mapped_column(
+        ForeignKey("products.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+
+
+class ProductSignatureBand(Base):
+    __tablename__ = "product_signature_bands"
+    __table_args__ = (Index("ix_signature_bands_seller_bucket", "seller_id", "bucket"),)
+
+    # One row per LSH band; listings of a seller sharing a bucket are duplicate candidates.
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    bucket: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    seller_id: Mapped[int] = mapped_column(Integer)
+
+
+class ProductViewCount(Base):
+    __tablename__ = "product_view_counts"
+
+    # One row per product per hour; rows older than the popularity window are pruned.
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    hour: Mapped[datetime] = mapped_column(DateTime, primary_key=True, index=True)
+    views: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("user_id", "key", name="uq_idempotency_user_key"),)
+
+    # Claimed before the request runs; status_code stays NULL until its response is stored.
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    key: Mapped[str] = mapped_column(String(255))
+    request: Mapped[str] = mapped_column(String(255))
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_body: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+class ModerationJob(Base):
+    __tablename__ = "moderation_jobs"
+
+    # Bulk blind/unblind by id list or seller; progress is committed after every chunk.
+    # A worker runs a job only while it holds the lease (owner, lease_until).
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    action: Mapped[ModerationAction] = mapped_column(Enum(ModerationAction))
+    reason: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    seller_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    product_ids: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[ModerationJobStatus] = mapped_column(
+        Enum(ModerationJobStatus), default=ModerationJobStatus.PENDING, index=True
+    )
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    processed: Mapped[int] = mapped_column(Integer, default=0)
+    changed: Mapped[int] = mapped_column(Integer, default=0)
+    cart_items_removed: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    owner: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    lease_until: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_by: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+# Monthly range partitions on purchased_at (PostgreSQL only). Postgres requires the
+# partition key in the primary key, so it joins id there; the mapper keeps id alone.
+PARTITION_PURCHASES = settings.purchases_partitioned and settings.database_url.startswith("postgresql")
+
+
 class Purchase(Base):
     __tablename__ = "purchases"
+    __table_args__ = {"postgresql_partition_by": "RANGE (purchased_at)"} if PARTITION_PURCHASES else {}
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     buyer_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     seller_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
-    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), index=True)
+    # No foreign key: the product row moves to archived_products once it ages out.
+    product_id: Mapped[int] = mapped_column(Integer, index=True)
     quantity: Mapped[int] = mapped_column(Integer, default=1)
     amount: Mapped[int] = mapped_column(Integer)
-    purchased_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    purchased_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True, primary_key=PARTITION_PURCHASES
+    )
 
-    product: Mapped["Product"] = relationship()
+    __mapper_args__ = {"primary_key": [id]}
+
+    product: Mapped["Product | None"] = relationship(
+        primaryjoin="foreign(Purchase.product_id) == Product.id", viewonly=True
+    )
+    archived_product: Mapped["ArchivedProduct | None"] = relationship(
+        primaryjoin="foreign(Purchase.product_id) == ArchivedProduct.id", viewonly=True
+    )
     buyer: Mapped["User"] = relationship(foreign_keys=[buyer_id])
     seller: Mapped["User"] = relationship(foreign_keys=[seller_id])
+
+
+class ProductEvent(Base):
+    __tablename__ = "product_events"
+
+    # Outbox rows are written in the same transaction as the product change, so
+    # the id sequence is a commit-ordered log other workers can tail.
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    product_id: Mapped[int] = mapped_column(Integer, index=True)
+    seller_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    event_type: Mapped[str] = mapped_column(String(20))
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+class SellerStats(Base):
+    __tablename__ = "seller_stats"
+
+    # Maintained in the same transaction as the listing change; a missing row is
+    # backfilled from products the first time a seller's counts move.
+    seller_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    active_count: Mapped[int] = mapped_column(Integer, default=0)
+    sold_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class SavedSearch(Base):
+    __tablename__ = "saved_searches"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    keyword: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    category: Mapped[ProductCategory | None] = mapped_column(Enum(ProductCategory), nullable=True)
+    min_price: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    max_price: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class Notification(Base):
+    __tablename__ = "notifications"
+    __table_args__ = (Index("ix_notifications_user_id_id", "user_id", "id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), index=True)
+    saved_search_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    is_read: Mapped[bool] = mapped_column(Boolean, default=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    product: Mapped["Product"] = relationship()
@@ -23,3 +23,26 @@ class ProductCategory(str, Enum):
     HOME = "home"
     BOOKS = "books"
     ETC = "etc"
+
+
+class ProductEventType(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    BLINDED = "blinded"
+    UNBLINDED = "unblinded"
+    RESERVED = "reserved"
+    RELEASED = "released"
+    SOLD = "sold"
+    DELETED = "deleted"
+
+
+class ModerationAction(str, Enum):
+    BLIND = "blind"
+    UNBLIND = "unblind"
+
+
+class ModerationJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.models import (
+    ArchivedProduct,
+    ArchivedProductImage,
+    Product,
+    ProductImage,
+)
+from app.models.entities import SOLD_PRODUCT
+from app.repositories.product_repository import delete_dependents
+
+PRODUCT_COLUMNS = [column.name for column in Product.__table__.columns]
+IMAGE_COLUMNS = [column.name for column in ProductImage.__table__.columns]
+
+
+class ArchiveRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_id(self, product_id: int) -> ArchivedProduct | None:
+        return self.db.scalar(
+            select(ArchivedProduct)
+            .options(selectinload(ArchivedProduct.images), selectinload(ArchivedProduct.seller))
+            .where(ArchivedProduct.id == product_id)
+        )
+
+    def list_archivable_ids(self, sold_before: datetime, limit: int) -> list[int]:
+        # Oldest sales first through ix_products_sold_updated; moved rows drop out of
+        # the index, so an interrupted run simply resumes where it stopped.
+        return list(
+            self.db.scalars(
+                select(Product.id)
+                .where(SOLD_PRODUCT, Product.updated_at < sold_before)
+                .order_by(Product.updated_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).all()
+        )
+
+    def move(self, product_ids: list[int], archived_at: datetime) -> int:
+        self.db.execute(
+            insert(ArchivedProduct).from_select(
+                [*PRODUCT_COLUMNS, "archived_at"],
+                select(
+                    *[Product.__table__.c[name] for name in PRODUCT_COLUMNS], literal(archived_at)
+                ).where(Product.id.in_(product_ids)),
+            )
+        )
+        self.db.execute(
+            insert(ArchivedProductImage).from_select(
+                IMAGE_COLUMNS,
+                select(ProductImage.__table__).where(ProductImage.product_id.in_(product_ids)),
+            )
+        )
+        # Sold listings can still sit in other buyers' carts; they can never be bought.
+        delete_dependents(self.db, product_ids)
+        self.db.execute(delete(ProductImage).where(ProductImage.product_id.in_(product_ids)))
+        result = self.db.execute(delete(Product).where(Product.id.in_(product_ids)))
+        return result.rowcount
@@ -1,4 +1,4 @@
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session, selectinload
 
 from app.models import CartItem
@@ -47,3 +47,7 @@ class CartRepository:
 
     def delete(self, item: CartItem) -> None:
         self.db.delete(item)
+
+    def delete_by_products(self, product_ids: list[int]) -> int:
+        result = self.db.execute(delete(CartItem).where(CartItem.product_id.in_(product_ids)))
+        return result.rowcount
@@ -0,0 +1,88 @@
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session, selectinload
+
+from app.models import Product, ProductSignature, ProductSignatureBand, ProductStatus
+
+
+class DuplicateRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def find_candidates(
+        self, seller_id: int, buckets: list[int], exclude_id: int | None = None
+    ) -> list[tuple[int, bytes, int | None]]:
+        # Walks ix_signature_bands_seller_bucket once per band; sold listings are
+        # no longer competing with a repost and are skipped.
+        stmt = (
+            select(ProductSignature.product_id, ProductSignature.signature, ProductSignature.duplicate_of)
+            .join(ProductSignatureBand, ProductSignatureBand.product_id == ProductSignature.product_id)
+            .join(Product, Product.id == ProductSignature.product_id)
+            .where(
+                ProductSignatureBand.seller_id == seller_id,
+                ProductSignatureBand.bucket.in_(buckets),
+                Product.status != ProductStatus.SOLD,
+            )
+            .distinct()
+        )
+        if exclude_id is not None:
+            stmt = stmt.where(ProductSignature.product_id != exclude_id)
+        return [tuple(row) for row in self.db.execute(stmt)]
+
+    def add(
+        self, product_id: int, seller_id: int, signature: bytes, buckets: list[int], duplicate_of: int | None
+    ) -> None:
+        self.db.execute(
+            insert(ProductSignature).values(
+                product_id=product_id, signature=signature, duplicate_of=duplicate_of
+            )
+        )
+        self._add_bands(product_id, seller_id, buckets)
+
+    def replace(
+        self, product_id: int, seller_id: int, signature: bytes, buckets: list[int], duplicate_of: int | None
+    ) -> None:
+        result = self.db.execute(
+            update(ProductSignature)
+            .where(ProductSignature.product_id == product_id)
+            .values(signature=signature, duplicate_of=duplicate_of)
+        )
+        if result.rowcount == 0:
+            # Listed before duplicate detection was enabled.
+            self.add(product_id, seller_id, signature, buckets, duplicate_of)
+            return
+        self.db.execute(delete(ProductSignatureBand).where(ProductSignatureBand.product_id == product_id))
+        self._add_bands(product_id, seller_id, buckets)
+
+    def _add_bands(self, product_id: int, seller_id: int, buckets: list[int]) -> None:
+        self.db.execute(
+            insert(ProductSignatureBand),
+            [{"product_id": product_id, "seller_id": seller_id, "bucket": bucket} for bucket in buckets],
+        )
+
+    def list_clusters(self, limit: int) -> list[tuple[int, int]]:
+        # Largest clusters first; duplicates already blinded by moderators drop out.
+        size = func.count().label("size")
+        return [
+            (root_id, count)
+            for root_id, count in self.db.execute(
+                select(ProductSignature.duplicate_of, size)
+                .join(Product, Product.id == ProductSignature.product_id)
+                .where(ProductSignature.duplicate_of.is_not(None), Product.is_blinded.is_(False))
+                .group_by(ProductSignature.duplicate_of)
+                .order_by(size.desc(), ProductSignature.duplicate_of)
+                .limit(limit)
+            )
+        ]
+
+    def list_cluster_members(self, root_ids: list[int]) -> dict[int, list[Product]]:
+        members: dict[int, list[Product]] = {root_id: [] for root_id in root_ids}
+        rows = self.db.execute(
+            select(Product, ProductSignature.duplicate_of)
+            .join(ProductSignature, ProductSignature.product_id == Product.id)
+            .options(selectinload(Product.seller))
+            .where(or_(Product.id.in_(root_ids), ProductSignature.duplicate_of.in_(root_ids)))
+            .order_by(Product.id)
+        )
+        for product, duplicate_of in rows:
+            members[product.id if product.id in members else duplicate_of].append(product)
+        return members
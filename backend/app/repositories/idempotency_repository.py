@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import IdempotencyKey
+
+
+class IdempotencyRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def claim(self, user_id: int, key: str, request: str) -> bool:
+        try:
+            with self.db.begin_nested():
+                self.db.add(IdempotencyKey(user_id=user_id, key=key, request=request))
+        except IntegrityError:
+            return False
+        return True
+
+    def get(self, user_id: int, key: str) -> IdempotencyKey | None:
+        return self.db.scalar(
+            select(IdempotencyKey).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        )
+
+    def complete(self, user_id: int, key: str, status_code: int, response_body: str) -> None:
+        self.db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .values(status_code=status_code, response_body=response_body)
+        )
+
+    def release(self, user_id: int, key: str, created_at: datetime | None = None) -> None:
+        # With created_at, only that exact claim is removed, so a takeover of a stale
+        # claim cannot delete a newer one made concurrently.
+        stmt = delete(IdempotencyKey).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        if created_at is not None:
+            stmt = stmt.where(IdempotencyKey.created_at == created_at)
+        self.db.execute(stmt)
+
+    def release_unfinished(self, user_id: int, key: str) -> None:
+        self.db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.status_code.is_(None),
+            )
+        )
+
+    def delete_before(self, before: datetime) -> None:
+        self.db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < before))
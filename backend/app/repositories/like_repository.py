@@ -0,0 +1,69 @@
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from app.models import Product, ProductLike
+
+
+class LikeRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add(self, user_id: int, product_id: int) -> bool:
+        try:
+            with self.db.begin_nested():
+                self.db.add(ProductLike(user_id=user_id, product_id=product_id))
+        except IntegrityError:
+            return False
+        return True
+
+    def remove(self, user_id: int, product_id: int) -> bool:
+        result = self.db.execute(
+            delete(ProductLike).where(ProductLike.user_id == user_id, ProductLike.product_id == product_id)
+        )
+        return result.rowcount > 0
+
+    def exists(self, user_id: int, product_id: int) -> bool:
+        return (
+            self.db.scalar(
+                select(ProductLike.id).where(
+                    ProductLike.user_id == user_id, ProductLike.product_id == product_id
+                )
+            )
+            is not None
+        )
+
+    def stored_count(self, product_id: int) -> int:
+        return self.db.scalar(select(Product.like_count).where(Product.id == product_id)) or 0
+
+    def list_by_user(self, user_id: int, before_id: int | None, limit: int) -> list[ProductLike]:
+        # Newest first by like id, which also serves as the page cursor. Blinded
+        # listings are left out, as on the detail page.
+        stmt = (
+            select(ProductLike)
+            .join(Product, Product.id == ProductLike.product_id)
+            .options(
+                selectinload(ProductLike.product).selectinload(Product.images),
+                selectinload(ProductLike.product).selectinload(Product.seller),
+            )
+            .where(ProductLike.user_id == user_id, Product.is_blinded.is_(False))
+            .order_by(ProductLike.id.desc())
+            .limit(limit)
+        )
+        if before_id is not None:
+            stmt = stmt.where(ProductLike.id < before_id)
+        return list(self.db.scalars(stmt).all())
+
+    def apply_counts(self, deltas: dict[int, int]) -> None:
+        # One executemany in id order (so concurrent workers lock rows in the same
+        # order). updated_at is set to itself so its onupdate stamp does not fire:
+        # a like is not an edit and must not reorder change feeds or the archiver.
+        self.db.connection().execute(
+            update(Product.__table__)
+            .where(Product.__table__.c.id == bindparam("product_id"))
+            .values(
+                like_count=Product.__table__.c.like_count + bindparam("delta"),
+                updated_at=Product.__table__.c.updated_at,
+            ),
+            [{"product_id": product_id, "delta": delta} for product_id, delta in sorted(deltas.items())],
+        )
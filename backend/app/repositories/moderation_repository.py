@@ -0,0 +1,122 @@
+from datetime import datetime
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models import ModerationJob, ModerationJobStatus, Product
+
+
+class ModerationRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_job(self, job: ModerationJob) -> ModerationJob:
+        self.db.add(job)
+        self.db.flush()
+        return job
+
+    def get_job(self, job_id: int) -> ModerationJob | None:
+        return self.db.get(ModerationJob, job_id)
+
+    def _claimable(self, now: datetime):
+        # Pending, or running under a lease that expired or was released.
+        return or_(
+            ModerationJob.status == ModerationJobStatus.PENDING,
+            and_(
+                ModerationJob.status == ModerationJobStatus.RUNNING,
+                or_(ModerationJob.lease_until.is_(None), ModerationJob.lease_until < now),
+            ),
+        )
+
+    def list_claimable_job_ids(self, now: datetime) -> list[int]:
+        return list(
+            self.db.scalars(
+                select(ModerationJob.id).where(self._claimable(now)).order_by(ModerationJob.id)
+            ).all()
+        )
+
+    def claim_job(self, job_id: int, owner: str, now: datetime, lease_until: datetime) -> bool:
+        result = self.db.execute(
+            update(ModerationJob)
+            .where(ModerationJob.id == job_id, self._claimable(now))
+            .values(status=ModerationJobStatus.RUNNING, owner=owner, lease_until=lease_until)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def _owned(self, job_id: int, owner: str):
+        return update(ModerationJob).where(
+            ModerationJob.id == job_id,
+            ModerationJob.owner == owner,
+            ModerationJob.status == ModerationJobStatus.RUNNING,
+        )
+
+    def record_progress(
+        self, job_id: int, owner: str, lease_until: datetime, processed: int, changed: int, cart_items_removed: int
+    ) -> bool:
+        # Counters are incremented in SQL and only by the lease holder, which also renews the lease.
+        result = self.db.execute(
+            self._owned(job_id, owner)
+            .values(
+                processed=ModerationJob.processed + processed,
+                changed=ModerationJob.changed + changed,
+                cart_items_removed=ModerationJob.cart_items_removed + cart_items_removed,
+                lease_until=lease_until,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def release_job(self, job_id: int, owner: str) -> None:
+        self.db.execute(
+            self._owned(job_id, owner).values(lease_until=None).execution_options(synchronize_session=False)
+        )
+
+    def finish_job(self, job_id: int, owner: str, status: ModerationJobStatus, error: str | None = None) -> bool:
+        result = self.db.execute(
+            self._owned(job_id, owner)
+            .values(status=status, error=error, finished_at=datetime.utcnow(), lease_until=None)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def count_seller_candidates(self, seller_id: int, blinded: bool) -> int:
+        return self.db.scalar(
+            select(func.count())
+            .select_from(Product)
+            .where(Product.seller_id == seller_id, Product.is_blinded.is_(not blinded))
+        )
+
+    def _candidates(self):
+        return select(Product.id, Product.seller_id, Product.status, Product.price, Product.is_blinded)
+
+    def lock_by_ids(self, product_ids: list[int], blinded: bool) -> list:
+        # Only rows that actually change, so re-running a chunk is a no-op.
+        return list(
+            self.db.execute(
+                self._candidates()
+                .where(Product.id.in_(product_ids), Product.is_blinded.is_(not blinded))
+                .order_by(Product.id)
+                .with_for_update()
+            ).all()
+        )
+
+    def lock_next_by_seller(self, seller_id: int, blinded: bool, limit: int) -> list:
+        # Changed rows drop out of the predicate, so each call continues where the last stopped.
+        return list(
+            self.db.execute(
+                self._candidates()
+                .where(Product.seller_id == seller_id, Product.is_blinded.is_(not blinded))
+                .order_by(Product.id)
+                .limit(limit)
+                .with_for_update()
+            ).all()
+        )
+
+    def set_blinded(self, product_ids: list[int], blinded: bool, reason: str | None) -> None:
+        self.db.execute(
+            update(Product)
+            .where(Product.id.in_(product_ids))
+            .values(is_blinded=blinded, blind_reason=reason if blinded else None)
+            .execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+from sqlalchemy import func, insert, literal, select, update
+from sqlalchemy.orm import Session, selectinload
+
+from app.models import Notification, Product, SavedSearch
+
+
+class NotificationRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_for_matches(self, product_id: int, saved_search_ids: list[int]) -> int:
+        # Joining back to saved_searches drops searches deleted since they were
+        # indexed, and grouping sends one notification per user per product. A
+        # listing deleted while queued gets none.
+        matches = (
+            select(
+                SavedSearch.user_id,
+                literal(product_id),
+                func.min(SavedSearch.id),
+                literal(datetime.utcnow()),
+            )
+            .where(
+                SavedSearch.id.in_(saved_search_ids),
+                select(Product.id).where(Product.id == product_id).exists(),
+            )
+            .group_by(SavedSearch.user_id)
+        )
+        result = self.db.execute(
+            insert(Notification).from_select(
+                ["user_id", "product_id", "saved_search_id", "created_at"], matches
+            )
+        )
+        return result.rowcount
+
+    # Blinded listings drop out of the inbox and its unread count, as on the detail page.
+    def list_by_user(self, user_id: int, before_id: int | None, limit: int) -> list[Notification]:
+        stmt = (
+            select(Notification)
+            .join(Product, Product.id == Notification.product_id)
+            .options(selectinload(Notification.product).selectinload(Product.images))
+            .where(Notification.user_id == user_id, Product.is_blinded.is_(False))
+            .order_by(Notification.id.desc())
+            .limit(limit)
+        )
+        if before_id is not None:
+            stmt = stmt.where(Notification.id < before_id)
+        return list(self.db.scalars(stmt).all())
+
+    def count_unread(self, user_id: int) -> int:
+        return int(
+            self.db.scalar(
+                select(func.count(Notification.id))
+                .join(Product, Product.id == Notification.product_id)
+                .where(
+                    Notification.user_id == user_id,
+                    Notification.is_read.is_(False),
+                    Product.is_blinded.is_(False),
+                )
+            )
+            or 0
+        )
+
+    def mark_read(self, user_id: int, up_to_id: int) -> int:
+        result = self.db.execute(
+            update(Notification)
+            .where(
+                Notification.user_id == user_id,
+                Notification.id <= up_to_id,
+                Notification.is_read.is_(False),
+            )
+            .values(is_read=True)
+        )
+        return result.rowcount
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def month_partition_name(table: str, month: datetime) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def month_partition_ddl(table: str, month: datetime, next_month: datetime) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {month_partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{next_month:%Y-%m-%d}')"
+    )
+
+
+class PartitionRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def is_partitioned(self, table: str) -> bool:
+        return bool(
+            self.db.scalar(
+                text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+                {"table": table},
+            )
+        )
+
+    def list_partitions(self, table: str) -> set[str]:
+        return set(
+            self.db.scalars(
+                text(
+                    "SELECT child.relname FROM pg_inherits "
+                    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                    "WHERE pg_inherits.inhparent = to_regclass(:table)"
+                ),
+                {"table": table},
+            ).all()
+        )
+
+    def create_month(self, table: str, month: datetime, next_month: datetime) -> None:
+        self.db.execute(text(month_partition_ddl(table, month, next_month)))
+
+    def create_default(self, table: str) -> None:
+        self.db.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"))
@@ -0,0 +1,44 @@
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session, selectinload
+
+from app.models import Product
+from app.models.entities import BUYABLE_PRODUCT
+
+
+class PriceAnomalyRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load_prices(self) -> list[tuple]:
+        return self.db.execute(
+            select(
+                Product.id,
+                Product.category,
+                Product.condition,
+                Product.price,
+                Product.is_blinded,
+                Product.price_anomaly_score,
+            )
+        ).all()
+
+    def set_scores(self, scores: dict[int, float | None]) -> None:
+        # updated_at is kept as is: a new score is not an edit (see LikeRepository).
+        table = Product.__table__
+        self.db.connection().execute(
+            update(table)
+            .where(table.c.id == bindparam("product_id"))
+            .values(price_anomaly_score=bindparam("score"), updated_at=table.c.updated_at),
+            [{"product_id": product_id, "score": score} for product_id, score in sorted(scores.items())],
+        )
+
+    def list_below(self, score: float, limit: int) -> list[Product]:
+        # Walks ix_products_buyable_price_anomaly from the most underpriced listing.
+        return list(
+            self.db.scalars(
+                select(Product)
+                .options(selectinload(Product.seller))
+                .where(BUYABLE_PRODUCT, Product.price_anomaly_score <= score)
+                .order_by(Product.price_anomaly_score)
+                .limit(limit)
+            ).all()
+        )
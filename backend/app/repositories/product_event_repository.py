@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import ProductEvent, ProductEventType
+
+
+class ProductEventRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record(self, product_id: int, seller_id: int | None, event_type: ProductEventType) -> None:
+        # Flushed with the surrounding unit of work; never committed on its own.
+        self.db.add(
+            ProductEvent(product_id=product_id, seller_id=seller_id, event_type=event_type.value)
+        )
+
+    def record_many(self, events: list[tuple[int, int | None, ProductEventType]]) -> None:
+        if not events:
+            return
+        now = datetime.utcnow()
+        self.db.execute(
+            insert(ProductEvent),
+            [
+                {
+                    "product_id": product_id,
+                    "seller_id": seller_id,
+                    "event_type": event_type.value,
+                    "created_at": now,
+                }
+                for product_id, seller_id, event_type in events
+            ],
+        )
+
+    def last_id(self) -> int:
+        return self.db.scalar(select(func.max(ProductEvent.id))) or 0
+
+    def id_range(self) -> tuple[int | None, int | None]:
+        first_id, last_id = self.db.execute(select(func.min(ProductEvent.id), func.max(ProductEvent.id))).one()
+        return first_id, last_id
+
+    def list_changed_after(
+        self, cursor: int, settled_before: datetime, limit: int
+    ) -> list[tuple[int, int]]:
+        return list(
+            self.db.execute(
+                select(ProductEvent.id, ProductEvent.product_id)
+                .where(ProductEvent.id > cursor, ProductEvent.created_at <= settled_before)
+                .order_by(ProductEvent.id)
+                .limit(limit)
+            ).all()
+        )
+
+    def list_after(self, last_id: int, limit: int) -> list[ProductEvent]:
+        return list(
+            self.db.scalars(
+                select(ProductEvent)
+                .where(ProductEvent.id > last_id)
+                .order_by(ProductEvent.id)
+                .limit(limit)
+            ).all()
+        )
+
+    def list_by_ids(self, event_ids: list[int]) -> list[ProductEvent]:
+        return list(
+            self.db.scalars(
+                select(ProductEvent).where(ProductEvent.id.in_(event_ids)).order_by(ProductEvent.id)
+            ).all()
+        )
+
+    def delete_before(self, cutoff: datetime) -> int:
+        # The newest row always stays: it is the high-water mark change cursors are
+        # checked against, and it keeps SQLite from handing out its id again.
+        newest = select(func.max(ProductEvent.id)).scalar_subquery()
+        result = self.db.execute(
+            delete(ProductEvent).where(ProductEvent.created_at < cutoff, ProductEvent.id < newest)
+        )
+        return result.rowcount
@@ -1,10 +1,59 @@
 from __future__ import annotations
 
-from sqlalchemy import func, or_, select, update
+import math
+from datetime import datetime
+
+from sqlalchemy import ColumnElement, and_, delete, func, or_, select, union_all, update
 from sqlalchemy.orm import Session, selectinload
 
-from app.models import Product, ProductCategory, ProductImage
-from app.models.enums import ProductStatus
+from app.core.geohash import KM_PER_DEGREE, bounding_box, cover_circle, prefix_upper_bound
+from app.models import (
+    CartItem,
+    Notification,
+    Product,
+    ProductCategory,
+    ProductImage,
+    ProductLike,
+    ProductReport,
+    ProductReportStats,
+    ProductSignature,
+    ProductSignatureBand,
+    ProductViewCount,
+)
+from app.models.entities import BUYABLE_PRODUCT
+from app.models.enums import ProductCondition, ProductStatus
+
+
+def delete_dependents(db: Session, product_ids: list[int]) -> None:
+    # Rows keyed by a product that is being deleted or archived. There is no
+    # database-level cascade to rely on (SQLite does not enforce foreign keys),
+    # and SQLite hands the newest product's id out again, so anything left here
+    # would attach itself to the next listing.
+    db.execute(delete(CartItem).where(CartItem.product_id.in_(product_ids)))
+    db.execute(delete(Notification).where(Notification.product_id.in_(product_ids)))
+    db.execute(delete(ProductLike).where(ProductLike.product_id.in_(product_ids)))
+    db.execute(delete(ProductViewCount).where(ProductViewCount.product_id.in_(product_ids)))
+    db.execute(delete(ProductReport).where(ProductReport.product_id.in_(product_ids)))
+    db.execute(delete(ProductReportStats).where(ProductReportStats.product_id.in_(product_ids)))
+    db.execute(delete(ProductSignatureBand).where(ProductSignatureBand.product_id.in_(product_ids)))
+    db.execute(delete(ProductSignature).where(ProductSignature.product_id.in_(product_ids)))
+    db.execute(
+        update(ProductSignature)
+        .where(ProductSignature.duplicate_of.in_(product_ids))
+        .values(duplicate_of=None)
+    )
+
+
+def _merge_cells(prefixes: list[str]) -> list[tuple[str, str | None]]:
+    # Sorted cells that are also neighbours in hash order share one index range.
+    spans: list[tuple[str, str | None]] = []
+    for prefix in prefixes:
+        bound = prefix_upper_bound(prefix)
+        if spans and spans[-1][1] == prefix:
+            spans[-1] = (spans[-1][0], bound)
+        else:
+            spans.append((prefix, bound))
+    return spans
 
 
 class ProductRepository:
@@ -24,6 +73,54 @@ class ProductRepository:
             .where(Product.id == product_id)
         )
 
+    def list_by_ids(self, product_ids: list[int], with_seller: bool = False) -> list[Product]:
+        options = [selectinload(Product.images)]
+        if with_seller:
+            options.append(selectinload(Product.seller))
+        return list(
+            self.db.scalars(
+                select(Product).options(*options).where(Product.id.in_(product_ids)).order_by(Product.id)
+            ).all()
+        )
+
+    def _similarity_columns(self):
+        return select(
+            Product.id,
+            Product.category,
+            Product.title,
+            Product.description,
+            Product.status,
+            Product.is_blinded,
+        )
+
+    def get_similarity_source(self, product_id: int):
+        return self.db.execute(self._similarity_columns().where(Product.id == product_id)).first()
+
+    def list_similarity_source(self, product_ids: list[int]):
+        return self.db.execute(self._similarity_columns().where(Product.id.in_(product_ids))).all()
+
+    def iter_similarity_source(self, batch_size: int = 2000):
+        return self.db.execute(
+            self._similarity_columns()
+            .where(Product.status != ProductStatus.SOLD, Product.is_blinded.is_(False))
+            .order_by(Product.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+    def _suggest_columns(self):
+        return select(Product.id, Product.title, Product.status, Product.is_blinded)
+
+    def list_suggest_source(self, product_ids: list[int]):
+        return self.db.execute(self._suggest_columns().where(Product.id.in_(product_ids))).all()
+
+    def iter_suggest_source(self, batch_size: int = 5000):
+        return self.db.execute(
+            self._suggest_columns()
+            .where(Product.status != ProductStatus.SOLD, Product.is_blinded.is_(False))
+            .order_by(Product.id)
+            .execution_options(yield_per=batch_size)
+        )
+
     def get_for_update(self, product_id: int) -> Product | None:
         return self.db.scalar(
             select(Product)
@@ -32,16 +129,24 @@ class ProductRepository:
             .with_for_update()
         )
 
-    def list(
+    def get_availability(self, product_id: int):
+        return self.db.execute(
+            select(
+                Product.seller_id,
+                Product.status,
+                Product.is_blinded,
+                Product.reserved_by_id,
+                Product.reserved_until,
+            ).where(Product.id == product_id)
+        ).first()
+
+    def _base_filters(
         self,
-        *,
-        page: int,
-        page_size: int,
         keyword: str | None,
-        category: ProductCategory | None,
-        sort: str,
         include_blinded: bool,
-    ) -> tuple[int, list[Product]]:
+        min_price: int | None = None,
+        max_price: int | None = None,
+    ) -> list:
         filters = []
         if keyword:
             filters.append(
@@ -50,48 +155,280 @@ class ProductRepository:
                     Product.description.ilike(f"%{keyword}%"),
                 )
             )
-        if category:
-            filters.append(Product.category == category)
+        if min_price is not None:
+            filters.append(Product.price >= min_price)
+        if max_price is not None:
+            filters.append(Product.price <= max_price)
         if not include_blinded:
             filters.append(Product.is_blinded.is_(False))
+        return filters
+
+    def _geohash_range(self, low: str, high: str | None):
+        return Product.geohash >= low if high is None else and_(Product.geohash >= low, Product.geohash < high)
+
+    def _haversine(self, latitude: float, longitude: float) -> ColumnElement[float]:
+        # sin^2(dlat/2) + cos(lat1) cos(lat2) sin^2(dlng/2): the haversine of the
+        # central angle, which orders rows exactly like the great-circle distance.
+        half_lat = func.sin(func.radians(Product.latitude - latitude) / 2)
+        half_lng = func.sin(func.radians(Product.longitude - longitude) / 2)
+        return half_lat * half_lat + (
+            math.cos(math.radians(latitude)) * func.cos(func.radians(Product.latitude)) * half_lng * half_lng
+        )
+
+    def _nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        filters: list,
+        include_blinded: bool,
+        with_distance: bool = False,
+    ):
+        # One branch per index range of the circle's geohash covering; the ranges
+        # are disjoint, so UNION ALL is exact and every branch is a range scan on
+        # ix_products_geohash. Rows in cells wholly inside the circle match on the
+        # range alone; rows in boundary cells are also checked against the bounding
+        # box and the haversine term. Both read only index columns.
+        inside, boundary = cover_circle(latitude, longitude, radius_km)
+        south, north, west, east = bounding_box(latitude, longitude, radius_km)
+        haversine = self._haversine(latitude, longitude)
+        exact = [
+            Product.latitude.between(south, north),
+            Product.longitude.between(west, east),
+            haversine <= math.sin(math.radians(radius_km / KM_PER_DEGREE) / 2) ** 2,
+        ]
+        if include_blinded:
+            # The index leads with is_blinded; this keeps it usable for admin searches.
+            filters = [*filters, Product.is_blinded.in_([False, True])]
+        columns = [Product.id, haversine.label("distance")] if with_distance else [Product.id]
+        branches = [
+            select(*columns).where(self._geohash_range(low, high), *filters) for low, high in _merge_cells(inside)
+        ] + [
+            select(*columns).where(self._geohash_range(low, high), *exact, *filters)
+            for low, high in _merge_cells(boundary)
+        ]
+        return union_all(*branches) if len(branches) > 1 else branches[0]
 
-        sort_expr = Product.created_at.desc()
+    def _nearest_ids(
+        self,
+        near: tuple[float, float, float],
+        filters: list,
+        include_blinded: bool,
+        total: int,
+        needed: int,
+    ) -> list[int]:
+        # The nearest rows of the circle are the nearest rows of any smaller circle
+        # that holds enough of them. Start from the one expected to hold four pages'
+        # worth at the circle's average density and double it until it does, so the
+        # distance is computed for a few hundred rows rather than every match.
+        latitude, longitude, radius_km = near
+        radius = radius_km
+        if total > 4 * needed:
+            radius = radius_km * math.sqrt(4 * needed / total)
+        while True:
+            nearby = self._nearby(latitude, longitude, radius, filters, include_blinded, with_distance=True).subquery()
+            ids = list(
+                self.db.scalars(
+                    select(nearby.c.id).order_by(nearby.c.distance, nearby.c.id.desc()).limit(needed)
+                ).all()
+            )
+            if len(ids) == needed or radius >= radius_km:
+                return ids
+            radius = min(radius_km, radius * 2)
+
+    def list(
+        self,
+        *,
+        page: int,
+        page_size: int,
+        keyword: str | None,
+        category: ProductCategory | None,
+        sort: str,
+        include_blinded: bool,
+        min_price: int | None = None,
+        max_price: int | None = None,
+        condition: ProductCondition | None = None,
+        status: ProductStatus | None = None,
+        near: tuple[float, float, float] | None = None,
+    ) -> tuple[int, list[Product]]:
+        if status == ProductStatus.ON_SALE and not include_blinded:
+            # Spelled exactly like the partial index predicate so it can be used.
+            filters = self._base_filters(keyword, True, min_price, max_price)
+            filters.append(BUYABLE_PRODUCT)
+        else:
+            filters = self._base_filters(keyword, include_blinded, min_price, max_price)
+            if status:
+                filters.append(Product.status == status)
+        if category:
+            filters.append(Product.category == category)
+        if condition:
+            filters.append(Product.condition == condition)
+
+        sort_expr = [Product.created_at.desc()]
         if sort == "price_asc":
-            sort_expr = Product.price.asc()
+            sort_expr = [Product.price.asc()]
         elif sort == "price_desc":
-            sort_expr = Product.price.desc()
+            sort_expr = [Product.price.desc()]
+        elif sort == "popular":
+            # Matches ix_products_(buyable_)popularity scanned backwards; newer listings
+            # win ties, which keeps never-viewed products in latest order.
+            sort_expr = [Product.popularity_score.desc(), Product.created_at.desc()]
 
-        total_stmt = select(func.count(Product.id))
-        if filters:
-            total_stmt = total_stmt.where(*filters)
+        stmt = select(Product).options(selectinload(Product.images), selectinload(Product.seller))
+        offset = (page - 1) * page_size
 
-        stmt = (
-            select(Product)
-            .options(selectinload(Product.images), selectinload(Product.seller))
-            .order_by(sort_expr)
-            .offset((page - 1) * page_size)
-            .limit(page_size)
-        )
+        if near is not None:
+            nearby = self._nearby(*near, filters, include_blinded)
+            total = int(self.db.scalar(select(func.count()).select_from(nearby.subquery())) or 0)
+            if sort == "distance":
+                # Ties (listings at one spot) go newest first by id.
+                ids = self._nearest_ids(near, filters, include_blinded, total, offset + page_size)[offset:]
+                loaded = {product.id: product for product in self.db.scalars(stmt.where(Product.id.in_(ids)))}
+                return total, [loaded[product_id] for product_id in ids]
+            filters = [Product.id.in_(select(nearby.subquery().c.id))]
+        else:
+            total_stmt = select(func.count(Product.id))
+            if filters:
+                total_stmt = total_stmt.where(*filters)
+            total = int(self.db.scalar(total_stmt) or 0)
+
+        stmt = stmt.order_by(*sort_expr).offset(offset).limit(page_size)
         if filters:
             stmt = stmt.where(*filters)
-
-        total = int(self.db.scalar(total_stmt) or 0)
         items = list(self.db.scalars(stmt).all())
         return total, items
 
+    def list_by_seller(
+        self,
+        seller_id: int,
+        *,
+        status: ProductStatus | None,
+        include_blinded: bool,
+        after: tuple[datetime, int] | None,
+        limit: int,
+    ) -> list[Product]:
+        # Ordered like ix_products_seller_status_created (created_at DESC, id) so a
+        # page is a range scan from the cursor rather than an OFFSET.
+        filters = [Product.seller_id == seller_id]
+        if status:
+            filters.append(Product.status == status)
+        if not include_blinded:
+            filters.append(Product.is_blinded.is_(False))
+        if after:
+            created_at, product_id = after
+            filters.append(
+                or_(
+                    Product.created_at < created_at,
+                    and_(Product.created_at == created_at, Product.id > product_id),
+                )
+            )
+        return list(
+            self.db.scalars(
+                select(Product)
+                .options(selectinload(Product.images))
+                .where(*filters)
+                .order_by(Product.created_at.desc(), Product.id)
+                .limit(limit)
+            ).all()
+        )
+
+    def facet_counts(
+        self,
+        *,
+        keyword: str | None,
+        include_blinded: bool,
+        min_price: int | None = None,
+        max_price: int | None = None,
+    ):
+        filters = self._base_filters(keyword, include_blinded, min_price, max_price)
+        stmt = select(
+            Product.category, Product.condition, Product.status, func.count(Product.id)
+        ).group_by(Product.category, Product.condition, Product.status)
+        if filters:
+            stmt = stmt.where(*filters)
+        return [tuple(row) for row in self.db.execute(stmt).all()]
+
     def replace_images(self, product: Product, image_urls: list[str]) -> None:
         product.images.clear()
         for image_url in image_urls:
             product.images.append(ProductImage(image_url=image_url))
 
-    def mark_sold_if_available(self, product_id: int) -> bool:
+    def mark_sold_if_available(self, product_id: int, buyer_id: int | None = None) -> bool:
+        available = Product.status == ProductStatus.ON_SALE
+        if buyer_id is not None:
+            available = or_(
+                available,
+                and_(
+                    Product.status == ProductStatus.RESERVED,
+                    Product.reserved_by_id == buyer_id,
+                    Product.reserved_until > datetime.utcnow(),
+                ),
+            )
         result = self.db.execute(
             update(Product)
             .where(
                 Product.id == product_id,
-                Product.status == ProductStatus.ON_SALE,
+                available,
                 Product.is_blinded.is_(False),
             )
-            .values(status=ProductStatus.SOLD)
+            .values(status=ProductStatus.SOLD, reserved_by_id=None, reserved_until=None)
         )
         return bool(result.rowcount)
+
+    def reserve_if_available(self, product_id: int, user_id: int, until: datetime) -> bool:
+        result = self.db.execute(
+            update(Product)
+            .where(
+                Product.id == product_id,
+                Product.seller_id != user_id,
+                Product.is_blinded.is_(False),
+                # Only listings on sale: a holder reserving again must not push the expiry out.
+                Product.status == ProductStatus.ON_SALE,
+            )
+            .values(status=ProductStatus.RESERVED, reserved_by_id=user_id, reserved_until=until)
+        )
+        return bool(result.rowcount)
+
+    def release_reservation(self, product_id: int, user_id: int) -> bool:
+        result = self.db.execute(
+            update(Product)
+            .where(
+                Product.id == product_id,
+                Product.status == ProductStatus.RESERVED,
+                Product.reserved_by_id == user_id,
+            )
+            .values(status=ProductStatus.ON_SALE, reserved_by_id=None, reserved_until=None)
+        )
+        return bool(result.rowcount)
+
+    def release_expired_reservations(self, product_ids: list[int], now: datetime) -> list[int]:
+        return list(
+            self.db.scalars(
+                update(Product)
+                .where(
+                    Product.id.in_(product_ids),
+                    Product.status == ProductStatus.RESERVED,
+                    Product.reserved_until <= now,
+                )
+                .values(status=ProductStatus.ON_SALE, reserved_by_id=None, reserved_until=None)
+                .returning(Product.id)
+                .execution_options(synchronize_session=False)
+            ).all()
+        )
+
+    def list_expired_reservation_ids(self, now: datetime, limit: int) -> list[int]:
+        return list(
+            self.db.scalars(
+                select(Product.id)
+                .where(Product.reserved_until <= now, Product.status == ProductStatus.RESERVED)
+                .order_by(Product.reserved_until)
+                .limit(limit)
+            ).all()
+        )
+
+    def iter_reservation_deadlines(self, batch_size: int = 1000):
+        return self.db.execute(
+            select(Product.id, Product.reserved_until)
+            .where(Product.reserved_until.is_not(None))
+            .execution_options(yield_per=batch_size)
+        )
@@ -1,7 +1,9 @@
+from datetime import datetime
+
 from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 
-from app.models import Purchase
+from app.models import ArchivedProduct, Purchase
 
 
 class PurchaseRepository:
@@ -14,22 +16,34 @@ class PurchaseRepository:
         self.db.refresh(purchase)
         return purchase
 
-    def list_by_buyer(self, buyer_id: int) -> list[Purchase]:
-        return list(
-            self.db.scalars(
-                select(Purchase)
-                .options(selectinload(Purchase.product))
-                .where(Purchase.buyer_id == buyer_id)
-                .order_by(Purchase.purchased_at.desc())
-            ).all()
-        )
+    def _with_archived(self, purchases: list[Purchase]) -> list[Purchase]:
+        # Only purchases whose product has been archived need the second lookup; it
+        # lands in the identity map, so Purchase.archived_product resolves without SQL.
+        archived_ids = {purchase.product_id for purchase in purchases if purchase.product is None}
+        if archived_ids:
+            self.db.scalars(select(ArchivedProduct).where(ArchivedProduct.id.in_(archived_ids))).all()
+        return purchases
 
-    def list_by_seller(self, seller_id: int) -> list[Purchase]:
-        return list(
-            self.db.scalars(
-                select(Purchase)
-                .options(selectinload(Purchase.product))
-                .where(Purchase.seller_id == seller_id)
-                .order_by(Purchase.purchased_at.desc())
-            ).all()
+    def _list(self, condition, since: datetime | None, until: datetime | None) -> list[Purchase]:
+        stmt = (
+            select(Purchase)
+            .options(selectinload(Purchase.product))
+            .where(condition)
+            .order_by(Purchase.purchased_at.desc())
         )
+        # Bounds on purchased_at let PostgreSQL prune monthly partitions outside the range.
+        if since is not None:
+            stmt = stmt.where(Purchase.purchased_at >= since)
+        if until is not None:
+            stmt = stmt.where(Purchase.purchased_at < until)
+        return self._with_archived(list(self.db.scalars(stmt).all()))
+
+    def list_by_buyer(
+        self, buyer_id: int, since: datetime | None = None, until: datetime | None = None
+    ) -> list[Purchase]:
+        return self._list(Purchase.buyer_id == buyer_id, since, until)
+
+    def list_by_seller(
+        self, seller_id: int, since: datetime | None = None, until: datetime | None = None
+    ) -> list[Purchase]:
+        return self._list(Purchase.seller_id == seller_id, since, until)
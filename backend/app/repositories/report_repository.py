@@ -0,0 +1,78 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from app.models import Product, ProductReport, ProductReportStats
+
+
+class ReportRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add(self, report: ProductReport) -> bool:
+        try:
+            with self.db.begin_nested():
+                self.db.add(report)
+        except IntegrityError:
+            return False
+        return True
+
+    def increment(self, product_id: int, reported_at: datetime) -> int:
+        result = self.db.execute(
+            update(ProductReportStats)
+            .where(ProductReportStats.product_id == product_id)
+            .values(report_count=ProductReportStats.report_count + 1, last_reported_at=reported_at)
+        )
+        if result.rowcount == 0:
+            try:
+                with self.db.begin_nested():
+                    self.db.add(
+                        ProductReportStats(product_id=product_id, report_count=1, last_reported_at=reported_at)
+                    )
+                return 1
+            except IntegrityError:
+                # A concurrent first report created the row; count on top of it.
+                return self.increment(product_id, reported_at)
+        return self.count(product_id)
+
+    def count(self, product_id: int) -> int:
+        return (
+            self.db.scalar(
+                select(ProductReportStats.report_count).where(ProductReportStats.product_id == product_id)
+            )
+            or 0
+        )
+
+    def list_queue(self, limit: int) -> list[ProductReportStats]:
+        # Walks ix_report_stats_priority; blinded listings are already handled and skipped.
+        return list(
+            self.db.scalars(
+                select(ProductReportStats)
+                .join(Product, Product.id == ProductReportStats.product_id)
+                .options(selectinload(ProductReportStats.product).selectinload(Product.seller))
+                .where(Product.is_blinded.is_(False))
+                .order_by(ProductReportStats.report_count.desc(), ProductReportStats.last_reported_at.desc())
+                .limit(limit)
+            ).all()
+        )
+
+    def list_reasons(self, product_ids: list[int], per_product: int) -> dict[int, list[str]]:
+        reasons: dict[int, list[str]] = {product_id: [] for product_id in product_ids}
+        rows = self.db.execute(
+            select(ProductReport.product_id, ProductReport.reason)
+            .where(ProductReport.product_id.in_(product_ids))
+            .order_by(ProductReport.id.desc())
+        )
+        for product_id, reason in rows:
+            if len(reasons[product_id]) < per_product:
+                reasons[product_id].append(reason)
+        return reasons
+
+    def clear(self, product_id: int) -> bool:
+        self.db.execute(delete(ProductReport).where(ProductReport.product_id == product_id))
+        result = self.db.execute(
+            delete(ProductReportStats).where(ProductReportStats.product_id == product_id)
+        )
+        return result.rowcount > 0
@@ -0,0 +1,57 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import SavedSearch
+
+
+class SavedSearchRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, saved_search: SavedSearch) -> SavedSearch:
+        self.db.add(saved_search)
+        self.db.flush()
+        self.db.refresh(saved_search)
+        return saved_search
+
+    def get(self, user_id: int, saved_search_id: int) -> SavedSearch | None:
+        return self.db.scalar(
+            select(SavedSearch).where(SavedSearch.id == saved_search_id, SavedSearch.user_id == user_id)
+        )
+
+    def list_by_user(self, user_id: int) -> list[SavedSearch]:
+        return list(
+            self.db.scalars(
+                select(SavedSearch).where(SavedSearch.user_id == user_id).order_by(SavedSearch.id)
+            ).all()
+        )
+
+    def count_by_user(self, user_id: int) -> int:
+        return int(
+            self.db.scalar(select(func.count(SavedSearch.id)).where(SavedSearch.user_id == user_id))
+            or 0
+        )
+
+    def count_up_to(self, last_id: int) -> int:
+        return int(self.db.scalar(select(func.count(SavedSearch.id)).where(SavedSearch.id <= last_id)) or 0)
+
+    def ids_up_to(self, last_id: int) -> list[int]:
+        return list(self.db.scalars(select(SavedSearch.id).where(SavedSearch.id <= last_id)).all())
+
+    def delete(self, saved_search: SavedSearch) -> None:
+        self.db.delete(saved_search)
+
+    def iter_after(self, last_id: int, batch_size: int = 5000):
+        return self.db.execute(
+            select(
+                SavedSearch.id,
+                SavedSearch.user_id,
+                SavedSearch.keyword,
+                SavedSearch.category,
+                SavedSearch.min_price,
+                SavedSearch.max_price,
+            )
+            .where(SavedSearch.id > last_id)
+            .order_by(SavedSearch.id)
+            .execution_options(yield_per=batch_size)
+        )
@@ -0,0 +1,72 @@
+from sqlalchemy import func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import ArchivedProduct, Product, ProductStatus, SellerStats
+
+
+def listing_counts(status: ProductStatus, is_blinded: bool) -> tuple[int, int]:
+    # (active, sold) contribution of one listing: active means visible and unsold.
+    if status == ProductStatus.SOLD:
+        return 0, 1
+    return (0 if is_blinded else 1), 0
+
+
+class SellerStatsRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, seller_id: int) -> None:
+        self.db.add(SellerStats(seller_id=seller_id, active_count=0, sold_count=0))
+
+    def get(self, seller_id: int) -> SellerStats | None:
+        return self.db.get(SellerStats, seller_id)
+
+    def adjust(self, seller_id: int, active: int = 0, sold: int = 0) -> None:
+        if not active and not sold:
+            return
+        if self._increment(seller_id, active, sold):
+            return
+        # Sellers from before seller_stats existed: backfill from products, which
+        # already includes this transaction's change.
+        self.db.flush()
+        try:
+            with self.db.begin_nested():
+                self.db.execute(
+                    insert(SellerStats).from_select(
+                        ["seller_id", "active_count", "sold_count"], self._count_query(seller_id)
+                    )
+                )
+        except IntegrityError:
+            # Another transaction backfilled first; apply the change on top of its row.
+            self._increment(seller_id, active, sold)
+
+    def _increment(self, seller_id: int, active: int, sold: int) -> bool:
+        result = self.db.execute(
+            update(SellerStats)
+            .where(SellerStats.seller_id == seller_id)
+            .values(
+                active_count=SellerStats.active_count + active,
+                sold_count=SellerStats.sold_count + sold,
+            )
+        )
+        return result.rowcount > 0
+
+    def _count_query(self, seller_id: int):
+        sold = Product.status == ProductStatus.SOLD
+        # Archived rows are always sales that have left the products table.
+        archived = (
+            select(func.count())
+            .select_from(ArchivedProduct)
+            .where(ArchivedProduct.seller_id == seller_id)
+            .scalar_subquery()
+        )
+        return select(
+            literal(seller_id),
+            func.count().filter(~sold, Product.is_blinded.is_(False)),
+            func.count().filter(sold) + archived,
+        ).where(Product.seller_id == seller_id)
+
+    def count(self, seller_id: int) -> dict[str, int]:
+        _, active_count, sold_count = self.db.execute(self._count_query(seller_id)).one()
+        return {"active_count": active_count, "sold_count": sold_count}
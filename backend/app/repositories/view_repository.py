@@ -0,0 +1,53 @@
+from collections.abc import Iterator
+from datetime import datetime
+
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models import Product, ProductViewCount
+
+
+class ViewRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_views(self, hour: datetime, deltas: dict[int, int]) -> None:
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(ProductViewCount)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProductViewCount.product_id, ProductViewCount.hour],
+            set_={"views": ProductViewCount.views + stmt.excluded.views},
+        )
+        # Products deleted since the view was buffered would fail the foreign key.
+        existing = set(self.db.scalars(select(Product.id).where(Product.id.in_(deltas))).all())
+        rows = [
+            {"product_id": product_id, "hour": hour, "views": views}
+            for product_id, views in sorted(deltas.items())
+            if product_id in existing
+        ]
+        if rows:
+            self.db.execute(stmt, rows)
+
+    def iter_counts(self, since: datetime) -> Iterator[tuple[int, datetime, int]]:
+        yield from self.db.execute(
+            select(ProductViewCount.product_id, ProductViewCount.hour, ProductViewCount.views)
+            .where(ProductViewCount.hour >= since)
+            .execution_options(yield_per=5000)
+        )
+
+    def prune(self, before: datetime) -> None:
+        self.db.execute(delete(ProductViewCount).where(ProductViewCount.hour < before))
+
+    def list_scored_ids(self) -> set[int]:
+        return set(self.db.scalars(select(Product.id).where(Product.popularity_score > 0)).all())
+
+    def set_scores(self, scores: dict[int, float]) -> None:
+        # updated_at is kept as is: a new score is not an edit (see LikeRepository).
+        table = Product.__table__
+        self.db.connection().execute(
+            update(table)
+            .where(table.c.id == bindparam("product_id"))
+            .values(popularity_score=bindparam("score"), updated_at=table.c.updated_at),
+            [{"product_id": product_id, "score": score} for product_id, score in sorted(scores.items())],
+        )
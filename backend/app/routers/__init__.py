@@ -1,3 +1,23 @@
-from app.routers import admin, auth, cart, products, purchases
+from app.routers import (
+    admin,
+    auth,
+    cart,
+    likes,
+    notifications,
+    products,
+    purchases,
+    saved_searches,
+    sellers,
+)
 
-__all__ = ["auth", "products", "cart", "purchases", "admin"]
+__all__ = [
+    "auth",
+    "products",
+    "sellers",
+    "cart",
+    "likes",
+    "purchases",
+    "saved_searches",
+    "notifications",
+    "admin",
+]
@@ -1,25 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
+from app.core import database
 from app.core.database import get_db
+from app.models import ModerationAction, User
 from app.routers.deps import require_admin
-from app.schemas.admin import BlindRequest
+from app.schemas.admin import (
+    BlindRequest,
+    BulkBlindRequest,
+    BulkModerationRequest,
+    ModerationJobResponse,
+)
+from app.schemas.duplicate import DuplicateCluster, DuplicateClusterResponse, DuplicateListing
+from app.schemas.report import ReportQueueItem, ReportQueueResponse
+from app.services.duplicate_service import DuplicateService
 from app.services.errors import ServiceError
+from app.services.moderation_service import ModerationService
+from app.services.price_anomaly_service import PriceAnomalyService
 from app.services.product_service import ProductService
+from app.services.report_service import ReportService
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
 @router.get("/products")
-def list_all_products(db: Session = Depends(get_db), _: object = Depends(require_admin)):
-    total, items = ProductService(db).list(
-        page=1,
-        page_size=200,
-        keyword=None,
-        category=None,
-        sort="latest",
-        include_blinded=True,
-    )
+def list_all_products(
+    suspicious: bool = Query(default=False),
+    db: Session = Depends(get_db),
+    _: object = Depends(require_admin),
+):
+    if suspicious:
+        # Listings priced far below their category and condition, most extreme first.
+        items = PriceAnomalyService(db).outliers(200)
+        total = len(items)
+    else:
+        total, items = ProductService(db).list(
+            page=1,
+            page_size=200,
+            keyword=None,
+            category=None,
+            sort="latest",
+            include_blinded=True,
+        )
     return {
         "total": total,
         "items": [
@@ -30,6 +52,8 @@ def list_all_products(db: Session = Depends(get_db), _: object = Depends(require
                 "is_blinded": item.is_blinded,
                 "blind_reason": item.blind_reason,
                 "seller_nickname": item.seller.nickname,
+                "price": item.price,
+                "price_anomaly_score": item.price_anomaly_score,
             }
             for item in items
         ],
@@ -61,3 +85,121 @@ def unblind_product(
         return {"id": product.id, "is_blinded": product.is_blinded}
     except ServiceError as exc:
         raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
+
+@router.post("/products/bulk-blind", response_model=ModerationJobResponse, status_code=202)
+def bulk_blind_products(
+    payload: BulkBlindRequest,
+    db: Session = Depends(get_db),
+    admin: User = Depends(require_admin),
+):
+    try:
+        return ModerationService(db).submit(
+            admin.id,
+            ModerationAction.BLIND,
+            product_ids=payload.product_ids,
+            seller_id=payload.seller_id,
+            reason=payload.reason,
+        )
+    except ServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
+
+@router.post("/products/bulk-unblind", response_model=ModerationJobResponse, status_code=202)
+def bulk_unblind_products(
+    payload: BulkModerationRequest,
+    db: Session = Depends(get_db),
+    admin: User = Depends(require_admin),
+):
+    try:
+        return ModerationService(db).submit(
+            admin.id,
+            ModerationAction.UNBLIND,
+            product_ids=payload.product_ids,
+            seller_id=payload.seller_id,
+        )
+    except ServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
+
+@router.get("/moderation-jobs/{job_id}", response_model=ModerationJobResponse)
+def get_moderation_job(job_id: int, db: Session = Depends(get_db), _: object = Depends(require_admin)):
+    try:
+        return ModerationService(db).get_job(job_id)
+    except ServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
+
+@router.get("/reports", response_model=ReportQueueResponse)
+def report_queue(
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    _: object = Depends(require_admin),
+):
+    entries, reasons = ReportService(db).queue(limit)
+    return ReportQueueResponse(
+        items=[
+            ReportQueueItem(
+                product_id=entry.product_id,
+                title=entry.product.title,
+                seller_nickname=entry.product.seller.nickname,
+                report_count=entry.report_count,
+                last_reported_at=entry.last_reported_at,
+                recent_reasons=reasons[entry.product_id],
+            )
+            for entry in entries
+        ]
+    )
+
+
+@router.delete("/reports/{product_id}")
+def dismiss_reports(product_id: int, db: Session = Depends(get_db), _: object = Depends(require_admin)):
+    try:
+        ReportService(db).dismiss(product_id)
+        return {"product_id": product_id, "dismissed": True}
+    except ServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
+
+@router.get("/duplicates", response_model=DuplicateClusterResponse)
+def duplicate_clusters(
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    _: object = Depends(require_admin),
+):
+    clusters = DuplicateService(db).clusters(limit)
+    return DuplicateClusterResponse(
+        items=[
+            DuplicateCluster(
+                product_id=root_id,
+                seller_id=listings[0].seller_id,
+                seller_nickname=listings[0].seller.nickname,
+                size=len(listings),
+                listings=[
+                    DuplicateListing(
+                        id=item.id,
+                        title=item.title,
+                        price=item.price,
+                        status=item.status,
+                        is_blinded=item.is_blinded,
+                        created_at=item.created_at,
+                    )
+                    for item in listings
+                ],
+            )
+            for root_id, listings in clusters
+            if listings
+        ]
+    )
+
+
+@router.get("/db/slow-queries")
+def list_slow_queries(_: object = Depends(require_admin)):
+    recorder = database.slow_query_log
+    if recorder is None:
+        return {"enabled": False, "threshold_ms": None, "items": []}
+    return {
+        "enabled": True,
+        "threshold_ms": recorder.threshold * 1000,
+        "items": recorder.snapshot(),
+    }
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models import User
+from app.routers.deps import get_current_user
+from app.routers.products import to_summary
+from app.schemas.like import LikeListResponse, LikeResponse
+from app.services.errors import ServiceError
+from app.services.like_service import LikeService
+
+router = APIRouter(prefix="/likes", tags=["likes"])
+
+
+@router.get("", response_model=LikeListResponse)
+def list_likes(
+    before_id: int | None = Query(default=None, ge=1),
+    limit: int = Query(default=20, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    likes = LikeService(db).list(current_user.id, before_id, limit)
+    return LikeListResponse(
+        items=[to_summary(like.product) for like in likes],
+        next_before_id=likes[-1].id if len(likes) == limit else None,
+    )
+
+
+@router.put("/{product_id}", response_model=LikeResponse)
+def like_product(
+    product_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        like_count = LikeService(db).like(current_user.id, product_id)
+        return LikeResponse(product_id=product_id, liked=True, like_count=like_count)
+    except ServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
+
+@router.delete("/{product_id}", response_model=LikeResponse)
+def unlike_product(
+    product_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    like_count = LikeService(db).unlike(current_user.id, product_id)
+    return LikeResponse(product_id=product_id, liked=False, like_count=like_count)
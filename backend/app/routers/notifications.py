@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models import User
+from app.routers.deps import get_current_user
+from app.schemas.saved_search import (
+    NotificationListResponse,
+    NotificationReadRequest,
+    NotificationResponse,
+)
+from app.services.saved_search_service import NotificationService
+
+router = APIRouter(prefix="/notifications", tags=["notifications"])
+
+
+@router.get("", response_model=NotificationListResponse)
+def list_notifications(
+    before_id: int | None = Query(default=None, ge=1),
+    limit: int = Query(default=20, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    items, unread_count = NotificationService(db).inbox(current_user.id, before_id, limit)
+    return NotificationListResponse(
+        items=[
+            NotificationResponse(
+                id=item.id,
+                saved_search_id=item.saved_search_id,
+                product_id=item.product_id,
+                title=item.product.title,
+                price=item.product.price,
+                status=item.product.status,
+                thumbnail_url=item.product.images[0].image_url if item.product.images else None,
+                is_read=item.is_read,
+                created_at=item.created_at,
+            )
+            for item in items
+        ],
+        unread_count=unread_count,
+        next_before_id=items[-1].id if len(items) == limit else None,
+    )
+
+
+@router.post("/read")
+def mark_notifications_read(
+    payload: NotificationReadRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    updated = NotificationService(db).mark_read(current_user.id, payload.up_to_id)
+    return {"updated": updated}
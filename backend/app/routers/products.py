@@ -1,24 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.models import ProductCategory, User
-from app.models.enums import UserRole
+from app.core.geohash import distance_km
+from app.core.pubsub import broker
+from app.models import ProductCategory, ProductCondition, User
+from app.models.enums import ProductStatus, UserRole
 from app.routers.deps import get_current_user, get_current_user_optional
 from app.schemas.product import (
+    ProductChangeItem,
+    ProductChangesResponse,
     ProductCreate,
     ProductDetail,
     ProductListResponse,
+    ProductSuggestion,
     ProductSummary,
     ProductUpdate,
+    ReservationResponse,
 )
+from app.schemas.report import ReportCreate, ReportResponse
 from app.services.errors import ServiceError
-from app.services.product_service import ProductService
+from app.services.product_service import FACET_FIELDS, ProductService
+from app.services.recommendation_service import RecommendationService
+from app.services.report_service import ReportService
+from app.services.reservation_service import ReservationService
+from app.services.suggest_service import SuggestService
 
 router = APIRouter(prefix="/products", tags=["products"])
 
 
-def to_summary(item) -> ProductSummary:
+def to_summary(item, seller_nickname: str | None = None, distance_km: float | None = None) -> ProductSummary:
     return ProductSummary(
         id=item.id,
         title=item.title,
@@ -27,8 +43,10 @@ def to_summary(item) -> ProductSummary:
         condition=item.condition,
         status=item.status,
         is_blinded=item.is_blinded,
-        seller_nickname=item.seller.nickname,
+        seller_nickname=seller_nickname or item.seller.nickname,
         thumbnail_url=item.images[0].image_url if item.images else None,
+        like_count=item.like_count,
+        distance_km=distance_km,
         created_at=item.created_at,
     )
 
@@ -47,6 +65,10 @@ def to_detail(item) -> ProductDetail:
         seller_id=item.seller_id,
         seller_nickname=item.seller.nickname,
         image_urls=[image.image_url for image in item.images],
+        reserved_until=item.reserved_until,
+        like_count=item.like_count,
+        latitude=item.latitude,
+        longitude=item.longitude,
         created_at=item.created_at,
         updated_at=item.updated_at,
     )
@@ -65,31 +87,181 @@ def create_product(
         raise HTTPException(status_code=exc.status_code, detail=exc.message)
 
 
+def parse_facet_fields(facets: str | None) -> list[str]:
+    if not facets:
+        return []
+    fields = list(dict.fromkeys(field.strip() for field in facets.split(",") if field.strip()))
+    unknown = [field for field in fields if field not in FACET_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown facet: {', '.join(unknown)}")
+    return fields
+
+
 @router.get("", response_model=ProductListResponse)
 def list_products(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=10, ge=1, le=50),
     keyword: str | None = Query(default=None),
     category: ProductCategory | None = Query(default=None),
-    sort: str = Query(default="latest", pattern="^(latest|price_asc|price_desc)$"),
+    condition: ProductCondition | None = Query(default=None),
+    status: ProductStatus | None = Query(default=None),
+    min_price: int | None = Query(default=None, ge=0),
+    max_price: int | None = Query(default=None, ge=0),
+    sort: str = Query(default="latest", pattern="^(latest|price_asc|price_desc|popular|distance)$"),
+    lat: float | None = Query(default=None, ge=-90, le=90),
+    lng: float | None = Query(default=None, ge=-180, le=180),
+    radius_km: float | None = Query(default=None, gt=0, le=100),
+    facets: str | None = Query(default=None, description="Comma separated: category,condition,status"),
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
 ):
+    facet_fields = parse_facet_fields(facets)
     service = ProductService(db)
     include_blinded = bool(current_user and current_user.role == UserRole.ADMIN)
-    total, items = service.list(
-        page=page,
-        page_size=page_size,
-        keyword=keyword,
-        category=category,
-        sort=sort,
-        include_blinded=include_blinded,
-    )
+    try:
+        total, items = service.list(
+            page=page,
+            page_size=page_size,
+            keyword=keyword,
+            category=category,
+            sort=sort,
+            include_blinded=include_blinded,
+            min_price=min_price,
+            max_price=max_price,
+            condition=condition,
+            status=status,
+            latitude=lat,
+            longitude=lng,
+            radius_km=radius_km,
+        )
+    except ServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+    summaries = [
+        to_summary(
+            item,
+            distance_km=round(distance_km(lat, lng, item.latitude, item.longitude), 3)
+            if radius_km is not None
+            else None,
+        )
+        for item in items
+    ]
+    facet_counts = None
+    if facet_fields:
+        facet_counts = service.facets(
+            facet_fields,
+            keyword=keyword,
+            include_blinded=include_blinded,
+            selected={"category": category, "condition": condition, "status": status},
+            min_price=min_price,
+            max_price=max_price,
+        )
     return ProductListResponse(
         total=total,
         page=page,
         page_size=page_size,
-        items=[to_summary(item) for item in items],
+        items=summaries,
+        facets=facet_counts,
+    )
+
+
+@router.get("/changes", response_model=ProductChangesResponse)
+def list_product_changes(
+    since: int | None = Query(default=None, ge=0),
+    limit: int = Query(default=500, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_optional),
+):
+    service = ProductService(db)
+    # Sequence ids are allocated before commit, so the newest events are held back
+    # briefly; otherwise a slower transaction could land behind the client's cursor.
+    settled_before = datetime.utcnow() - timedelta(seconds=settings.changes_settle_seconds)
+    try:
+        cursor, has_more, items, deleted_ids = service.changes(
+            since=since,
+            limit=limit,
+            include_blinded=bool(current_user and current_user.role == UserRole.ADMIN),
+            settled_before=settled_before,
+        )
+    except ServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+    return ProductChangesResponse(
+        cursor=cursor,
+        has_more=has_more,
+        items=[
+            ProductChangeItem(
+                id=item.id,
+                seller_id=item.seller_id,
+                title=item.title,
+                price=item.price,
+                category=item.category,
+                condition=item.condition,
+                status=item.status,
+                thumbnail_url=item.images[0].image_url if item.images else None,
+                updated_at=item.updated_at,
+            )
+            for item in items
+        ],
+        deleted_ids=deleted_ids,
+    )
+
+
+@router.get("/suggest", response_model=list[ProductSuggestion])
+def suggest_products(
+    q: str = Query(default="", max_length=100),
+    limit: int = Query(default=settings.suggest_max_results, ge=1, le=settings.suggest_max_results),
+):
+    return [
+        ProductSuggestion(id=item.product_id, title=item.title) for item in SuggestService().suggest(q, limit)
+    ]
+
+
+def parse_stream_ids(ids: str) -> list[int]:
+    try:
+        product_ids = sorted({int(value) for value in ids.split(",") if value.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma separated integers")
+    if not product_ids:
+        raise HTTPException(status_code=400, detail="At least one product id is required")
+    if len(product_ids) > settings.stream_max_ids:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.stream_max_ids} product ids per stream"
+        )
+    return product_ids
+
+
+@router.get("/stream")
+async def stream_product_changes(request: Request, ids: str = Query(...)):
+    product_ids = parse_stream_ids(ids)
+
+    async def events():
+        subscription = broker.subscribe(product_ids)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    change = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.stream_heartbeat_seconds
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"
+                    continue
+                if subscription.overflowed:
+                    # Events were dropped; the client refetches the products instead.
+                    subscription.overflowed = False
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    yield "event: resync\ndata: {}\n\n"
+                    continue
+                yield f"event: {change.event}\ndata: {change.to_json()}\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -101,16 +273,29 @@ def get_product(
 ):
     service = ProductService(db)
     try:
-        product = service.get(product_id)
-        if product.is_blinded and (
-            not current_user or current_user.role != UserRole.ADMIN
-        ):
-            raise HTTPException(status_code=403, detail="Blinded product")
+        product = service.view(
+            product_id, include_blinded=bool(current_user and current_user.role == UserRole.ADMIN)
+        )
         return to_detail(product)
     except ServiceError as exc:
         raise HTTPException(status_code=exc.status_code, detail=exc.message)
 
 
+@router.get("/{product_id}/similar", response_model=list[ProductSummary])
+def similar_products(
+    product_id: int,
+    limit: int = Query(default=10, ge=1, le=30),
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_optional),
+):
+    service = RecommendationService(db)
+    include_blinded = bool(current_user and current_user.role == UserRole.ADMIN)
+    try:
+        return [to_summary(item) for item in service.similar(product_id, limit, include_blinded)]
+    except ServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
+
 @router.patch("/{product_id}", response_model=ProductDetail)
 def update_product(
     product_id: int,
@@ -137,3 +322,47 @@ def delete_product(
         return {"message": "Product deleted"}
     except ServiceError as exc:
         raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
+
+@router.post("/{product_id}/reservation", response_model=ReservationResponse)
+def reserve_product(
+    product_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        until = ReservationService(db).reserve(current_user.id, product_id)
+        return ReservationResponse(
+            product_id=product_id, status=ProductStatus.RESERVED, reserved_until=until
+        )
+    except ServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
+
+@router.delete("/{product_id}/reservation", response_model=ReservationResponse)
+def release_reservation(
+    product_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        ReservationService(db).release(current_user.id, product_id)
+        return ReservationResponse(
+            product_id=product_id, status=ProductStatus.ON_SALE, reserved_until=None
+        )
+    except ServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
+
+@router.post("/{product_id}/reports", response_model=ReportResponse)
+def report_product(
+    product_id: int,
+    payload: ReportCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        report_count, is_blinded = ReportService(db).report(current_user.id, product_id, payload.reason)
+        return ReportResponse(product_id=product_id, report_count=report_count, is_blinded=is_blinded)
+    except ServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
@@ -1,74 +1,101 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.models import User
+from app.models import Purchase, User
 from app.routers.deps import get_current_user
 from app.schemas.purchase import PurchaseResponse
 from app.services.errors import ServiceError
+from app.services.idempotency_service import IdempotencyService
 from app.services.purchase_service import PurchaseService
 
 router = APIRouter(prefix="/purchases", tags=["purchases"])
 
 
+def to_item(purchase) -> dict:
+    product = purchase.product or purchase.archived_product
+    return {
+        "id": purchase.id,
+        "product_id": purchase.product_id,
+        "product_title": product.title,
+        "quantity": purchase.quantity,
+        "amount": purchase.amount,
+        "purchased_at": purchase.purchased_at,
+    }
+
+
+def run_idempotent(db: Session, user_id: int, key: str | None, request: str, operation) -> dict:
+    if key is None:
+        return operation(lambda body: None)
+    return IdempotencyService(db).execute(user_id, key, request, operation)
+
+
 @router.post("/buy-now/{product_id}")
 def buy_now(
     product_id: int,
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    def response(purchases: list[Purchase]) -> dict:
+        return {"purchase_id": purchases[0].id}
+
+    def operation(complete) -> dict:
+        purchase = PurchaseService(db).buy_now(
+            current_user.id, product_id, before_commit=lambda purchases: complete(response(purchases))
+        )
+        return response([purchase])
+
     try:
-        purchase = PurchaseService(db).buy_now(current_user.id, product_id)
-        return {"purchase_id": purchase.id}
+        return run_idempotent(
+            db, current_user.id, idempotency_key, f"POST /purchases/buy-now/{product_id}", operation
+        )
     except ServiceError as exc:
         raise HTTPException(status_code=exc.status_code, detail=exc.message)
 
 
 @router.post("/checkout-selected")
 def checkout_selected(
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    try:
-        purchases = PurchaseService(db).buy_selected_cart_items(current_user.id)
+    def response(purchases: list[Purchase]) -> dict:
         return {"purchase_ids": [purchase.id for purchase in purchases]}
+
+    def operation(complete) -> dict:
+        purchases = PurchaseService(db).buy_selected_cart_items(
+            current_user.id, before_commit=lambda purchases: complete(response(purchases))
+        )
+        return response(purchases)
+
+    try:
+        return run_idempotent(
+            db, current_user.id, idempotency_key, "POST /purchases/checkout-selected", operation
+        )
     except ServiceError as exc:
         raise HTTPException(status_code=exc.status_code, detail=exc.message)
 
 
 @router.get("/me", response_model=PurchaseResponse)
 def my_purchases(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
 ):
-    purchases = PurchaseService(db).my_purchases(current_user.id)
-    return {
-        "purchases": [
-            {
-                "id": purchase.id,
-                "product_id": purchase.product_id,
-                "product_title": purchase.product.title,
-                "quantity": purchase.quantity,
-                "amount": purchase.amount,
-                "purchased_at": purchase.purchased_at,
-            }
-            for purchase in purchases
-        ]
-    }
+    purchases = PurchaseService(db).my_purchases(current_user.id, since, until)
+    return {"purchases": [to_item(purchase) for purchase in purchases]}
 
 
 @router.get("/sales/me", response_model=PurchaseResponse)
-def my_sales(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    purchases = PurchaseService(db).my_sales(current_user.id)
-    return {
-        "purchases": [
-            {
-                "id": purchase.id,
-                "product_id": purchase.product_id,
-                "product_title": purchase.product.title,
-                "quantity": purchase.quantity,
-                "amount": purchase.amount,
-                "purchased_at": purchase.purchased_at,
-            }
-            for purchase in purchases
-        ]
-    }
+def my_sales(
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    purchases = PurchaseService(db).my_sales(current_user.id, since, until)
+    return {"purchases": [to_item(purchase) for purchase in purchases]}
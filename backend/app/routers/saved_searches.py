@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models import User
+from app.routers.deps import get_current_user
+from app.schemas.saved_search import SavedSearchCreate, SavedSearchResponse
+from app.services.errors import ServiceError
+from app.services.saved_search_service import SavedSearchService
+
+router = APIRouter(prefix="/saved-searches", tags=["saved-searches"])
+
+
+def to_response(item) -> SavedSearchResponse:
+    return SavedSearchResponse(
+        id=item.id,
+        keyword=item.keyword,
+        category=item.category,
+        min_price=item.min_price,
+        max_price=item.max_price,
+        created_at=item.created_at,
+    )
+
+
+@router.post("", response_model=SavedSearchResponse)
+def create_saved_search(
+    payload: SavedSearchCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    service = SavedSearchService(db)
+    try:
+        return to_response(service.create(current_user.id, payload))
+    except ServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+
+
+@router.get("", response_model=list[SavedSearchResponse])
+def list_saved_searches(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return [to_response(item) for item in SavedSearchService(db).list(current_user.id)]
+
+
+@router.delete("/{saved_search_id}")
+def delete_saved_search(
+    saved_search_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        SavedSearchService(db).delete(current_user.id, saved_search_id)
+        return {"message": "Saved search deleted"}
+    except ServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models import ProductStatus, User, UserRole
+from app.routers.deps import get_current_user_optional
+from app.routers.products import to_summary
+from app.schemas.seller import SellerHeader, SellerProductsResponse
+from app.services.errors import ServiceError
+from app.services.seller_service import SellerService
+
+router = APIRouter(prefix="/sellers", tags=["sellers"])
+
+
+@router.get("/{seller_id}/products", response_model=SellerProductsResponse)
+def list_seller_products(
+    seller_id: int,
+    status: ProductStatus | None = None,
+    cursor: str | None = Query(default=None, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_optional),
+):
+    # Sellers see their own blinded listings; everyone else only sees visible ones.
+    include_blinded = bool(
+        current_user and (current_user.role == UserRole.ADMIN or current_user.id == seller_id)
+    )
+    try:
+        header, items, next_cursor = SellerService(db).products(
+            seller_id, status, cursor, limit, include_blinded
+        )
+    except ServiceError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message)
+    return SellerProductsResponse(
+        seller=SellerHeader(
+            id=header.id,
+            nickname=header.nickname,
+            active_count=header.active_count,
+            sold_count=header.sold_count,
+        ),
+        items=[to_summary(item, header.nickname) for item in items],
+        next_cursor=next_cursor,
+    )
@@ -1,5 +1,32 @@
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 
+from app.models.enums import ModerationAction, ModerationJobStatus
+from app.schemas.common import ORMModel
+
 
 class BlindRequest(BaseModel):
     reason: str = Field(min_length=1, max_length=255)
+
+
+class BulkModerationRequest(BaseModel):
+    product_ids: list[int] | None = Field(default=None, min_length=1, max_length=50000)
+    seller_id: int | None = None
+
+
+class BulkBlindRequest(BulkModerationRequest):
+    reason: str = Field(min_length=1, max_length=255)
+
+
+class ModerationJobResponse(ORMModel):
+    id: int
+    action: ModerationAction
+    status: ModerationJobStatus
+    total: int
+    processed: int
+    changed: int
+    cart_items_removed: int
+    error: str | None
+    created_at: datetime
+    finished_at: datetime | None
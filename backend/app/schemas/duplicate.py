@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from app.models import ProductStatus
+
+
+class DuplicateListing(BaseModel):
+    id: int
+    title: str
+    price: int
+    status: ProductStatus
+    is_blinded: bool
+    created_at: datetime
+
+
+class DuplicateCluster(BaseModel):
+    product_id: int
+    seller_id: int
+    seller_nickname: str
+    size: int
+    listings: list[DuplicateListing]
+
+
+class DuplicateClusterResponse(BaseModel):
+    items: list[DuplicateCluster]
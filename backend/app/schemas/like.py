@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+from app.schemas.product import ProductSummary
+
+
+class LikeResponse(BaseModel):
+    product_id: int
+    liked: bool
+    like_count: int
+
+
+class LikeListResponse(BaseModel):
+    items: list[ProductSummary]
+    next_before_id: int | None
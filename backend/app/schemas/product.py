@@ -12,6 +12,8 @@ class ProductCreate(BaseModel):
     category: ProductCategory
     condition: ProductCondition
     image_urls: list[str] = Field(default_factory=list, max_length=5)
+    latitude: float | None = Field(default=None, ge=-90, le=90)
+    longitude: float | None = Field(default=None, ge=-180, le=180)
 
 
 class ProductUpdate(BaseModel):
@@ -22,6 +24,8 @@ class ProductUpdate(BaseModel):
     condition: ProductCondition | None = None
     status: ProductStatus | None = None
     image_urls: list[str] | None = Field(default=None, max_length=5)
+    latitude: float | None = Field(default=None, ge=-90, le=90)
+    longitude: float | None = Field(default=None, ge=-180, le=180)
 
 
 class ProductSummary(BaseModel):
@@ -34,6 +38,8 @@ class ProductSummary(BaseModel):
     is_blinded: bool
     seller_nickname: str
     thumbnail_url: str | None
+    like_count: int = 0
+    distance_km: float | None = None
     created_at: datetime
 
 
@@ -50,12 +56,47 @@ class ProductDetail(BaseModel):
     seller_id: int
     seller_nickname: str
     image_urls: list[str]
+    reserved_until: datetime | None = None
+    like_count: int = 0
+    latitude: float | None = None
+    longitude: float | None = None
     created_at: datetime
     updated_at: datetime
 
 
+class ProductSuggestion(BaseModel):
+    id: int
+    title: str
+
+
 class ProductListResponse(BaseModel):
     total: int
     page: int
     page_size: int
     items: list[ProductSummary]
+    facets: dict[str, dict[str, int]] | None = None
+
+
+class ProductChangeItem(BaseModel):
+    id: int
+    seller_id: int
+    title: str
+    price: int
+    category: ProductCategory
+    condition: ProductCondition
+    status: ProductStatus
+    thumbnail_url: str | None
+    updated_at: datetime
+
+
+class ProductChangesResponse(BaseModel):
+    cursor: int
+    has_more: bool
+    items: list[ProductChangeItem]
+    deleted_ids: list[int]
+
+
+class ReservationResponse(BaseModel):
+    product_id: int
+    status: ProductStatus
+    reserved_until: datetime | None
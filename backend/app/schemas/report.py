@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class ReportCreate(BaseModel):
+    reason: str = Field(min_length=1, max_length=255)
+
+
+class ReportResponse(BaseModel):
+    product_id: int
+    report_count: int
+    is_blinded: bool
+
+
+class ReportQueueItem(BaseModel):
+    product_id: int
+    title: str
+    seller_nickname: str
+    report_count: int
+    last_reported_at: datetime
+    recent_reasons: list[str]
+
+
+class ReportQueueResponse(BaseModel):
+    items: list[ReportQueueItem]
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.models.enums import ProductCategory, ProductStatus
+
+
+class SavedSearchCreate(BaseModel):
+    keyword: str | None = Field(default=None, max_length=100)
+    category: ProductCategory | None = None
+    min_price: int | None = Field(default=None, ge=0)
+    max_price: int | None = Field(default=None, ge=0)
+
+
+class SavedSearchResponse(BaseModel):
+    id: int
+    keyword: str | None
+    category: ProductCategory | None
+    min_price: int | None
+    max_price: int | None
+    created_at: datetime
+
+
+class NotificationResponse(BaseModel):
+    id: int
+    saved_search_id: int | None
+    product_id: int
+    title: str
+    price: int
+    status: ProductStatus
+    thumbnail_url: str | None
+    is_read: bool
+    created_at: datetime
+
+
+class NotificationListResponse(BaseModel):
+    items: list[NotificationResponse]
+    unread_count: int
+    next_before_id: int | None
+
+
+class NotificationReadRequest(BaseModel):
+    up_to_id: int = Field(ge=1)
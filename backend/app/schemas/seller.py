@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+from app.schemas.product import ProductSummary
+
+
+class SellerHeader(BaseModel):
+    id: int
+    nickname: str
+    active_count: int
+    sold_count: int
+
+
+class SellerProductsResponse(BaseModel):
+    seller: SellerHeader
+    items: list[ProductSummary]
+    next_cursor: str | None
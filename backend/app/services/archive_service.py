@@ -0,0 +1,80 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repositories.archive_repository import ArchiveRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ProductArchiver:
+    # Moves long-sold products and their images out of the hot tables. Each batch
+    # is its own transaction, so a crash or shutdown loses at most one batch of
+    # work and the next run picks up from the oldest remaining sale.
+    def __init__(self, session_factory, min_age: timedelta, batch_size: int, interval: float):
+        self.session_factory = session_factory
+        self.min_age = min_age
+        self.batch_size = batch_size
+        self.interval = interval
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="product-archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                archived = self.run()
+                if archived:
+                    logger.info("archived %s sold products", archived)
+            except Exception:
+                logger.exception("product archiving failed")
+
+    def run(self, max_batches: int | None = None) -> int:
+        archived = 0
+        batches = 0
+        while not self._stopped.is_set() and (max_batches is None or batches < max_batches):
+            moved = self.archive_batch()
+            archived += moved
+            batches += 1
+            if moved < self.batch_size:
+                break
+        return archived
+
+    def archive_batch(self) -> int:
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            repo = ArchiveRepository(db)
+            product_ids = repo.list_archivable_ids(now - self.min_age, self.batch_size)
+            if not product_ids:
+                return 0
+            moved = repo.move(product_ids, now)
+            db.commit()
+            return moved
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+product_archiver = ProductArchiver(
+    SessionLocal,
+    min_age=timedelta(days=settings.archive_after_days),
+    batch_size=settings.archive_batch_size,
+    interval=settings.archive_interval_seconds,
+)
@@ -10,6 +10,7 @@ from app.core.security import (
     verify_password,
 )
 from app.models import User, UserRole
+from app.repositories.seller_stats_repository import SellerStatsRepository
 from app.repositories.user_repository import UserRepository
 from app.services.errors import ServiceError
 
@@ -18,6 +19,7 @@ class AuthService:
     def __init__(self, db: Session):
         self.db = db
         self.user_repo = UserRepository(db)
+        self.seller_stats_repo = SellerStatsRepository(db)
 
     def signup(self, data: Any) -> User:
         if self.user_repo.get_by_email(data.email):
@@ -32,6 +34,7 @@ class AuthService:
             role=UserRole.USER,
         )
         self.user_repo.create(user)
+        self.seller_stats_repo.create(user.id)
         self.db.commit()
         return user
 
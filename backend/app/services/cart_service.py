@@ -17,7 +17,10 @@ class CartService:
         product = self.product_repo.get_by_id(payload.product_id)
         if not product:
             raise ServiceError(404, "Product not found")
-        if product.status != ProductStatus.ON_SALE or product.is_blinded:
+        held_by_user = (
+            product.status == ProductStatus.RESERVED and product.reserved_by_id == user_id
+        )
+        if (product.status != ProductStatus.ON_SALE and not held_by_user) or product.is_blinded:
             raise ServiceError(400, "Product is not available")
         if product.seller_id == user_id:
             raise ServiceError(400, "Cannot add your own product")
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.minhash import band_keys, pack, signature, similarity, unpack
+from app.models import Product
+from app.repositories.duplicate_repository import DuplicateRepository
+from app.services.errors import ServiceError
+
+
+@dataclass(frozen=True)
+class ListingFingerprint:
+    signature: bytes
+    buckets: list[int]
+    duplicate_of: int | None
+
+
+class DuplicateService:
+    # Sellers reposting the same item with small edits. Each listing's MinHash
+    # signature is banded into LSH buckets; only the seller's listings sharing a
+    # bucket are compared, so a check costs one index lookup however large the
+    # catalog gets.
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = DuplicateRepository(db)
+        self.policy = settings.duplicate_listing_policy
+        self.threshold = settings.duplicate_listing_threshold
+
+    def check(
+        self, seller_id: int, title: str, description: str, exclude_id: int | None = None
+    ) -> ListingFingerprint | None:
+        if self.policy == "off":
+            return None
+        minhash = signature(f"{title}\n{description}")
+        buckets = band_keys(minhash).tolist()
+        candidates = self.repo.find_candidates(seller_id, buckets, exclude_id)
+        duplicate_of = None
+        if candidates:
+            scores = similarity(minhash, np.stack([unpack(row[1]) for row in candidates]))
+            best = int(scores.argmax())
+            if scores[best] >= self.threshold:
+                product_id, _, root_id = candidates[best]
+                duplicate_of = root_id or product_id
+        if duplicate_of is not None and self.policy == "reject":
+            raise ServiceError(409, f"Listing duplicates product {duplicate_of}")
+        return ListingFingerprint(pack(minhash), buckets, duplicate_of)
+
+    def record(self, product_id: int, seller_id: int, fingerprint: ListingFingerprint, *, new: bool) -> None:
+        save = self.repo.add if new else self.repo.replace
+        save(product_id, seller_id, fingerprint.signature, fingerprint.buckets, fingerprint.duplicate_of)
+
+    def clusters(self, limit: int) -> list[tuple[int, list[Product]]]:
+        sizes = self.repo.list_clusters(limit)
+        members = self.repo.list_cluster_members([root_id for root_id, _ in sizes])
+        return [(root_id, members[root_id]) for root_id, _ in sizes]
@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import LocalCache
+from app.core.config import settings
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.services.errors import ServiceError
+
+# (user_id, key) -> (request, status_code, body) of completed requests, so a retry
+# landing on the same worker replays without touching the database.
+idempotency_cache = LocalCache(settings.idempotency_cache_size, settings.idempotency_ttl_hours * 3600)
+
+POLL_SECONDS = 0.05
+
+_prune_lock = threading.Lock()
+_next_prune = datetime.min
+
+
+class IdempotencyService:
+    # A retried purchase with the same Idempotency-Key gets the first attempt's
+    # response back. The key row is claimed (and committed) before the operation
+    # runs, so a concurrent duplicate finds the claim and waits for its response
+    # instead of racing the first request for the product. The operation gets a
+    # complete(body) callback to call just before it commits, so its result and
+    # the stored response land in the same transaction.
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = IdempotencyRepository(db)
+        self.ttl = timedelta(hours=settings.idempotency_ttl_hours)
+        self.wait_seconds = settings.idempotency_wait_seconds
+        self.lock_timeout = timedelta(seconds=settings.idempotency_lock_timeout_seconds)
+
+    def execute(
+        self, user_id: int, key: str, request: str, operation: Callable[[Callable[[dict], None]], dict]
+    ) -> dict:
+        self._prune()
+        stored = idempotency_cache.get((user_id, key)) or self._claim(user_id, key, request)
+        if stored is None:
+            return self._run(user_id, key, request, operation)
+        stored_request, status_code, body = stored
+        if stored_request != request:
+            raise ServiceError(422, "Idempotency-Key was already used for a different request")
+        if status_code >= 400:
+            raise ServiceError(status_code, body["detail"])
+        return body
+
+    def _claim(self, user_id: int, key: str, request: str) -> tuple[str, int, dict] | None:
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            if self.repo.claim(user_id, key, request):
+                self.db.commit()
+                return None
+            record = self.repo.get(user_id, key)
+            now = datetime.utcnow()
+            if record is not None and record.status_code is not None and record.created_at >= now - self.ttl:
+                stored = (record.request, record.status_code, json.loads(record.response_body))
+                idempotency_cache.set((user_id, key), stored, idempotency_cache.generation)
+                return stored
+            if record is not None and (
+                record.created_at < now - self.ttl
+                or (record.status_code is None and record.created_at < now - self.lock_timeout)
+            ):
+                # Expired, or claimed by a request that died before finishing.
+                self.repo.release(user_id, key, record.created_at)
+                self.db.commit()
+                continue
+            if time.monotonic() > deadline:
+                raise ServiceError(409, "A request with this Idempotency-Key is still in progress")
+            # End the transaction so the next read sees the first request's commit.
+            self.db.rollback()
+            time.sleep(POLL_SECONDS)
+            cached = idempotency_cache.get((user_id, key))
+            if cached is not None:
+                return cached
+
+    def _run(
+        self, user_id: int, key: str, request: str, operation: Callable[[Callable[[dict], None]], dict]
+    ) -> dict:
+        completed = []
+
+        def complete(body: dict) -> None:
+            self.repo.complete(user_id, key, 200, json.dumps(body))
+            completed.append(body)
+
+        try:
+            body = operation(complete)
+        except ServiceError as exc:
+            # Business failures (sold out, empty cart) are part of the answer and replay as is.
+            self.db.rollback()
+            self._complete(user_id, key, request, exc.status_code, {"detail": exc.message})
+            raise
+        except Exception:
+            # Unexpected failures free the key so the client's retry runs again, unless
+            # the operation already committed; then the stored response is the answer.
+            self.db.rollback()
+            self.repo.release_unfinished(user_id, key)
+            self.db.commit()
+            raise
+        if completed:
+            idempotency_cache.set((user_id, key), (request, 200, body), idempotency_cache.generation)
+        else:
+            self._complete(user_id, key, request, 200, body)
+        return body
+
+    def _complete(self, user_id: int, key: str, request: str, status_code: int, body: dict) -> None:
+        self.repo.complete(user_id, key, status_code, json.dumps(body))
+        self.db.commit()
+        idempotency_cache.set((user_id, key), (request, status_code, body), idempotency_cache.generation)
+
+    def _prune(self) -> None:
+        global _next_prune
+        now = datetime.utcnow()
+        with _prune_lock:
+            if now < _next_prune:
+                return
+            _next_prune = now + timedelta(hours=1)
+        self.repo.delete_before(now - self.ttl)
+        self.db.commit()
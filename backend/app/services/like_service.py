@@ -0,0 +1,55 @@
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.counter_buffer import CounterBuffer
+from app.core.database import SessionLocal
+from app.models import ProductLike
+from app.repositories.like_repository import LikeRepository
+from app.repositories.product_repository import ProductRepository
+from app.services.errors import ServiceError
+
+
+def _flush_like_counts(deltas: dict[int, int]) -> None:
+    db = SessionLocal()
+    try:
+        LikeRepository(db).apply_counts(deltas)
+        db.commit()
+    finally:
+        db.close()
+
+
+like_counter = CounterBuffer(_flush_like_counts, settings.like_flush_interval_seconds, name="like-counter")
+
+
+class LikeService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.like_repo = LikeRepository(db)
+        self.product_repo = ProductRepository(db)
+
+    def _like_count(self, product_id: int) -> int:
+        # The stored count plus this worker's unflushed increments, so the caller
+        # sees their own like; other workers' pending increments land within one flush.
+        return max(0, self.like_repo.stored_count(product_id) + like_counter.pending(product_id))
+
+    def like(self, user_id: int, product_id: int) -> int:
+        product = self.product_repo.get_by_id(product_id)
+        if not product:
+            raise ServiceError(404, "Product not found")
+        if product.is_blinded:
+            raise ServiceError(400, "Product is not available")
+        added = self.like_repo.add(user_id, product_id)
+        self.db.commit()
+        if added:
+            like_counter.add(product_id, 1)
+        return self._like_count(product_id)
+
+    def unlike(self, user_id: int, product_id: int) -> int:
+        removed = self.like_repo.remove(user_id, product_id)
+        self.db.commit()
+        if removed:
+            like_counter.add(product_id, -1)
+        return self._like_count(product_id)
+
+    def list(self, user_id: int, before_id: int | None, limit: int) -> list[ProductLike]:
+        return self.like_repo.list_by_user(user_id, before_id, limit)
@@ -0,0 +1,234 @@
+import json
+import logging
+import os
+import socket
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.pubsub import ProductChange, broker
+from app.models import ModerationAction, ModerationJob, ModerationJobStatus, ProductEventType
+from app.repositories.cart_repository import CartRepository
+from app.repositories.moderation_repository import ModerationRepository
+from app.repositories.product_event_repository import ProductEventRepository
+from app.repositories.seller_stats_repository import SellerStatsRepository, listing_counts
+from app.services.errors import ServiceError
+
+logger = logging.getLogger(__name__)
+
+
+class _LeaseLost(Exception):
+    pass
+
+
+class BulkModerationRunner:
+    # Applies a moderation job chunk by chunk, one transaction per chunk: a
+    # set-based UPDATE of the rows that change, their seller counts, outbox
+    # events and (when blinding) cart rows. Progress is committed with each
+    # chunk. Every worker polls for jobs that are pending or whose lease ran
+    # out, but a job runs only on the worker that claimed it; a chunk whose
+    # progress update finds the lease gone is rolled back.
+    def __init__(self, session_factory, chunk_size: int, lease_seconds: float):
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.lease_seconds = lease_seconds
+        self._token = uuid4().hex[:8]
+        self._executor: ThreadPoolExecutor | None = None
+        self._queued: set[int] = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def owner(self) -> str:
+        # The pid keeps forked workers apart even if the runner was created before the fork.
+        return f"{socket.gethostname()}:{os.getpid()}:{self._token}"[:64]
+
+    def _lease_until(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+
+    def submit(self, job_id: int) -> None:
+        with self._lock:
+            if job_id in self._queued:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bulk-moderation")
+            self._queued.add(job_id)
+            self._executor.submit(self._process, job_id)
+
+    def _process(self, job_id: int) -> None:
+        try:
+            self.run(job_id)
+        finally:
+            with self._lock:
+                self._queued.discard(job_id)
+
+    def resume(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="moderation-jobs", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        # Picks up new jobs' leftovers and jobs whose worker died, once per lease period.
+        while True:
+            try:
+                self.submit_claimable()
+            except Exception:
+                logger.exception("moderation job poll failed")
+            if self._stopped.wait(self.lease_seconds):
+                return
+
+    def submit_claimable(self) -> None:
+        db = self.session_factory()
+        try:
+            job_ids = ModerationRepository(db).list_claimable_job_ids(datetime.utcnow())
+        finally:
+            db.close()
+        for job_id in job_ids:
+            self.submit(job_id)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+            self._queued.clear()
+        # Everything that had to see the stop has finished; later in-request runs proceed.
+        self._stopped.clear()
+
+    def run(self, job_id: int) -> None:
+        owner = self.owner
+        db = self.session_factory()
+        try:
+            repo = ModerationRepository(db)
+            if not repo.claim_job(job_id, owner, datetime.utcnow(), self._lease_until()):
+                db.rollback()
+                return
+            db.commit()
+            job = repo.get_job(job_id)
+            blinded = job.action == ModerationAction.BLIND
+            if job.product_ids is not None:
+                product_ids = json.loads(job.product_ids)
+                # Chunks before job.processed were committed by an earlier run.
+                for start in range(job.processed, len(product_ids), self.chunk_size):
+                    if self._stopped.is_set():
+                        repo.release_job(job_id, owner)
+                        db.commit()
+                        return
+                    chunk = product_ids[start : start + self.chunk_size]
+                    self._apply(db, job, owner, repo.lock_by_ids(chunk, blinded), len(chunk))
+            else:
+                while True:
+                    if self._stopped.is_set():
+                        repo.release_job(job_id, owner)
+                        db.commit()
+                        return
+                    rows = repo.lock_next_by_seller(job.seller_id, blinded, self.chunk_size)
+                    if not rows:
+                        break
+                    self._apply(db, job, owner, rows, len(rows))
+            if not repo.finish_job(job_id, owner, ModerationJobStatus.DONE):
+                raise _LeaseLost
+            db.commit()
+        except _LeaseLost:
+            db.rollback()
+            logger.warning("moderation job %s lost its lease to another worker", job_id)
+        except Exception as exc:
+            logger.exception("moderation job %s failed", job_id)
+            db.rollback()
+            ModerationRepository(db).finish_job(
+                job_id, owner, ModerationJobStatus.FAILED, f"{exc.__class__.__name__}: {exc}"[:255]
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _apply(self, db: Session, job: ModerationJob, owner: str, rows: list, processed: int) -> None:
+        blinded = job.action == ModerationAction.BLIND
+        event_type = ProductEventType.BLINDED if blinded else ProductEventType.UNBLINDED
+        product_ids = [row.id for row in rows]
+        cart_items_removed = 0
+        if product_ids:
+            ModerationRepository(db).set_blinded(product_ids, blinded, job.reason)
+            active_deltas: defaultdict[int, int] = defaultdict(int)
+            for row in rows:
+                before, _ = listing_counts(row.status, row.is_blinded)
+                after, _ = listing_counts(row.status, blinded)
+                active_deltas[row.seller_id] += after - before
+            stats_repo = SellerStatsRepository(db)
+            for seller_id, active in sorted(active_deltas.items()):
+                stats_repo.adjust(seller_id, active=active)
+            ProductEventRepository(db).record_many([(row.id, row.seller_id, event_type) for row in rows])
+            if blinded:
+                cart_items_removed = CartRepository(db).delete_by_products(product_ids)
+        if not ModerationRepository(db).record_progress(
+            job.id, owner, self._lease_until(), processed, len(product_ids), cart_items_removed
+        ):
+            raise _LeaseLost
+        db.commit()
+        for row in rows:
+            broker.publish(
+                ProductChange(
+                    product_id=row.id,
+                    event=event_type.value,
+                    status=row.status.value,
+                    price=row.price,
+                    is_blinded=blinded,
+                )
+            )
+
+
+moderation_runner = BulkModerationRunner(
+    SessionLocal, settings.moderation_chunk_size, settings.moderation_lease_seconds
+)
+
+
+class ModerationService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = ModerationRepository(db)
+
+    def submit(
+        self,
+        admin_id: int,
+        action: ModerationAction,
+        *,
+        product_ids: list[int] | None,
+        seller_id: int | None,
+        reason: str | None = None,
+    ) -> ModerationJob:
+        if (product_ids is None) == (seller_id is None):
+            raise ServiceError(400, "Provide either product_ids or seller_id")
+        job = ModerationJob(action=action, reason=reason, seller_id=seller_id, created_by=admin_id)
+        if product_ids is not None:
+            unique_ids = sorted(set(product_ids))
+            job.product_ids = json.dumps(unique_ids)
+            job.total = len(unique_ids)
+        else:
+            job.total = self.repo.count_seller_candidates(seller_id, action == ModerationAction.BLIND)
+        self.repo.create_job(job)
+        self.db.commit()
+        if job.total <= moderation_runner.chunk_size:
+            # Small batches finish within the request.
+            moderation_runner.run(job.id)
+            self.db.refresh(job)
+        else:
+            moderation_runner.submit(job.id)
+        return job
+
+    def get_job(self, job_id: int) -> ModerationJob:
+        job = self.repo.get_job(job_id)
+        if job is None:
+            raise ServiceError(404, "Moderation job not found")
+        return job
@@ -0,0 +1,163 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repositories.product_event_repository import ProductEventRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class OutboxEvent:
+    id: int
+    product_id: int
+    seller_id: int | None
+    event_type: str
+    created_at: datetime
+
+
+OutboxHandler = Callable[[list[OutboxEvent]], None]
+
+# Sequence values are allocated before commit, so a lower id can become visible
+# after a higher one. Skipped ids are re-checked for this long before being
+# treated as rolled back.
+GAP_TIMEOUT_SECONDS = 10.0
+MAX_TRACKED_GAPS = 1000
+
+
+class OutboxPoller:
+    def __init__(self, session_factory, interval: float, batch_size: int, retention: timedelta):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self.retention = retention
+        self.last_id = 0
+        self._handlers: list[OutboxHandler] = []
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._gaps: dict[int, float] = {}
+        self._next_prune = datetime.min
+
+    def register(self, handler: OutboxHandler) -> OutboxHandler:
+        self._handlers.append(handler)
+        return handler
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        db = self.session_factory()
+        try:
+            # Caches are empty at boot, so only events written from now on matter.
+            self.last_id = ProductEventRepository(db).last_id()
+        finally:
+            db.close()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="outbox-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                return
+            try:
+                self.poll()
+                self._prune()
+            except Exception:
+                logger.exception("outbox poll failed")
+
+    def poll(self) -> int:
+        applied = 0
+        # Serialises the background thread with callers that poll inline (tests, wake-ups).
+        with self._lock:
+            if self._gaps:
+                applied += self._apply(self._fetch_gaps())
+            while True:
+                db = self.session_factory()
+                try:
+                    rows = ProductEventRepository(db).list_after(self.last_id, self.batch_size)
+                finally:
+                    db.close()
+                if not rows:
+                    return applied
+                self._track_gaps([row.id for row in rows])
+                applied += self._apply(rows)
+                self.last_id = rows[-1].id
+                if len(rows) < self.batch_size:
+                    return applied
+
+    def _track_gaps(self, event_ids: list[int]) -> None:
+        deadline = time.monotonic() + GAP_TIMEOUT_SECONDS
+        expected = self.last_id + 1
+        for event_id in event_ids:
+            for missing in range(expected, min(event_id, expected + MAX_TRACKED_GAPS)):
+                self._gaps[missing] = deadline
+            expected = event_id + 1
+
+    def _fetch_gaps(self) -> list:
+        now = time.monotonic()
+        for event_id, deadline in list(self._gaps.items()):
+            if deadline < now:
+                del self._gaps[event_id]
+        if not self._gaps:
+            return []
+        db = self.session_factory()
+        try:
+            rows = ProductEventRepository(db).list_by_ids(list(self._gaps))
+        finally:
+            db.close()
+        for row in rows:
+            self._gaps.pop(row.id, None)
+        return rows
+
+    def _apply(self, rows) -> int:
+        if not rows:
+            return 0
+        events = [
+            OutboxEvent(row.id, row.product_id, row.seller_id, row.event_type, row.created_at)
+            for row in rows
+        ]
+        for handler in self._handlers:
+            try:
+                handler(events)
+            except Exception:
+                logger.exception("outbox handler %r failed", handler)
+        return len(events)
+
+    def _prune(self) -> None:
+        now = datetime.utcnow()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + timedelta(hours=1)
+        db = self.session_factory()
+        try:
+            ProductEventRepository(db).delete_before(now - self.retention)
+            db.commit()
+        finally:
+            db.close()
+
+
+outbox_poller = OutboxPoller(
+    SessionLocal,
+    interval=settings.outbox_poll_interval_seconds,
+    batch_size=settings.outbox_batch_size,
+    retention=timedelta(days=settings.outbox_retention_days),
+)
@@ -0,0 +1,85 @@
+import logging
+import threading
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repositories.partition_repository import PartitionRepository, month_partition_name
+
+logger = logging.getLogger(__name__)
+
+
+def month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+class PartitionMaintainer:
+    # Keeps monthly range partitions created ahead of time so inserts never land in
+    # the default partition; a populated default would block creating the month later.
+    def __init__(self, session_factory, table: str, months_ahead: int, interval: float):
+        self.session_factory = session_factory
+        self.table = table
+        self.months_ahead = months_ahead
+        self.interval = interval
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.table}-partitions", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.run()
+            except Exception:
+                logger.exception("partition maintenance failed for %s", self.table)
+
+    def run(self, now: datetime | None = None) -> list[str]:
+        db = self.session_factory()
+        try:
+            repo = PartitionRepository(db)
+            if not repo.is_partitioned(self.table):
+                logger.warning("%s is not partitioned; recreate it to enable partitioning", self.table)
+                return []
+            existing = repo.list_partitions(self.table)
+            created = []
+            current = month_start(now or datetime.utcnow())
+            for offset in range(self.months_ahead + 1):
+                month = add_months(current, offset)
+                name = month_partition_name(self.table, month)
+                if name not in existing:
+                    repo.create_month(self.table, month, add_months(month, 1))
+                    created.append(name)
+            repo.create_default(self.table)
+            db.commit()
+            if created:
+                logger.info("created partitions %s", ", ".join(created))
+            return created
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+purchase_partitions = PartitionMaintainer(
+    SessionLocal,
+    "purchases",
+    months_ahead=settings.purchase_partitions_ahead,
+    interval=settings.purchase_partition_interval_seconds,
+)
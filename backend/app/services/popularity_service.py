@@ -0,0 +1,92 @@
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.core.counter_buffer import CounterBuffer
+from app.core.database import SessionLocal
+from app.repositories.view_repository import ViewRepository
+
+logger = logging.getLogger(__name__)
+
+
+def hour_start(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _flush_views(deltas: dict[int, int]) -> None:
+    db = SessionLocal()
+    try:
+        ViewRepository(db).add_views(hour_start(datetime.utcnow()), deltas)
+        db.commit()
+    finally:
+        db.close()
+
+
+view_counter = CounterBuffer(_flush_views, settings.view_flush_interval_seconds, name="view-counter")
+
+
+class PopularityRanker:
+    # Recomputes products.popularity_score as hourly view counts decayed by age
+    # (score halves every half_life). Only products viewed inside the window, and
+    # ones whose last views just aged out, are written.
+    def __init__(self, session_factory, half_life: timedelta, window: timedelta, interval: float):
+        self.session_factory = session_factory
+        self.half_life = half_life
+        self.window = window
+        self.interval = interval
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="popularity-ranker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.run()
+            except Exception:
+                logger.exception("popularity recompute failed")
+
+    def run(self, now: datetime | None = None) -> int:
+        now = now or datetime.utcnow()
+        since = hour_start(now - self.window)
+        db = self.session_factory()
+        try:
+            repo = ViewRepository(db)
+            scores: defaultdict[int, float] = defaultdict(float)
+            for product_id, hour, views in repo.iter_counts(since):
+                age = max(timedelta(0), now - hour) / self.half_life
+                scores[product_id] += views * 0.5**age
+            rounded = {product_id: round(score, 4) for product_id, score in scores.items()}
+            for product_id in repo.list_scored_ids() - rounded.keys():
+                rounded[product_id] = 0.0
+            if rounded:
+                repo.set_scores(rounded)
+            repo.prune(since)
+            db.commit()
+            return len(rounded)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+popularity_ranker = PopularityRanker(
+    SessionLocal,
+    half_life=timedelta(hours=settings.popularity_half_life_hours),
+    window=timedelta(days=settings.popularity_window_days),
+    interval=settings.popularity_interval_seconds,
+)
@@ -0,0 +1,183 @@
+import logging
+import math
+import threading
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.quantile_sketch import LogHistogram
+from app.models import Product, ProductCategory, ProductCondition
+from app.repositories.price_anomaly_repository import PriceAnomalyRepository
+
+logger = logging.getLogger(__name__)
+
+GROUPS = [(category, condition) for category in ProductCategory for condition in ProductCondition]
+GROUP_INDEX = {group: index for index, group in enumerate(GROUPS)}
+# Scales the MAD to a standard deviation under normality (Iglewicz and Hoaglin).
+MAD_SCALE = 0.6745
+
+
+def modified_z(log_price: np.ndarray | float, median, mad, min_mad: float):
+    # Prices are compared in log space: "a tenth of the usual price" is equally
+    # suspicious for a 10,000 won book and a 1,000,000 won laptop.
+    return MAD_SCALE * (log_price - median) / np.maximum(mad, min_mad)
+
+
+def _grouped_medians(
+    groups: np.ndarray, values: np.ndarray, group_count: int
+) -> tuple[np.ndarray, np.ndarray]:
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    counts = np.bincount(groups, minlength=group_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    lower = np.where(present, starts + (counts - 1) // 2, 0)
+    upper = np.where(present, starts + counts // 2, 0)
+    medians = np.full(group_count, np.nan)
+    if len(ordered):
+        medians[present] = (ordered[lower[present]] + ordered[upper[present]]) / 2
+    return medians, counts
+
+
+def robust_scores(
+    groups: np.ndarray,
+    log_prices: np.ndarray,
+    reference: np.ndarray,
+    *,
+    group_count: int,
+    min_samples: int,
+    min_mad: float,
+) -> np.ndarray:
+    # Exact per-group median and MAD of the reference rows with two sorts over the
+    # whole catalog, then every row's score in one pass. NaN where a group has too
+    # few reference rows to judge.
+    medians, counts = _grouped_medians(groups[reference], log_prices[reference], group_count)
+    deviations = np.abs(log_prices[reference] - medians[groups[reference]])
+    mads, _ = _grouped_medians(groups[reference], deviations, group_count)
+    scores = modified_z(log_prices, medians[groups], mads[groups], min_mad)
+    scores[counts[groups] < min_samples] = np.nan
+    return scores
+
+
+class PriceStats:
+    # Per (category, condition) histograms of log prices, seeded by the batch job
+    # and kept current by this worker's creates and edits in between, so scoring
+    # a listing is O(1) in the catalog size.
+    def __init__(self, min_samples: int, enabled: bool = True):
+        self.min_samples = min_samples
+        self.enabled = enabled
+        self.histograms = [LogHistogram() for _ in GROUPS]
+        self._lock = threading.Lock()
+
+    def score(self, category: ProductCategory, condition: ProductCondition, price: int) -> float | None:
+        if not self.enabled:
+            return None
+        histogram = self.histograms[GROUP_INDEX[(category, condition)]]
+        with self._lock:
+            if histogram.total < self.min_samples:
+                return None
+            median, mad = histogram.summary()
+        return round(float(modified_z(math.log(price), median, mad, histogram.bin_width)), 3)
+
+    def observe(
+        self, category: ProductCategory, condition: ProductCondition, price: int, count: int = 1
+    ) -> None:
+        with self._lock:
+            self.histograms[GROUP_INDEX[(category, condition)]].add(math.log(price), count)
+
+    def reset(self, groups: np.ndarray, log_prices: np.ndarray) -> None:
+        order = np.argsort(groups, kind="stable")
+        bounds = np.searchsorted(groups[order], np.arange(len(GROUPS) + 1))
+        with self._lock:
+            for index, histogram in enumerate(self.histograms):
+                histogram.reset(log_prices[order[bounds[index] : bounds[index + 1]]])
+
+
+price_stats = PriceStats(settings.price_anomaly_min_samples, settings.price_anomaly_enabled)
+
+
+class PriceAnomalyJob:
+    # Recomputes products.price_anomaly_score for the whole catalog from exact
+    # group statistics and reseeds the streaming histograms. Blinded listings do
+    # not count towards the market price; only changed scores are written.
+    def __init__(self, session_factory, stats: PriceStats, interval: float):
+        self.session_factory = session_factory
+        self.stats = stats
+        self.interval = interval
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="price-anomaly", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        # Runs right away: a fresh worker has empty histograms until the first pass.
+        while True:
+            try:
+                self.run()
+            except Exception:
+                logger.exception("price anomaly recompute failed")
+            if self._stopped.wait(self.interval):
+                return
+
+    def run(self) -> int:
+        db = self.session_factory()
+        try:
+            repo = PriceAnomalyRepository(db)
+            rows = repo.load_prices()
+            ids = np.array([row[0] for row in rows], dtype=np.int64)
+            groups = np.array([GROUP_INDEX[(row[1], row[2])] for row in rows], dtype=np.int64)
+            log_prices = np.log(np.array([row[3] for row in rows], dtype=np.float64))
+            reference = np.array([not row[4] for row in rows], dtype=bool)
+            stored = np.array([np.nan if row[5] is None else row[5] for row in rows], dtype=np.float64)
+
+            scores = np.round(
+                robust_scores(
+                    groups,
+                    log_prices,
+                    reference,
+                    group_count=len(GROUPS),
+                    min_samples=self.stats.min_samples,
+                    min_mad=self.stats.histograms[0].bin_width,
+                ),
+                3,
+            )
+            changed = ~((scores == stored) | (np.isnan(scores) & np.isnan(stored)))
+            updates = {
+                int(product_id): None if np.isnan(score) else float(score)
+                for product_id, score in zip(ids[changed], scores[changed])
+            }
+            if updates:
+                repo.set_scores(updates)
+            db.commit()
+            self.stats.reset(groups[reference], log_prices[reference])
+            return len(updates)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+price_anomaly_job = PriceAnomalyJob(SessionLocal, price_stats, settings.price_anomaly_interval_seconds)
+
+
+class PriceAnomalyService:
+    def __init__(self, db: Session):
+        self.repo = PriceAnomalyRepository(db)
+        self.threshold = settings.price_anomaly_threshold
+
+    def outliers(self, limit: int) -> list[Product]:
+        return self.repo.list_below(-self.threshold, limit)
@@ -1,20 +1,64 @@
+from datetime import datetime
+
 from sqlalchemy.orm import Session
 
-from app.models import Product, ProductCategory
-from app.models.enums import ProductStatus
-from app.repositories.product_repository import ProductRepository
+from app.core.cache import LocalCache
+from app.core.config import settings
+from app.core.geohash import encode as geohash_encode
+from app.core.pubsub import ProductChange, broker
+from app.models import ArchivedProduct, Product, ProductCategory
+from app.models.enums import ProductCondition, ProductEventType, ProductStatus
+from app.repositories.archive_repository import ArchiveRepository
+from app.repositories.product_event_repository import ProductEventRepository
+from app.repositories.product_repository import ProductRepository, delete_dependents
+from app.repositories.seller_stats_repository import SellerStatsRepository, listing_counts
 from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.duplicate_service import DuplicateService
 from app.services.errors import ServiceError
+from app.services.like_service import like_counter
+from app.services.outbox_service import outbox_poller
+from app.services.popularity_service import view_counter
+from app.services.price_anomaly_service import price_stats
+from app.services.saved_search_service import saved_search_alerts
+
+FACET_FIELDS = {
+    "category": ProductCategory,
+    "condition": ProductCondition,
+    "status": ProductStatus,
+}
+
+facet_cache = LocalCache(
+    max_entries=settings.facet_cache_size, ttl_seconds=settings.facet_cache_ttl_seconds
+)
+# Any catalog write can move counts between buckets, so batches just drop the cache.
+outbox_poller.register(lambda events: facet_cache.clear())
 
 
 class ProductService:
     def __init__(self, db: Session):
         self.db = db
         self.product_repo = ProductRepository(db)
+        self.event_repo = ProductEventRepository(db)
+        self.seller_stats_repo = SellerStatsRepository(db)
+        self.archive_repo = ArchiveRepository(db)
+        self.duplicates = DuplicateService(db)
+
+    def _adjust_seller_counts(self, product: Product, before: tuple[int, int]) -> None:
+        active, sold = listing_counts(product.status, product.is_blinded)
+        self.seller_stats_repo.adjust(product.seller_id, active - before[0], sold - before[1])
+
+    def _locate(self, product: Product) -> None:
+        if (product.latitude is None) != (product.longitude is None):
+            raise ServiceError(400, "latitude and longitude must be given together")
+        if product.latitude is None:
+            product.geohash = None
+        else:
+            product.geohash = geohash_encode(product.latitude, product.longitude)
 
     def create(self, seller_id: int, payload: ProductCreate) -> Product:
         if len(payload.image_urls) > 5:
             raise ServiceError(400, "At most 5 images are allowed")
+        fingerprint = self.duplicates.check(seller_id, payload.title, payload.description)
 
         product = Product(
             seller_id=seller_id,
@@ -23,12 +67,88 @@ class ProductService:
             description=payload.description,
             category=payload.category,
             condition=payload.condition,
+            price_anomaly_score=price_stats.score(payload.category, payload.condition, payload.price),
+            latitude=payload.latitude,
+            longitude=payload.longitude,
         )
+        self._locate(product)
         self.product_repo.create(product)
         self.product_repo.replace_images(product, payload.image_urls)
+        if fingerprint is not None:
+            self.duplicates.record(product.id, seller_id, fingerprint, new=True)
+        self.seller_stats_repo.adjust(seller_id, active=1)
+        self.event_repo.record(product.id, seller_id, ProductEventType.CREATED)
         self.db.commit()
         self.db.refresh(product)
-        return self.product_repo.get_by_id(product.id) or product
+        created = self.product_repo.get_by_id(product.id) or product
+        price_stats.observe(created.category, created.condition, created.price)
+        broker.publish(ProductChange.from_product(created, "created"))
+        saved_search_alerts.submit(created)
+        return created
+
+    def facets(
+        self,
+        fields: list[str],
+        *,
+        keyword: str | None,
+        include_blinded: bool,
+        selected: dict[str, object | None],
+        min_price: int | None = None,
+        max_price: int | None = None,
+    ) -> dict[str, dict[str, int]]:
+        key = (keyword or "", include_blinded, min_price, max_price)
+        rows = facet_cache.get(key)
+        if rows is None:
+            generation = facet_cache.generation
+            rows = self.product_repo.facet_counts(
+                keyword=keyword,
+                include_blinded=include_blinded,
+                min_price=min_price,
+                max_price=max_price,
+            )
+            facet_cache.set(key, rows, generation)
+
+        # One cached (category, condition, status) cube answers every facet. Each
+        # facet honours the other selected filters but not its own, so clients can
+        # still see counts for the alternatives.
+        counts = {field: {value.value: 0 for value in FACET_FIELDS[field]} for field in fields}
+        for category, condition, status, count in rows:
+            values = {"category": category, "condition": condition, "status": status}
+            for field in fields:
+                if all(
+                    selected.get(other) in (None, values[other])
+                    for other in FACET_FIELDS
+                    if other != field
+                ):
+                    counts[field][values[field].value] += count
+        return counts
+
+    def changes(
+        self,
+        *,
+        since: int | None,
+        limit: int,
+        include_blinded: bool,
+        settled_before: datetime,
+    ) -> tuple[int, bool, list[Product], list[int]]:
+        if since is None:
+            return self.event_repo.last_id(), False, [], []
+        # Pruning keeps the newest event, so a cursor outside the retained ids was
+        # issued before a prune (or by another database) and cannot be resumed.
+        first_id, last_id = self.event_repo.id_range()
+        if since > (last_id or 0) or (first_id is not None and since < first_id - 1):
+            raise ServiceError(410, "Change cursor has expired, resync the catalog")
+
+        events = self.event_repo.list_changed_after(since, settled_before, limit)
+        if not events:
+            return since, False, [], []
+        product_ids = sorted({product_id for _, product_id in events})
+        products = self.product_repo.list_by_ids(product_ids)
+        visible = [product for product in products if include_blinded or not product.is_blinded]
+        visible_ids = {product.id for product in visible}
+        # Deleted products, and blinded ones for regular clients, are sent as tombstones.
+        deleted_ids = [product_id for product_id in product_ids if product_id not in visible_ids]
+        return events[-1][0], len(events) == limit, visible, deleted_ids
 
     def list(
         self,
@@ -39,7 +159,24 @@ class ProductService:
         category: ProductCategory | None,
         sort: str,
         include_blinded: bool,
+        min_price: int | None = None,
+        max_price: int | None = None,
+        condition: ProductCondition | None = None,
+        status: ProductStatus | None = None,
+        latitude: float | None = None,
+        longitude: float | None = None,
+        radius_km: float | None = None,
     ):
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise ServiceError(400, "min_price cannot be greater than max_price")
+        location = (latitude, longitude, radius_km)
+        near = None
+        if any(value is not None for value in location):
+            if any(value is None for value in location):
+                raise ServiceError(400, "lat, lng and radius_km must be given together")
+            near = location
+        if sort == "distance" and near is None:
+            raise ServiceError(400, "sort=distance requires lat, lng and radius_km")
         return self.product_repo.list(
             page=page,
             page_size=page_size,
@@ -47,14 +184,29 @@ class ProductService:
             category=category,
             sort=sort,
             include_blinded=include_blinded,
+            min_price=min_price,
+            max_price=max_price,
+            condition=condition,
+            status=status,
+            near=near,
         )
 
-    def get(self, product_id: int) -> Product:
-        product = self.product_repo.get_by_id(product_id)
+    def get(self, product_id: int) -> Product | ArchivedProduct:
+        # Long-sold products live in the archive; they read the same as sold ones.
+        product = self.product_repo.get_by_id(product_id) or self.archive_repo.get_by_id(product_id)
         if not product:
             raise ServiceError(404, "Product not found")
         return product
 
+    def view(self, product_id: int, include_blinded: bool) -> Product | ArchivedProduct:
+        product = self.get(product_id)
+        if product.is_blinded and not include_blinded:
+            raise ServiceError(403, "Blinded product")
+        # Counted only once the detail is served, so refused requests add no popularity.
+        if isinstance(product, Product):
+            view_counter.add(product.id, 1)
+        return product
+
     def update(self, user_id: int, product_id: int, payload: ProductUpdate) -> Product:
         product = self.get(product_id)
         if product.seller_id != user_id:
@@ -62,18 +214,46 @@ class ProductService:
         if product.status == ProductStatus.SOLD:
             raise ServiceError(400, "Sold product cannot be updated")
 
+        before = listing_counts(product.status, product.is_blinded)
         data = payload.model_dump(exclude_unset=True)
         image_urls = data.pop("image_urls", None)
+        fingerprint = None
+        if "title" in data or "description" in data:
+            fingerprint = self.duplicates.check(
+                product.seller_id,
+                data.get("title", product.title),
+                data.get("description", product.description),
+                exclude_id=product.id,
+            )
+        priced = (product.category, product.condition, product.price)
         for key, value in data.items():
             setattr(product, key, value)
+        repriced = (product.category, product.condition, product.price) != priced
+        if repriced:
+            product.price_anomaly_score = price_stats.score(product.category, product.condition, product.price)
+        if "latitude" in data or "longitude" in data:
+            self._locate(product)
+        if "status" in data:
+            # A manual status change by the seller overrides any buyer hold.
+            product.reserved_by_id = None
+            product.reserved_until = None
         if image_urls is not None:
             if len(image_urls) > 5:
                 raise ServiceError(400, "At most 5 images are allowed")
             self.product_repo.replace_images(product, image_urls)
+        if fingerprint is not None:
+            self.duplicates.record(product.id, product.seller_id, fingerprint, new=False)
 
+        self._adjust_seller_counts(product, before)
+        self.event_repo.record(product.id, product.seller_id, ProductEventType.UPDATED)
         self.db.commit()
         self.db.refresh(product)
-        return self.get(product.id)
+        updated = self.get(product.id)
+        if repriced and not updated.is_blinded:
+            price_stats.observe(*priced, count=-1)
+            price_stats.observe(updated.category, updated.condition, updated.price)
+        broker.publish(ProductChange.from_product(updated, "updated"))
+        return updated
 
     def delete(self, user_id: int, product_id: int) -> None:
         product = self.get(product_id)
@@ -81,21 +261,40 @@ class ProductService:
             raise ServiceError(403, "Only seller can delete this product")
         if product.status == ProductStatus.SOLD:
             raise ServiceError(400, "Sold product cannot be deleted")
+        active, _ = listing_counts(product.status, product.is_blinded)
+        self.seller_stats_repo.adjust(product.seller_id, active=-active)
+        self.event_repo.record(product.id, product.seller_id, ProductEventType.DELETED)
+        delete_dependents(self.db, [product.id])
         self.db.delete(product)
         self.db.commit()
+        like_counter.discard(product_id)
+        view_counter.discard(product_id)
+        broker.publish(ProductChange(product_id=product_id, event="deleted"))
 
-    def blind(self, product_id: int, reason: str) -> Product:
-        product = self.get(product_id)
+    def mark_blinded(self, product: Product, reason: str) -> None:
+        # Joins the caller's transaction; the caller commits and publishes the change.
+        before = listing_counts(product.status, product.is_blinded)
         product.is_blinded = True
         product.blind_reason = reason
+        self._adjust_seller_counts(product, before)
+        self.event_repo.record(product.id, product.seller_id, ProductEventType.BLINDED)
+
+    def blind(self, product_id: int, reason: str) -> Product:
+        product = self.get(product_id)
+        self.mark_blinded(product, reason)
         self.db.commit()
         self.db.refresh(product)
+        broker.publish(ProductChange.from_product(product, "blinded"))
         return product
 
     def unblind(self, product_id: int) -> Product:
         product = self.get(product_id)
+        before = listing_counts(product.status, product.is_blinded)
         product.is_blinded = False
         product.blind_reason = None
+        self._adjust_seller_counts(product, before)
+        self.event_repo.record(product.id, product.seller_id, ProductEventType.UNBLINDED)
         self.db.commit()
         self.db.refresh(product)
+        broker.publish(ProductChange.from_product(product, "unblinded"))
         return product
@@ -1,20 +1,38 @@
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime, timezone
+
 from sqlalchemy.orm import Session
 
-from app.models import Purchase
+from app.core.pubsub import ProductChange, broker
+from app.models import ProductEventType, ProductStatus, Purchase
 from app.repositories.cart_repository import CartRepository
+from app.repositories.product_event_repository import ProductEventRepository
 from app.repositories.product_repository import ProductRepository
 from app.repositories.purchase_repository import PurchaseRepository
+from app.repositories.seller_stats_repository import SellerStatsRepository
 from app.services.errors import ServiceError
 
 
+def _naive_utc(moment: datetime | None) -> datetime | None:
+    # purchased_at is stored as naive UTC.
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 class PurchaseService:
     def __init__(self, db: Session):
         self.db = db
         self.product_repo = ProductRepository(db)
         self.cart_repo = CartRepository(db)
         self.purchase_repo = PurchaseRepository(db)
+        self.event_repo = ProductEventRepository(db)
+        self.seller_stats_repo = SellerStatsRepository(db)
 
-    def buy_now(self, buyer_id: int, product_id: int) -> Purchase:
+    def buy_now(
+        self, buyer_id: int, product_id: int, before_commit: Callable[[list[Purchase]], None] | None = None
+    ) -> Purchase:
         product = self.product_repo.get_by_id(product_id)
         if not product:
             raise ServiceError(404, "Product not found")
@@ -23,7 +41,7 @@ class PurchaseService:
         if product.seller_id == buyer_id:
             raise ServiceError(400, "Cannot buy your own product")
 
-        if not self.product_repo.mark_sold_if_available(product.id):
+        if not self.product_repo.mark_sold_if_available(product.id, buyer_id):
             raise ServiceError(409, "Product is already sold or unavailable")
 
         purchase = Purchase(
@@ -39,15 +57,25 @@ class PurchaseService:
         if cart_item:
             self.cart_repo.delete(cart_item)
 
+        # Only visible, unsold listings can be sold, so one active listing becomes sold.
+        self.seller_stats_repo.adjust(product.seller_id, active=-1, sold=1)
+        self.event_repo.record(product.id, product.seller_id, ProductEventType.SOLD)
+        change = ProductChange.from_product(product, "sold", status=ProductStatus.SOLD)
+        if before_commit:
+            before_commit([purchase])
         self.db.commit()
+        broker.publish(change)
         return purchase
 
-    def buy_selected_cart_items(self, buyer_id: int) -> list[Purchase]:
+    def buy_selected_cart_items(
+        self, buyer_id: int, before_commit: Callable[[list[Purchase]], None] | None = None
+    ) -> list[Purchase]:
         items = self.cart_repo.list_selected(buyer_id)
         if not items:
             raise ServiceError(400, "No selected cart items")
 
         purchases: list[Purchase] = []
+        changes: list[ProductChange] = []
         for item in items:
             product = self.product_repo.get_by_id(item.product_id)
             if not product:
@@ -55,7 +83,7 @@ class PurchaseService:
             if product.seller_id == buyer_id:
                 continue
 
-            if not self.product_repo.mark_sold_if_available(product.id):
+            if not self.product_repo.mark_sold_if_available(product.id, buyer_id):
                 continue
 
             purchase = Purchase(
@@ -68,15 +96,26 @@ class PurchaseService:
             self.purchase_repo.create(purchase)
             self.cart_repo.delete(item)
             purchases.append(purchase)
+            changes.append(ProductChange.from_product(product, "sold", status=ProductStatus.SOLD))
 
         if not purchases:
             raise ServiceError(400, "No purchasable selected items")
 
+        for seller_id, sold in Counter(purchase.seller_id for purchase in purchases).items():
+            self.seller_stats_repo.adjust(seller_id, active=-sold, sold=sold)
+
+        self.event_repo.record_many(
+            [(purchase.product_id, purchase.seller_id, ProductEventType.SOLD) for purchase in purchases]
+        )
+        if before_commit:
+            before_commit(purchases)
         self.db.commit()
+        for change in changes:
+            broker.publish(change)
         return purchases
 
-    def my_purchases(self, buyer_id: int):
-        return self.purchase_repo.list_by_buyer(buyer_id)
+    def my_purchases(self, buyer_id: int, since: datetime | None = None, until: datetime | None = None):
+        return self.purchase_repo.list_by_buyer(buyer_id, _naive_utc(since), _naive_utc(until))
 
-    def my_sales(self, seller_id: int):
-        return self.purchase_repo.list_by_seller(seller_id)
+    def my_sales(self, seller_id: int, since: datetime | None = None, until: datetime | None = None):
+        return self.purchase_repo.list_by_seller(seller_id, _naive_utc(since), _naive_utc(until))
@@ -0,0 +1,296 @@
+import logging
+import math
+import threading
+import zlib
+from collections import Counter
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.text import tokenize
+from app.models import Product, ProductCategory, ProductStatus
+from app.repositories.product_repository import ProductRepository
+from app.services.errors import ServiceError
+from app.services.outbox_service import outbox_poller
+
+logger = logging.getLogger(__name__)
+
+BIGRAM_WEIGHT = 0.5
+# Measured cost of one product_id -> slot entry (dict slot plus two int objects).
+SLOT_ENTRY_BYTES = 106
+
+
+def hashed_features(text: str) -> Counter:
+    # Words plus in-word character bigrams, so Korean nouns still match when
+    # particles are attached ("자전거를" vs "자전거").
+    features: Counter = Counter()
+    for word in tokenize(text):
+        features[word] += 1.0
+        if len(word) > 2:
+            for start in range(len(word) - 1):
+                features[word[start : start + 2]] += BIGRAM_WEIGHT
+    return features
+
+
+class HashedTfidf:
+    # Feature hashing keeps the vocabulary unbounded with fixed-width vectors.
+    # Document frequencies are kept per bucket; vectors are weighted with the IDF
+    # current at insertion and re-weighted on the next full rebuild.
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self.document_count = 0
+        self.document_frequency = np.zeros(dimensions, dtype=np.int64)
+
+    def term_frequencies(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, count in hashed_features(text).items():
+            digest = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            vector[digest % self.dimensions] += sign * (1.0 + math.log(count))
+        return vector
+
+    def observe(self, term_frequencies: np.ndarray) -> None:
+        self.document_count += len(term_frequencies)
+        self.document_frequency += np.count_nonzero(term_frequencies, axis=0)
+
+    def weigh(self, term_frequencies: np.ndarray) -> np.ndarray:
+        idf = np.log((1.0 + self.document_count) / (1.0 + self.document_frequency)) + 1.0
+        weighted = term_frequencies * idf.astype(np.float32)
+        norms = np.linalg.norm(weighted, axis=-1, keepdims=True)
+        return weighted / np.maximum(norms, 1e-12)
+
+
+class CategoryVectors:
+    def __init__(self, dimensions: int, capacity: int = 1024):
+        self.matrix = np.zeros((capacity, dimensions), dtype=np.float32)
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.slots: dict[int, int] = {}
+        self.size = 0
+
+    @property
+    def live(self) -> int:
+        return int(np.count_nonzero(self.active[: self.size]))
+
+    def slot_of(self, product_id: int) -> int | None:
+        return self.slots.get(product_id)
+
+    def upsert(self, product_id: int, vector: np.ndarray) -> None:
+        slot = self.slot_of(product_id)
+        if slot is None:
+            if self.size == len(self.ids):
+                self._grow()
+            slot = self.size
+            self.ids[slot] = product_id
+            self.slots[product_id] = slot
+            self.size += 1
+        self.matrix[slot] = vector
+        self.active[slot] = True
+
+    def extend(self, product_ids: np.ndarray, vectors: np.ndarray) -> None:
+        while self.size + len(product_ids) > len(self.ids):
+            self._grow()
+        end = self.size + len(product_ids)
+        self.ids[self.size : end] = product_ids
+        self.matrix[self.size : end] = vectors
+        self.active[self.size : end] = True
+        self.slots.update(zip(product_ids.tolist(), range(self.size, end)))
+        self.size = end
+
+    def deactivate(self, product_id: int) -> bool:
+        slot = self.slot_of(product_id)
+        if slot is None or not self.active[slot]:
+            return False
+        self.active[slot] = False
+        return True
+
+    def compact(self, drop_oldest: int = 0) -> None:
+        # Slots are in insertion order, so dropping from the front evicts the oldest.
+        # New arrays are swapped in so concurrent queries keep a consistent snapshot.
+        keep = np.flatnonzero(self.active[: self.size])[drop_oldest:]
+        capacity = max(1024, len(keep) * 2)
+        matrix = np.zeros((capacity, self.matrix.shape[1]), dtype=np.float32)
+        matrix[: len(keep)] = self.matrix[keep]
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[: len(keep)] = self.ids[keep]
+        active = np.zeros(capacity, dtype=bool)
+        active[: len(keep)] = True
+        slots = dict(zip(ids[: len(keep)].tolist(), range(len(keep))))
+        self.matrix, self.ids, self.active, self.slots, self.size = matrix, ids, active, slots, len(keep)
+
+    def _grow(self) -> None:
+        capacity = len(self.ids) * 2
+        matrix = np.zeros((capacity, self.matrix.shape[1]), dtype=np.float32)
+        matrix[: self.size] = self.matrix[: self.size]
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[: self.size] = self.ids[: self.size]
+        active = np.zeros(capacity, dtype=bool)
+        active[: self.size] = self.active[: self.size]
+        self.matrix, self.ids, self.active = matrix, ids, active
+
+    def nbytes(self) -> int:
+        return self.matrix.nbytes + self.ids.nbytes + self.active.nbytes + len(self.slots) * SLOT_ENTRY_BYTES
+
+
+class SimilarItemsIndex:
+    def __init__(self, session_factory, dimensions: int, memory_budget_mb: int, build_batch: int = 2000):
+        self.session_factory = session_factory
+        self.vectorizer = HashedTfidf(dimensions)
+        self.max_items = memory_budget_mb * 1024 * 1024 // (dimensions * 4 + 9 + SLOT_ENTRY_BYTES)
+        self.build_batch = build_batch
+        self.categories = {category: CategoryVectors(dimensions) for category in ProductCategory}
+        self.ready = False
+        self._pending: set[int] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return sum(vectors.live for vectors in self.categories.values())
+
+    def nbytes(self) -> int:
+        return sum(vectors.nbytes() for vectors in self.categories.values())
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.build, name="similar-items-build", daemon=True)
+        self._thread.start()
+
+    def build(self) -> None:
+        db = self.session_factory()
+        try:
+            rows = ProductRepository(db).iter_similarity_source(self.build_batch)
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.build_batch:
+                    self.add_many(batch, fresh=True)
+                    batch = []
+            self.add_many(batch, fresh=True)
+        finally:
+            db.close()
+        with self._lock:
+            self.ready = True
+            pending, self._pending = self._pending, set()
+        # Changes seen while the snapshot was loading are replayed on top of it.
+        self.refresh(pending)
+
+    def add_many(self, rows, fresh: bool = False) -> None:
+        if not rows:
+            return
+        term_frequencies = np.stack(
+            [self.vectorizer.term_frequencies(f"{row.title} {row.description}") for row in rows]
+        )
+        with self._lock:
+            self.vectorizer.observe(term_frequencies)
+            vectors = self.vectorizer.weigh(term_frequencies)
+            if fresh:
+                # Initial load: ids are known to be new, so skip the per-id slot lookups.
+                self._ensure_room(len(rows))
+                categories = np.array([row.category.value for row in rows])
+                ids = np.array([row.id for row in rows], dtype=np.int64)
+                for category, store in self.categories.items():
+                    selected = categories == category.value
+                    if selected.any():
+                        store.extend(ids[selected], vectors[selected])
+                return
+            for row, vector in zip(rows, vectors):
+                for category, store in self.categories.items():
+                    if category != row.category:
+                        store.deactivate(row.id)
+                self._ensure_room(1)
+                self.categories[row.category].upsert(row.id, vector)
+
+    def remove_many(self, product_ids) -> None:
+        with self._lock:
+            for product_id in product_ids:
+                for store in self.categories.values():
+                    store.deactivate(product_id)
+
+    def _ensure_room(self, incoming: int) -> None:
+        total = sum(store.size for store in self.categories.values())
+        if total + incoming <= self.max_items:
+            return
+        for store in self.categories.values():
+            store.compact()
+        total = sum(store.size for store in self.categories.values())
+        while total + incoming > self.max_items and total > 0:
+            # Over budget: evict the oldest tenth of the largest category.
+            largest = max(self.categories.values(), key=lambda store: store.size)
+            dropped = max(1, largest.size // 10)
+            largest.compact(drop_oldest=dropped)
+            total -= dropped
+
+    def on_events(self, events) -> None:
+        product_ids = {event.product_id for event in events}
+        with self._lock:
+            if not self.ready:
+                self._pending |= product_ids
+                return
+        self.refresh(product_ids)
+
+    def refresh(self, product_ids) -> None:
+        if not product_ids:
+            return
+        db = self.session_factory()
+        try:
+            rows = ProductRepository(db).list_similarity_source(sorted(product_ids))
+        finally:
+            db.close()
+        listable = [row for row in rows if row.status != ProductStatus.SOLD and not row.is_blinded]
+        listable_ids = {row.id for row in listable}
+        self.remove_many(product_id for product_id in product_ids if product_id not in listable_ids)
+        self.add_many(listable)
+
+    def query(
+        self, category: ProductCategory, text: str, limit: int, exclude_id: int | None = None
+    ) -> list[tuple[int, float]]:
+        term_frequencies = self.vectorizer.term_frequencies(text)
+        with self._lock:
+            query = self.vectorizer.weigh(term_frequencies)
+            store = self.categories[category]
+            size = store.size
+            matrix, ids, active = store.matrix, store.ids, store.active
+        if size == 0:
+            return []
+        scores = matrix[:size] @ query
+        scores[~active[:size]] = -np.inf
+        if exclude_id is not None:
+            scores[ids[:size] == exclude_id] = -np.inf
+        count = min(limit, size)
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[slot]), float(scores[slot])) for slot in top if scores[slot] > 0]
+
+
+similar_items = SimilarItemsIndex(
+    SessionLocal,
+    dimensions=settings.similar_items_dimensions,
+    memory_budget_mb=settings.similar_items_memory_mb,
+)
+outbox_poller.register(similar_items.on_events)
+
+
+class RecommendationService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.product_repo = ProductRepository(db)
+
+    def similar(self, product_id: int, limit: int, include_blinded: bool) -> list[Product]:
+        source = self.product_repo.get_similarity_source(product_id)
+        if not source or (source.is_blinded and not include_blinded):
+            raise ServiceError(404, "Product not found")
+        # Over-fetch slightly: the index can briefly lag behind sales and blinds.
+        matches = similar_items.query(
+            source.category, f"{source.title} {source.description}", limit + 5, exclude_id=product_id
+        )
+        products = {
+            item.id: item
+            for item in self.product_repo.list_by_ids(
+                [product_id for product_id, _ in matches], with_seller=True
+            )
+            if item.status != ProductStatus.SOLD and not item.is_blinded
+        }
+        return [products[product_id] for product_id, _ in matches if product_id in products][:limit]
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.pubsub import ProductChange, broker
+from app.models import ProductReport, ProductReportStats
+from app.repositories.product_repository import ProductRepository
+from app.repositories.report_repository import ReportRepository
+from app.services.errors import ServiceError
+from app.services.product_service import ProductService
+
+AUTO_BLIND_REASON = "Automatically hidden after repeated reports"
+
+
+class ReportService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.report_repo = ReportRepository(db)
+        self.product_repo = ProductRepository(db)
+
+    def report(self, reporter_id: int, product_id: int, reason: str) -> tuple[int, bool]:
+        product = self.product_repo.get_by_id(product_id)
+        if not product:
+            raise ServiceError(404, "Product not found")
+        if product.seller_id == reporter_id:
+            raise ServiceError(400, "Cannot report your own product")
+
+        # One report per user and product; repeating it changes nothing.
+        report = ProductReport(product_id=product_id, reporter_id=reporter_id, reason=reason)
+        if not self.report_repo.add(report):
+            return self.report_repo.count(product_id), product.is_blinded
+        report_count = self.report_repo.increment(product_id, datetime.utcnow())
+        threshold = settings.report_auto_blind_threshold
+        auto_blinded = bool(threshold) and report_count >= threshold and not product.is_blinded
+        if auto_blinded:
+            ProductService(self.db).mark_blinded(product, AUTO_BLIND_REASON)
+        self.db.commit()
+        if auto_blinded:
+            self.db.refresh(product)
+            broker.publish(ProductChange.from_product(product, "blinded"))
+        return report_count, product.is_blinded
+
+    def queue(self, limit: int) -> tuple[list[ProductReportStats], dict[int, list[str]]]:
+        entries = self.report_repo.list_queue(limit)
+        reasons = self.report_repo.list_reasons([entry.product_id for entry in entries], per_product=3)
+        return entries, reasons
+
+    def dismiss(self, product_id: int) -> None:
+        if not self.report_repo.clear(product_id):
+            raise ServiceError(404, "No open reports for this product")
+        self.db.commit()
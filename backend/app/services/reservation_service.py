@@ -0,0 +1,165 @@
+import heapq
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.pubsub import ProductChange, broker
+from app.models import ProductEventType, ProductStatus
+from app.repositories.product_event_repository import ProductEventRepository
+from app.repositories.product_repository import ProductRepository
+from app.services.errors import ServiceError
+
+
+class ReservationSweeper:
+    def __init__(self, session_factory, batch_size: int, scan_interval: float):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.scan_interval = scan_interval
+        self._heap: list[tuple[datetime, int]] = []
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+        self._next_scan = datetime.min
+
+    def schedule(self, product_id: int, until: datetime) -> None:
+        with self._condition:
+            heapq.heappush(self._heap, (until, product_id))
+            if self._heap[0] == (until, product_id):
+                self._condition.notify()
+
+    def load(self) -> None:
+        db = self.session_factory()
+        try:
+            rows = ProductRepository(db).iter_reservation_deadlines(self.batch_size)
+            with self._condition:
+                for product_id, until in rows:
+                    self._heap.append((until, product_id))
+                heapq.heapify(self._heap)
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped = False
+        self.load()
+        self._thread = threading.Thread(target=self._run, name="reservation-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _pop_due(self, now: datetime) -> list[int]:
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+            due.append(heapq.heappop(self._heap)[1])
+        return due
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                now = datetime.utcnow()
+                timeout = self.scan_interval
+                if self._heap:
+                    timeout = min(timeout, max(0.0, (self._heap[0][0] - now).total_seconds()))
+                self._condition.wait(timeout)
+                if self._stopped:
+                    return
+            try:
+                self.sweep()
+            except Exception:
+                # A failed batch stays in the table and is retried by the next indexed scan.
+                self._next_scan = datetime.min
+
+    def sweep(self, now: datetime | None = None) -> int:
+        now = now or datetime.utcnow()
+        with self._condition:
+            due = self._pop_due(now)
+        scan = now >= self._next_scan
+        if not due and not scan:
+            return 0
+
+        db = self.session_factory()
+        try:
+            repo = ProductRepository(db)
+            released: list[int] = []
+            if due:
+                released += repo.release_expired_reservations(due, now)
+            if scan:
+                # Holds created by other workers never reach this heap; the
+                # reserved_until index makes this fallback scan cheap.
+                self._next_scan = now + timedelta(seconds=self.scan_interval)
+                expired = repo.list_expired_reservation_ids(now, self.batch_size)
+                if expired:
+                    released += repo.release_expired_reservations(expired, now)
+            ProductEventRepository(db).record_many(
+                [(product_id, None, ProductEventType.RELEASED) for product_id in released]
+            )
+            db.commit()
+        finally:
+            db.close()
+        for product_id in released:
+            broker.publish(
+                ProductChange(product_id=product_id, event="released", status=ProductStatus.ON_SALE.value)
+            )
+        return len(released)
+
+
+reservation_sweeper = ReservationSweeper(
+    SessionLocal,
+    batch_size=settings.reservation_sweep_batch,
+    scan_interval=settings.reservation_sweep_interval_seconds,
+)
+
+
+class ReservationService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.product_repo = ProductRepository(db)
+        self.event_repo = ProductEventRepository(db)
+
+    def reserve(self, user_id: int, product_id: int) -> datetime:
+        until = datetime.utcnow() + timedelta(minutes=settings.reservation_minutes)
+        if not self.product_repo.reserve_if_available(product_id, user_id, until):
+            self.db.rollback()
+            product = self.product_repo.get_availability(product_id)
+            if not product:
+                raise ServiceError(404, "Product not found")
+            if product.seller_id == user_id:
+                raise ServiceError(400, "Cannot reserve your own product")
+            if product.is_blinded:
+                raise ServiceError(400, "Blinded product cannot be reserved")
+            if (
+                product.status == ProductStatus.RESERVED
+                and product.reserved_by_id == user_id
+                and product.reserved_until > datetime.utcnow()
+            ):
+                # Reserving again answers with the existing hold; it is never extended.
+                return product.reserved_until
+            raise ServiceError(409, "Product is already reserved or sold")
+        self.event_repo.record(product_id, None, ProductEventType.RESERVED)
+        self.db.commit()
+        reservation_sweeper.schedule(product_id, until)
+        broker.publish(
+            ProductChange(product_id=product_id, event="reserved", status=ProductStatus.RESERVED.value)
+        )
+        return until
+
+    def release(self, user_id: int, product_id: int) -> None:
+        if not self.product_repo.release_reservation(product_id, user_id):
+            raise ServiceError(404, "Reservation not found")
+        self.event_repo.record(product_id, None, ProductEventType.RELEASED)
+        self.db.commit()
+        broker.publish(
+            ProductChange(product_id=product_id, event="released", status=ProductStatus.ON_SALE.value)
+        )
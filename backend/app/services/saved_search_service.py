@@ -0,0 +1,376 @@
+import logging
+import queue
+import re
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Product, ProductCategory, SavedSearch
+from app.repositories.notification_repository import NotificationRepository
+from app.repositories.saved_search_repository import SavedSearchRepository
+from app.schemas.saved_search import SavedSearchCreate
+from app.services.errors import ServiceError
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_CODES = {category: code for code, category in enumerate(ProductCategory)}
+CATEGORY_BY_CODE = list(CATEGORY_CODES)
+ANY = -1
+MAX_GRAM = 4
+RECONCILE_SECONDS = 300
+
+
+@lru_cache(maxsize=1024)
+def _like_pattern(keyword: str) -> re.Pattern:
+    return re.compile(
+        "".join(".*" if char == "%" else "." if char == "_" else re.escape(char) for char in keyword),
+        re.DOTALL,
+    )
+
+
+def keyword_matches(keyword: str, text: str) -> bool:
+    # The product search filters with ILIKE '%keyword%' (% and _ are wildcards);
+    # both sides are already lowercased.
+    if "%" in keyword or "_" in keyword:
+        return _like_pattern(keyword).search(text) is not None
+    return keyword in text
+
+
+def _anchor_grams(keyword: str) -> list[str]:
+    # Any substring of a literal run must occur wherever the keyword matches.
+    pieces = [piece for piece in re.split("[%_]", keyword) if piece]
+    if not pieces:
+        return []
+    piece = max(pieces, key=len)
+    size = min(MAX_GRAM, len(piece))
+    return sorted({piece[start : start + size] for start in range(len(piece) - size + 1)})
+
+
+@dataclass(frozen=True)
+class ListingSnapshot:
+    product_id: int
+    seller_id: int
+    title: str
+    description: str
+    category: ProductCategory
+    price: int
+
+    @classmethod
+    def from_product(cls, product: Product) -> "ListingSnapshot":
+        return cls(
+            product.id,
+            product.seller_id,
+            product.title,
+            product.description,
+            product.category,
+            product.price,
+        )
+
+
+class SavedSearchIndex:
+    # Searches live in parallel typed arrays addressed by slot, so a million of
+    # them cost tens of megabytes rather than a million Python objects. Each
+    # keyword search is filed under one character n-gram of its keyword, the one
+    # whose bucket is smallest when it is added; keyword-less searches are filed
+    # under their category. Searches arrive in id order, so ids stays sorted.
+    def __init__(self):
+        self.ids = array("q")
+        self.user_ids = array("q")
+        self.categories = array("b")
+        self.min_prices = array("q")
+        self.max_prices = array("q")
+        self.keywords: list[str | None] = []
+        self.last_id = 0
+        self._by_anchor: dict[str, array] = {}
+        self._anchor_lengths: set[int] = set()
+        self._broad: dict[int, array] = {}
+        self._removed: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.ids) - len(self._removed)
+
+    def add(
+        self,
+        search_id: int,
+        user_id: int,
+        keyword: str | None,
+        category: ProductCategory | None,
+        min_price: int | None,
+        max_price: int | None,
+    ) -> None:
+        # Popular keywords repeat across many searches; interning shares one string.
+        keyword = sys.intern(keyword.lower()) if keyword else None
+        grams = _anchor_grams(keyword) if keyword else []
+        slot = len(self.ids)
+        self.ids.append(search_id)
+        self.user_ids.append(user_id)
+        self.categories.append(CATEGORY_CODES[category] if category else ANY)
+        self.min_prices.append(min_price if min_price is not None else -1)
+        self.max_prices.append(max_price if max_price is not None else -1)
+        self.keywords.append(keyword)
+        self.last_id = max(self.last_id, search_id)
+        if grams:
+            anchor = min(grams, key=lambda gram: len(self._by_anchor.get(gram, ())))
+            self._by_anchor.setdefault(anchor, array("I")).append(slot)
+            self._anchor_lengths.add(len(anchor))
+        else:
+            self._broad.setdefault(self.categories[slot], array("I")).append(slot)
+
+    def remove(self, search_id: int) -> bool:
+        slot = bisect_left(self.ids, search_id)
+        if slot == len(self.ids) or self.ids[slot] != search_id or slot in self._removed:
+            return False
+        keyword = self.keywords[slot]
+        buckets = [self._by_anchor.get(gram) for gram in _anchor_grams(keyword)] if keyword else []
+        buckets.append(self._broad.get(self.categories[slot]))
+        for bucket in buckets:
+            if bucket is not None and slot in bucket:
+                bucket.remove(slot)
+                break
+        self.keywords[slot] = None
+        self._removed.add(slot)
+        return True
+
+    @property
+    def removed_count(self) -> int:
+        return len(self._removed)
+
+    def live_ids(self) -> list[int]:
+        return [search_id for slot, search_id in enumerate(self.ids) if slot not in self._removed]
+
+    def compacted(self) -> "SavedSearchIndex":
+        index = SavedSearchIndex()
+        for slot in range(len(self.ids)):
+            if slot not in self._removed:
+                index.add(
+                    self.ids[slot],
+                    self.user_ids[slot],
+                    self.keywords[slot],
+                    None if self.categories[slot] == ANY else CATEGORY_BY_CODE[self.categories[slot]],
+                    None if self.min_prices[slot] < 0 else self.min_prices[slot],
+                    None if self.max_prices[slot] < 0 else self.max_prices[slot],
+                )
+        index.last_id = self.last_id
+        return index
+
+    def candidates(self, listing: ListingSnapshot) -> set[int]:
+        # Every n-gram of the listing text is looked up, so the cost scales with
+        # the listing's length and the distinct anchor lengths, never with the
+        # number of searches.
+        slots: set[int] = set()
+        text = f"{listing.title}\n{listing.description}".lower()
+        for length in self._anchor_lengths:
+            for gram in {text[start : start + length] for start in range(len(text) - length + 1)}:
+                bucket = self._by_anchor.get(gram)
+                if bucket is not None:
+                    slots.update(bucket)
+        for code in (ANY, CATEGORY_CODES[listing.category]):
+            bucket = self._broad.get(code)
+            if bucket is not None:
+                slots.update(bucket)
+        return slots
+
+    def match(self, listing: ListingSnapshot) -> list[int]:
+        title = listing.title.lower()
+        description = listing.description.lower()
+        category = CATEGORY_CODES[listing.category]
+        matched = []
+        for slot in self.candidates(listing):
+            if self.user_ids[slot] == listing.seller_id:
+                continue
+            if self.categories[slot] not in (ANY, category):
+                continue
+            if self.min_prices[slot] > listing.price:
+                continue
+            if 0 <= self.max_prices[slot] < listing.price:
+                continue
+            keyword = self.keywords[slot]
+            if keyword and not (keyword_matches(keyword, title) or keyword_matches(keyword, description)):
+                continue
+            matched.append(self.ids[slot])
+        return matched
+
+
+class SavedSearchAlerts:
+    # Listings are matched on the worker that created them, off the request path.
+    # New searches from every worker are loaded incrementally before each batch,
+    # and only this thread touches the index, so it needs no locking. Deletes on
+    # this worker are queued for removal; deletes on other workers are found by
+    # a periodic count check (until then delivery re-checks the table).
+    def __init__(self, session_factory, queue_size: int, batch_size: int):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.index = SavedSearchIndex()
+        self._queue: queue.Queue[ListingSnapshot | None] = queue.Queue(maxsize=queue_size)
+        self._removals: queue.SimpleQueue[int] = queue.SimpleQueue()
+        self._reconcile_at = 0.0
+        self._thread: threading.Thread | None = None
+
+    def forget(self, search_id: int) -> None:
+        self._removals.put(search_id)
+
+    def submit(self, product: Product) -> None:
+        try:
+            self._queue.put_nowait(ListingSnapshot.from_product(product))
+        except queue.Full:
+            logger.warning("saved search alert queue full; dropping product %s", product.id)
+
+    def refresh(self) -> int:
+        db = self.session_factory()
+        try:
+            repo = SavedSearchRepository(db)
+            loaded = 0
+            for row in repo.iter_after(self.index.last_id):
+                self.index.add(*row)
+                loaded += 1
+            # Applied after loading, so a search deleted while it was being loaded goes too.
+            while True:
+                try:
+                    self.index.remove(self._removals.get_nowait())
+                except queue.Empty:
+                    break
+            if time.monotonic() >= self._reconcile_at:
+                self._reconcile_at = time.monotonic() + RECONCILE_SECONDS
+                if repo.count_up_to(self.index.last_id) < len(self.index):
+                    live = set(repo.ids_up_to(self.index.last_id))
+                    for search_id in self.index.live_ids():
+                        if search_id not in live:
+                            self.index.remove(search_id)
+            if self.index.removed_count > len(self.index):
+                self.index = self.index.compacted()
+            return loaded
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.refresh()
+        self._thread = threading.Thread(target=self._run, name="saved-search-alerts", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            listing = self._queue.get()
+            if listing is None:
+                return
+            batch = [listing]
+            while len(batch) < self.batch_size:
+                try:
+                    listing = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if listing is None:
+                    self._deliver(batch)
+                    return
+                batch.append(listing)
+            self._deliver(batch)
+
+    def drain(self) -> int:
+        batch = []
+        while True:
+            try:
+                listing = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if listing is not None:
+                batch.append(listing)
+        return self._deliver(batch)
+
+    def _deliver(self, batch: list[ListingSnapshot]) -> int:
+        if not batch:
+            return 0
+        delivered = 0
+        try:
+            self.refresh()
+            db = self.session_factory()
+            try:
+                repo = NotificationRepository(db)
+                for listing in batch:
+                    matched = self.index.match(listing)
+                    if matched:
+                        delivered += repo.create_for_matches(listing.product_id, matched)
+                db.commit()
+            finally:
+                db.close()
+        except Exception:
+            logger.exception("failed to deliver saved search alerts")
+        return delivered
+
+
+saved_search_alerts = SavedSearchAlerts(
+    SessionLocal,
+    queue_size=settings.saved_search_queue_size,
+    batch_size=settings.saved_search_batch_size,
+)
+
+
+class SavedSearchService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.saved_search_repo = SavedSearchRepository(db)
+
+    def create(self, user_id: int, payload: SavedSearchCreate) -> SavedSearch:
+        keyword = payload.keyword.strip() if payload.keyword else None
+        if not keyword and payload.category is None:
+            raise ServiceError(400, "A saved search needs a keyword or a category")
+        if (
+            payload.min_price is not None
+            and payload.max_price is not None
+            and payload.min_price > payload.max_price
+        ):
+            raise ServiceError(400, "min_price cannot be greater than max_price")
+        if self.saved_search_repo.count_by_user(user_id) >= settings.saved_search_limit:
+            raise ServiceError(400, f"At most {settings.saved_search_limit} saved searches are allowed")
+
+        saved_search = SavedSearch(
+            user_id=user_id,
+            keyword=keyword,
+            category=payload.category,
+            min_price=payload.min_price,
+            max_price=payload.max_price,
+        )
+        self.saved_search_repo.create(saved_search)
+        self.db.commit()
+        return saved_search
+
+    def list(self, user_id: int) -> list[SavedSearch]:
+        return self.saved_search_repo.list_by_user(user_id)
+
+    def delete(self, user_id: int, saved_search_id: int) -> None:
+        saved_search = self.saved_search_repo.get(user_id, saved_search_id)
+        if not saved_search:
+            raise ServiceError(404, "Saved search not found")
+        self.saved_search_repo.delete(saved_search)
+        self.db.commit()
+        saved_search_alerts.forget(saved_search_id)
+
+
+class NotificationService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.notification_repo = NotificationRepository(db)
+
+    def inbox(self, user_id: int, before_id: int | None, limit: int):
+        items = self.notification_repo.list_by_user(user_id, before_id, limit)
+        return items, self.notification_repo.count_unread(user_id)
+
+    def mark_read(self, user_id: int, up_to_id: int) -> int:
+        updated = self.notification_repo.mark_read(user_id, up_to_id)
+        self.db.commit()
+        return updated
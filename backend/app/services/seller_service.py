@@ -0,0 +1,95 @@
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import LocalCache
+from app.core.config import settings
+from app.models import Product, ProductStatus
+from app.repositories.product_repository import ProductRepository
+from app.repositories.seller_stats_repository import SellerStatsRepository
+from app.repositories.user_repository import UserRepository
+from app.services.errors import ServiceError
+from app.services.outbox_service import outbox_poller
+
+
+@dataclass(frozen=True)
+class SellerSnapshot:
+    id: int
+    nickname: str
+    active_count: int
+    sold_count: int
+
+
+seller_cache = LocalCache(
+    max_entries=settings.seller_cache_size, ttl_seconds=settings.seller_cache_ttl_seconds
+)
+
+
+def invalidate_sellers(events) -> None:
+    for seller_id in {event.seller_id for event in events if event.seller_id is not None}:
+        seller_cache.discard(seller_id)
+
+
+outbox_poller.register(invalidate_sellers)
+
+
+def encode_cursor(product: Product) -> str:
+    raw = f"{product.created_at.isoformat()}|{product.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, product_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(product_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ServiceError(400, "Invalid cursor")
+
+
+class SellerService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.user_repo = UserRepository(db)
+        self.product_repo = ProductRepository(db)
+        self.seller_stats_repo = SellerStatsRepository(db)
+
+    def header(self, seller_id: int) -> SellerSnapshot:
+        snapshot = seller_cache.get(seller_id)
+        if snapshot is not None:
+            return snapshot
+        generation = seller_cache.generation
+        seller = self.user_repo.get_by_id(seller_id)
+        if not seller:
+            raise ServiceError(404, "Seller not found")
+        stats = self.seller_stats_repo.get(seller_id)
+        if stats:
+            counts = {"active_count": stats.active_count, "sold_count": stats.sold_count}
+        else:
+            counts = self.seller_stats_repo.count(seller_id)
+        snapshot = SellerSnapshot(id=seller.id, nickname=seller.nickname, **counts)
+        seller_cache.set(seller_id, snapshot, generation)
+        return snapshot
+
+    def products(
+        self,
+        seller_id: int,
+        status: ProductStatus | None,
+        cursor: str | None,
+        limit: int,
+        include_blinded: bool,
+    ) -> tuple[SellerSnapshot, list[Product], str | None]:
+        after = decode_cursor(cursor) if cursor else None
+        header = self.header(seller_id)
+        items = self.product_repo.list_by_seller(
+            seller_id,
+            status=status,
+            include_blinded=include_blinded,
+            after=after,
+            limit=limit + 1,
+        )
+        next_cursor = encode_cursor(items[limit - 1]) if len(items) > limit else None
+        return header, items[:limit], next_cursor
@@ -0,0 +1,239 @@
+import logging
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.text import fold, tokenize
+from app.models import ProductStatus
+from app.repositories.product_repository import ProductRepository
+from app.services.outbox_service import outbox_poller
+
+logger = logging.getLogger(__name__)
+
+MAX_WORDS = 8
+MAX_KEY = 48
+HEAD_THRESHOLD = 256
+SCAN_THRESHOLD = 8192
+SEPARATOR = "\x00"
+UPPER = "\U0010ffff"
+
+# Compound finals are stored as two finals, so "달" is a prefix of "닭".
+COMPOUND_FINALS = str.maketrans({
+    "ᆪ": "ᆨᆺ", "ᆬ": "ᆫᆽ", "ᆭ": "ᆫᇂ",
+    "ᆰ": "ᆯᆨ", "ᆱ": "ᆯᆷ", "ᆲ": "ᆯᆸ",
+    "ᆳ": "ᆯᆺ", "ᆴ": "ᆯᇀ", "ᆵ": "ᆯᇁ",
+    "ᆶ": "ᆯᇂ", "ᆹ": "ᆸᆺ",
+})
+# A trailing final may still become the next syllable's initial while the user
+# is typing ("잔" on the way to "자나"), so the query also tries it moved.
+FINAL_TO_INITIAL = {
+    "ᆨ": "ᄀ", "ᆩ": "ᄁ", "ᆫ": "ᄂ", "ᆮ": "ᄃ",
+    "ᆯ": "ᄅ", "ᆷ": "ᄆ", "ᆸ": "ᄇ", "ᆺ": "ᄉ",
+    "ᆻ": "ᄊ", "ᆼ": "ᄋ", "ᆽ": "ᄌ", "ᆾ": "ᄎ",
+    "ᆿ": "ᄏ", "ᇀ": "ᄐ", "ᇁ": "ᄑ", "ᇂ": "ᄒ",
+}
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    product_id: int
+    title: str
+
+
+def search_words(text: str) -> list[str]:
+    return [fold(word).translate(COMPOUND_FINALS) for word in tokenize(text)]
+
+
+def title_keys(title: str) -> list[str]:
+    # One key per word position, so "bike" also completes "Trek road bike".
+    words = search_words(title)[:MAX_WORDS]
+    return list(dict.fromkeys(" ".join(words[start:])[:MAX_KEY] for start in range(len(words))))
+
+
+def query_keys(text: str) -> list[str]:
+    query = " ".join(search_words(text))[:MAX_KEY]
+    if not query:
+        return []
+    if query[-1] in FINAL_TO_INITIAL:
+        return [query, query[:-1] + FINAL_TO_INITIAL[query[-1]]]
+    return [query]
+
+
+class SuggestIndex:
+    # Keys are "<folded title suffix>\0<product id>" in sorted lists, bucketed by
+    # first character so inserts only shift one bucket. A prefix lookup is two
+    # bisections. Recency is the product id, which is allocated in creation order;
+    # prefixes matching many keys keep a cached head of their newest ids.
+    def __init__(self, session_factory, limit: int, build_batch: int = 5000):
+        self.session_factory = session_factory
+        self.limit = limit
+        self.head_size = limit * 3
+        self.build_batch = build_batch
+        self.ready = False
+        self._buckets: dict[str, list[str]] = {}
+        self._products: dict[int, tuple[str, list[str]]] = {}
+        self._heads: dict[str, list[int]] = {}
+        self._max_id = 0
+        self._pending: set[int] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.build, name="suggest-build", daemon=True)
+        self._thread.start()
+
+    def build(self) -> None:
+        db = self.session_factory()
+        try:
+            self.load(ProductRepository(db).iter_suggest_source(self.build_batch))
+        finally:
+            db.close()
+
+    def load(self, rows) -> None:
+        buckets: dict[str, list[str]] = {}
+        products: dict[int, tuple[str, list[str]]] = {}
+        for row in rows:
+            keys = [f"{key}{SEPARATOR}{row.id}" for key in title_keys(row.title)]
+            products[row.id] = (row.title, keys)
+            for key in keys:
+                buckets.setdefault(key[0], []).append(key)
+        for bucket in buckets.values():
+            bucket.sort()
+        with self._lock:
+            self._buckets, self._products, self._heads = buckets, products, {}
+            self._max_id = max(products, default=0)
+            self.ready = True
+            pending, self._pending = self._pending, set()
+        # Changes seen while the snapshot was loading are replayed on top of it.
+        self.refresh(pending)
+
+    def upsert(self, product_id: int, title: str) -> None:
+        with self._lock:
+            self._remove(product_id)
+            keys = [f"{key}{SEPARATOR}{product_id}" for key in title_keys(title)]
+            self._products[product_id] = (title, keys)
+            self._max_id = max(self._max_id, product_id)
+            for key in keys:
+                insort(self._buckets.setdefault(key[0], []), key)
+                for prefix in self._cached_prefixes(key):
+                    head = self._heads[prefix]
+                    # Heads hold the newest ids of their range, so only a newer id joins.
+                    if product_id > head[0] and product_id not in head:
+                        insort(head, product_id)
+                        if len(head) > self.head_size:
+                            del head[0]
+
+    def remove(self, product_id: int) -> None:
+        with self._lock:
+            self._remove(product_id)
+
+    def _remove(self, product_id: int) -> None:
+        entry = self._products.pop(product_id, None)
+        if entry is None:
+            return
+        for key in entry[1]:
+            bucket = self._buckets[key[0]]
+            position = bisect_left(bucket, key)
+            if position < len(bucket) and bucket[position] == key:
+                del bucket[position]
+            for prefix in self._cached_prefixes(key):
+                head = self._heads[prefix]
+                if product_id in head:
+                    head.remove(product_id)
+                    if len(head) < self.limit:
+                        # Recomputed on the next lookup of this prefix.
+                        del self._heads[prefix]
+
+    def _cached_prefixes(self, key: str) -> list[str]:
+        if not self._heads:
+            return []
+        return [key[:length] for length in range(1, key.index(SEPARATOR) + 1) if key[:length] in self._heads]
+
+    def _newest(self, prefix: str) -> list[int]:
+        bucket = self._buckets.get(prefix[0])
+        if not bucket:
+            return []
+        start = bisect_left(bucket, prefix)
+        end = bisect_left(bucket, prefix + UPPER, start)
+        if end - start <= HEAD_THRESHOLD:
+            return sorted({int(key.rsplit(SEPARATOR, 1)[1]) for key in bucket[start:end]}, reverse=True)
+        head = self._heads.get(prefix)
+        if head is None:
+            if end - start <= SCAN_THRESHOLD:
+                ids = {int(key.rsplit(SEPARATOR, 1)[1]) for key in bucket[start:end]}
+                head = sorted(ids)[-self.head_size :]
+            else:
+                # A broad prefix matches most recent products, so walking back from
+                # the newest id finds a head sooner than scanning its range.
+                head = []
+                product_id = self._max_id
+                while product_id > 0 and len(head) < self.head_size:
+                    entry = self._products.get(product_id)
+                    if entry and any(key.startswith(prefix) for key in entry[1]):
+                        head.append(product_id)
+                    product_id -= 1
+                head.reverse()
+            self._heads[prefix] = head
+        return head[::-1]
+
+    def suggest(self, text: str, limit: int) -> list[Suggestion]:
+        keys = query_keys(text)
+        if not keys:
+            return []
+        with self._lock:
+            candidates: set[int] = set()
+            for key in keys:
+                candidates.update(self._newest(key))
+            suggestions = []
+            seen_titles = set()
+            for product_id in sorted(candidates, reverse=True):
+                title = self._products[product_id][0]
+                folded = fold(title)
+                if folded in seen_titles:
+                    continue
+                seen_titles.add(folded)
+                suggestions.append(Suggestion(product_id, title))
+                if len(suggestions) >= limit:
+                    break
+            return suggestions
+
+    def on_events(self, events) -> None:
+        product_ids = {event.product_id for event in events}
+        with self._lock:
+            if not self.ready:
+                self._pending |= product_ids
+                return
+        self.refresh(product_ids)
+
+    def refresh(self, product_ids) -> None:
+        if not product_ids:
+            return
+        db = self.session_factory()
+        try:
+            rows = ProductRepository(db).list_suggest_source(sorted(product_ids))
+        finally:
+            db.close()
+        listed = set()
+        for row in rows:
+            if row.status != ProductStatus.SOLD and not row.is_blinded:
+                self.upsert(row.id, row.title)
+                listed.add(row.id)
+        for product_id in product_ids:
+            if product_id not in listed:
+                self.remove(product_id)
+
+
+suggest_index = SuggestIndex(SessionLocal, limit=settings.suggest_max_results)
+outbox_poller.register(suggest_index.on_events)
+
+
+class SuggestService:
+    def suggest(self, text: str, limit: int) -> list[Suggestion]:
+        return suggest_index.suggest(text, limit)
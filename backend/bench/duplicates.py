@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+
+from bench.harness import EndpointResult, _configure_environment
+from bench.saved_searches import BASE_WORDS, build_vocabulary
+
+EDITS = ("!!", " 급처", " 네고가능", " ♥", " (재업)")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Duplicate-listing detector: MinHash signature cost and LSH candidate "
+        "lookup against a large catalogue, compared with a linear signature scan."
+    )
+    parser.add_argument("--products", type=int, default=1_000_000)
+    # One seller puts every listing in the same scope, the worst case for a check.
+    parser.add_argument("--sellers", type=int, default=1)
+    parser.add_argument("--vocabulary", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--scan-queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    _configure_environment("sqlite:///./bench_secondhand.db")
+
+    import numpy as np
+
+    from app.core.config import settings
+    from app.core.minhash import BANDS, PERMUTATIONS, band_keys, signature, similarity
+
+    rng = random.Random(args.seed)
+    vocabulary, cumulative = build_vocabulary(args.vocabulary, rng)
+    threshold = settings.duplicate_listing_threshold
+
+    def text() -> str:
+        title = rng.choices(vocabulary, cum_weights=cumulative, k=3) + rng.sample(BASE_WORDS, 1)
+        description = rng.choices(vocabulary, cum_weights=cumulative, k=10) + rng.sample(BASE_WORDS, 3)
+        return f"{' '.join(title)}\n{' '.join(description)}"
+
+    def repost(original: str) -> str:
+        words = original.split(" ")
+        words.pop(rng.randrange(1, len(words)))
+        return " ".join(words) + rng.choice(EDITS)
+
+    texts = []
+    signatures = np.empty((args.products, PERMUTATIONS), dtype=np.uint32)
+    signature_seconds = 0.0
+    for row in range(args.products):
+        # One listing in a hundred is a repost of an earlier one.
+        body = repost(rng.choice(texts)) if texts and rng.random() < 0.01 else text()
+        texts.append(body)
+        tick = time.perf_counter()
+        signatures[row] = signature(body)
+        signature_seconds += time.perf_counter() - tick
+    sellers = np.array([rng.randrange(args.sellers) for _ in range(args.products)], dtype=np.int64)
+
+    def seller_mix(values: np.ndarray) -> np.ndarray:
+        return (values.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)).view(np.int64)
+
+    # The sorted (seller, bucket) keys stand in for ix_signature_bands_seller_bucket.
+    started = time.perf_counter()
+    scoped = band_keys(signatures) ^ seller_mix(sellers)[:, None]
+    order = np.argsort(scoped, axis=None, kind="stable")
+    index_keys = scoped.ravel()[order]
+    index_rows = (order // BANDS).astype(np.int32)
+    del scoped, order
+    build_seconds = time.perf_counter() - started
+
+    def lsh_check(minhash: np.ndarray, seller: int) -> tuple[float, int]:
+        keys = band_keys(minhash) ^ seller_mix(np.array([seller]))
+        lo = np.searchsorted(index_keys, keys, side="left")
+        hi = np.searchsorted(index_keys, keys, side="right")
+        rows = np.unique(np.concatenate([index_rows[start:end] for start, end in zip(lo, hi)]))
+        rows = rows[sellers[rows] == seller]
+        if not len(rows):
+            return 0.0, 0
+        return float(similarity(minhash, signatures[rows]).max()), len(rows)
+
+    def scan_check(minhash: np.ndarray, seller: int) -> float:
+        return float(similarity(minhash, signatures[sellers == seller]).max())
+
+    probes = []
+    for _ in range(args.queries):
+        row = rng.randrange(args.products)
+        probes.append((signature(repost(texts[row])), int(sellers[row])))
+
+    latencies = []
+    found = []
+    candidates = 0
+    for minhash, seller in probes:
+        tick = time.perf_counter()
+        best, count = lsh_check(minhash, seller)
+        latencies.append((time.perf_counter() - tick) * 1000)
+        found.append(best >= threshold)
+        candidates += count
+    lsh = EndpointResult("lsh", len(latencies), 0, 0, latencies)
+
+    scan_latencies = []
+    expected = 0
+    matched = 0
+    for (minhash, seller), hit in zip(probes[: args.scan_queries], found):
+        tick = time.perf_counter()
+        truth = scan_check(minhash, seller) >= threshold
+        scan_latencies.append((time.perf_counter() - tick) * 1000)
+        expected += truth
+        matched += truth and hit
+    scan = EndpointResult("scan", len(scan_latencies), 0, 0, scan_latencies)
+
+    index_mb = (index_keys.nbytes + index_rows.nbytes) / 1024 / 1024
+    print(f"products            {args.products:>12,} ({args.sellers:,} sellers)")
+    per_listing_us = signature_seconds / args.products * 1e6
+    print(f"signatures          {signature_seconds:>12.2f} s ({per_listing_us:.1f} us/listing)")
+    print(f"band index build    {build_seconds:>12.2f} s ({index_mb:.1f} MiB)")
+    print(f"signature memory    {signatures.nbytes / 1024 / 1024:>12.1f} MiB")
+    print(f"lsh check p50/p95   {lsh.percentile(50):>8.3f} / {lsh.percentile(95):.3f} ms")
+    print(f"scan check p50/p95  {scan.percentile(50):>8.3f} / {scan.percentile(95):.3f} ms")
+    print(f"candidates/check    {candidates / len(probes):>12.1f}")
+    print(f"flagged reposts     {sum(found) / len(found):>12.1%}")
+    recall = matched / max(expected, 1)
+    print(f"recall vs scan      {recall:>12.1%} ({expected} of {args.scan_queries} above threshold)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
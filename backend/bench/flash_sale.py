@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench.harness import DEFAULT_DATABASE_URL, EndpointResult, _configure_environment
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Flash-sale contention: many buyers racing for a few listings, "
+        "with and without reservations. The target database is dropped and recreated."
+    )
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--buyers", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    _configure_environment(args.database_url)
+
+    from sqlalchemy import event, insert
+
+    from app.core.database import Base, SessionLocal, engine
+    from app.models import Product, ProductCategory, ProductCondition, User
+    from app.services.errors import ServiceError
+    from app.services.purchase_service import PurchaseService
+    from app.services.reservation_service import ReservationService
+
+    local = threading.local()
+
+    def count_statement(*_):
+        local.statements = getattr(local, "statements", 0) + 1
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+
+    def prepare() -> tuple[list[int], list[int]]:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        db = SessionLocal()
+        try:
+            user_ids = list(
+                db.scalars(
+                    insert(User).returning(User.id),
+                    [
+                        {
+                            "email": f"flash{index}@example.com",
+                            "nickname": f"flash{index}",
+                            "password_hash": "x",
+                        }
+                        for index in range(args.buyers + 1)
+                    ],
+                )
+            )
+            product_ids = list(
+                db.scalars(
+                    insert(Product).returning(Product.id),
+                    [
+                        {
+                            "seller_id": user_ids[0],
+                            "title": f"Limited drop {index}",
+                            "price": 99000,
+                            "description": "Flash sale item",
+                            "category": ProductCategory.CLOTHES,
+                            "condition": ProductCondition.NEW,
+                        }
+                        for index in range(args.items)
+                    ],
+                )
+            )
+            db.commit()
+            return user_ids[1:], product_ids
+        finally:
+            db.close()
+
+    def attempt(mode: str, buyer_id: int, product_id: int) -> tuple[bool, float, int]:
+        local.statements = 0
+        started = time.perf_counter()
+        db = SessionLocal()
+        won = False
+        try:
+            if mode == "reserve":
+                ReservationService(db).reserve(buyer_id, product_id)
+            PurchaseService(db).buy_now(buyer_id, product_id)
+            won = True
+        except ServiceError:
+            db.rollback()
+        finally:
+            db.close()
+        return won, (time.perf_counter() - started) * 1000, local.statements
+
+    print(
+        f"{'mode':<10}{'attempts':>10}{'wins':>7}{'wall_s':>9}{'stmts':>8}"
+        f"{'stmts/loss':>12}{'loss p50':>10}{'loss p95':>10}{'win p95':>10}"
+    )
+    for mode in ("direct", "reserve"):
+        buyer_ids, product_ids = prepare()
+        rng = random.Random(args.seed)
+        targets = [(buyer_id, rng.choice(product_ids)) for buyer_id in buyer_ids]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            outcomes = list(pool.map(lambda target: attempt(mode, *target), targets))
+        wall = time.perf_counter() - started
+
+        wins = [outcome for outcome in outcomes if outcome[0]]
+        losses = [outcome for outcome in outcomes if not outcome[0]]
+        loss_latency = EndpointResult("loss", len(losses), 0, wall, [o[1] for o in losses])
+        win_latency = EndpointResult("win", len(wins), 0, wall, [o[1] for o in wins])
+        statements = sum(outcome[2] for outcome in outcomes)
+        loss_statements = sum(outcome[2] for outcome in losses) / max(1, len(losses))
+        print(
+            f"{mode:<10}{len(outcomes):>10}{len(wins):>7}{wall:>9.2f}{statements:>8}"
+            f"{loss_statements:>12.1f}{loss_latency.percentile(50):>10.2f}"
+            f"{loss_latency.percentile(95):>10.2f}{win_latency.percentile(95):>10.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bench.harness import EndpointResult, _configure_environment
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Radius search over geotagged products: geohash-range list queries "
+        "compared with a distance filter that scans the table. The target database is reset."
+    )
+    parser.add_argument("--database-url", default="sqlite:///./bench_geo.db")
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--scan-queries", type=int, default=10)
+    parser.add_argument("--radius-km", type=float, nargs="+", default=[1.0, 3.0, 10.0])
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    _configure_environment(args.database_url)
+
+    from sqlalchemy import func, insert, select, text
+
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.geohash import KM_PER_DEGREE, cover_circle, encode, prefix_upper_bound
+    from app.models import Product, ProductCategory, ProductCondition, ProductStatus, User
+    from app.repositories.product_repository import ProductRepository, _merge_cells
+    from bench.seed import CITY_CENTERS, pickup_location
+
+    rng = random.Random(args.seed)
+    cumulative = []
+    running = 0.0
+    for *_, share in CITY_CENTERS:
+        running += share
+        cumulative.append(running)
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    seller = User(email="geo-bench@example.com", nickname="geo-bench", password_hash="x")
+    db.add(seller)
+    db.commit()
+
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    categories = list(ProductCategory)
+    for start in range(0, args.products, 20_000):
+        rows = []
+        for offset in range(start, min(start + 20_000, args.products)):
+            latitude, longitude = pickup_location(rng, cumulative)
+            created_at = now - timedelta(minutes=offset)
+            rows.append(
+                {
+                    "seller_id": seller.id,
+                    "title": f"Listing {offset}",
+                    "price": 1000,
+                    "description": "desc",
+                    "category": categories[offset % len(categories)],
+                    "condition": ProductCondition.USED,
+                    "status": ProductStatus.ON_SALE,
+                    "is_blinded": False,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "geohash": encode(latitude, longitude),
+                }
+            )
+        db.execute(insert(Product), rows)
+        db.commit()
+    # Production databases keep planner statistics; give SQLite the same.
+    db.execute(text("ANALYZE"))
+    db.commit()
+    load_seconds = time.perf_counter() - started
+
+    repo = ProductRepository(db)
+    probes = [(*pickup_location(rng, cumulative), rng.choice(args.radius_km)) for _ in range(args.queries)]
+
+    latencies: dict[float, list[float]] = {radius: [] for radius in args.radius_km}
+    matched = candidates = 0
+    for latitude, longitude, radius in probes:
+        tick = time.perf_counter()
+        total, _ = repo.list(
+            page=1,
+            page_size=20,
+            keyword=None,
+            category=None,
+            sort="distance",
+            include_blinded=False,
+            near=(latitude, longitude, radius),
+        )
+        latencies[radius].append((time.perf_counter() - tick) * 1000)
+        _, boundary = cover_circle(latitude, longitude, radius)
+        ranges = " OR ".join(
+            f"(geohash >= '{low}'" + (f" AND geohash < '{high}')" if high is not None else ")")
+            for low, high in _merge_cells(boundary)
+        )
+        candidates += db.scalar(text(f"SELECT count(*) FROM products WHERE {ranges}")) or 0
+        matched += total
+
+    scan_latencies = []
+    for latitude, longitude, radius in probes[: args.scan_queries]:
+        distance = repo._haversine(latitude, longitude)
+        limit = math.sin(math.radians(radius / KM_PER_DEGREE) / 2) ** 2
+        tick = time.perf_counter()
+        db.scalars(
+            select(Product.id).where(Product.is_blinded.is_(False), distance <= limit).order_by(distance).limit(20)
+        ).all()
+        scan_latencies.append((time.perf_counter() - tick) * 1000)
+    scan = EndpointResult("scan", len(scan_latencies), 0, 0, scan_latencies)
+
+    latitude, longitude, radius = probes[0]
+    nearby = repo._nearby(latitude, longitude, radius, [Product.is_blinded.is_(False)], False, with_distance=True)
+    nearby = nearby.subquery()
+    stmt = select(nearby.c.id).order_by(nearby.c.distance).limit(20)
+    plan = db.execute(
+        text(f"EXPLAIN QUERY PLAN {stmt.compile(engine, compile_kwargs={'literal_binds': True})}")
+        if engine.dialect.name == "sqlite"
+        else text(f"EXPLAIN {stmt.compile(engine, compile_kwargs={'literal_binds': True})}")
+    ).all()
+    db.close()
+
+    print(f"geotagged products  {args.products:>12,} (loaded in {load_seconds:.1f} s)")
+    for radius, values in latencies.items():
+        if values:
+            result = EndpointResult(f"{radius:g} km", len(values), 0, 0, values)
+            p50, p95 = result.percentile(50), result.percentile(95)
+            print(f"radius {radius:>5g} km     p50 {p50:>8.2f} ms  p95 {p95:>8.2f} ms")
+    print(f"full scan           p50 {scan.percentile(50):>8.2f} ms  p95 {scan.percentile(95):>8.2f} ms")
+    print(f"boundary rows       {candidates / len(probes):>12.1f} per query")
+    print(f"within radius       {matched / len(probes):>12.1f} per query")
+    print("plan")
+    # One line per UNION ALL branch otherwise; repeated steps are folded.
+    steps: dict[str, int] = {}
+    for row in plan:
+        steps[row[-1]] = steps.get(row[-1], 0) + 1
+    for step, count in steps.items():
+        print(f"  {step}" + (f"  (x{count})" if count > 1 else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,816 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_DATABASE_URL = "sqlite:///./bench_secondhand.db"
+
+
+@dataclass
+class RequestSpec:
+    path: str
+    json: dict[str, Any] | None = None
+    token: str | None = None
+
+
+@dataclass
+class Endpoint:
+    name: str
+    method: str
+    build: Callable[["BenchContext", int], RequestSpec]
+
+
+@dataclass
+class BenchContext:
+    admin_token: str
+    buyer_tokens: list[str]
+    buyer_refresh_tokens: list[str]
+    seller_tokens: list[str]
+    hot_seller_token: str
+    login_emails: list[str]
+    product_ids: list[int]
+    on_sale_ids: list[int]
+    seller_ids: list[int]
+    pools: dict[str, list[Any]] = field(default_factory=dict)
+
+    def take(self, pool: str, index: int) -> Any:
+        items = self.pools[pool]
+        return items[index % len(items)]
+
+
+@dataclass
+class EndpointResult:
+    name: str
+    requests: int
+    errors: int
+    elapsed_s: float
+    latencies_ms: list[float]
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+        return ordered[rank]
+
+    def summary(self) -> dict[str, float | int]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "throughput_rps": round(self.requests / self.elapsed_s, 2) if self.elapsed_s else 0.0,
+        }
+
+
+def _configure_environment(database_url: str) -> None:
+    # app.core.config reads settings at import time, so this must run before any app import.
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("JWT_SECRET_KEY", "bench-secret-key")
+    os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+    # Handler latency is what is measured; with admission on, bcrypt-bound auth calls past the
+    # auth limit would be shed as 503s. Set ADMISSION_ENABLED=true to bench with shedding.
+    os.environ.setdefault("ADMISSION_ENABLED", "false")
+
+
+def build_endpoints() -> list[Endpoint]:
+    return [
+        Endpoint(
+            "POST /auth/signup",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                "/auth/signup",
+                json={
+                    "email": f"bench-signup-{i}@example.com",
+                    "nickname": f"bench-signup-{i}",
+                    "password": "Password123!",
+                },
+            ),
+        ),
+        Endpoint(
+            "POST /auth/login",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                "/auth/login",
+                json={
+                    "email": ctx.login_emails[i % len(ctx.login_emails)],
+                    "password": "Password123!",
+                },
+            ),
+        ),
+        Endpoint(
+            "POST /auth/refresh",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                "/auth/refresh",
+                json={
+                    "refresh_token": ctx.buyer_refresh_tokens[i % len(ctx.buyer_refresh_tokens)]
+                },
+            ),
+        ),
+        Endpoint(
+            "GET /auth/me",
+            "GET",
+            lambda ctx, i: RequestSpec(
+                "/auth/me", token=ctx.buyer_tokens[i % len(ctx.buyer_tokens)]
+            ),
+        ),
+        Endpoint(
+            "GET /products",
+            "GET",
+            lambda ctx, i: RequestSpec(f"/products?page={i % 20 + 1}&page_size=20"),
+        ),
+        Endpoint(
+            "GET /products?keyword",
+            "GET",
+            lambda ctx, i: RequestSpec(
+                f"/products?keyword={('iPad', 'Desk', 'Nike', '소설', 'Lego')[i % 5]}&page_size=20"
+            ),
+        ),
+        Endpoint(
+            "GET /products?category&sort",
+            "GET",
+            lambda ctx, i: RequestSpec(
+                f"/products?category={('electronics', 'clothes', 'home', 'books', 'etc')[i % 5]}"
+                f"&sort={('latest', 'price_asc', 'price_desc')[i % 3]}&page_size=20"
+            ),
+        ),
+        Endpoint(
+            "GET /products?status&price",
+            "GET",
+            lambda ctx, i: RequestSpec(
+                f"/products?status=on_sale&min_price={(i % 10) * 10000}"
+                f"&max_price={(i % 10) * 10000 + 50000}&sort=price_asc&page_size=20"
+            ),
+        ),
+        Endpoint(
+            "GET /products?sort=popular",
+            "GET",
+            lambda ctx, i: RequestSpec(f"/products?status=on_sale&sort=popular&page={i % 5 + 1}&page_size=20"),
+        ),
+        Endpoint(
+            "GET /products?lat&lng&radius_km",
+            "GET",
+            lambda ctx, i: RequestSpec(
+                f"/products?lat=37.5665&lng=126.978&radius_km={(1, 3, 10)[i % 3]}&sort=distance&page_size=20"
+            ),
+        ),
+        Endpoint(
+            "GET /sellers/{seller_id}/products",
+            "GET",
+            lambda ctx, i: RequestSpec(
+                f"/sellers/{ctx.seller_ids[i % len(ctx.seller_ids)]}/products?status=on_sale&limit=20"
+            ),
+        ),
+        Endpoint(
+            "GET /products/{product_id}",
+            "GET",
+            lambda ctx, i: RequestSpec(f"/products/{ctx.on_sale_ids[(i * 7919) % len(ctx.on_sale_ids)]}"),
+        ),
+        Endpoint(
+            "GET /products/{product_id}/similar",
+            "GET",
+            lambda ctx, i: RequestSpec(
+                f"/products/{ctx.on_sale_ids[(i * 7919) % len(ctx.on_sale_ids)]}/similar?limit=10"
+            ),
+        ),
+        Endpoint(
+            "GET /products/suggest",
+            "GET",
+            lambda ctx, i: RequestSpec(
+                f"/products/suggest?q={('ip', 'Gal', 'Nik', '노트', 'Le', 'sa')[i % 6]}"
+            ),
+        ),
+        # GET /products/stream is a long-lived SSE response, so it has no per-request latency.
+        Endpoint(
+            "POST /products",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                "/products",
+                json={
+                    "title": f"Bench listing {i}",
+                    "price": 10000 + i,
+                    "description": "Created by the benchmark harness. " * 8,
+                    "category": "electronics",
+                    "condition": "used",
+                    "image_urls": ["https://images.example.com/bench.jpg"],
+                },
+                token=ctx.seller_tokens[i % len(ctx.seller_tokens)],
+            ),
+        ),
+        Endpoint(
+            "PATCH /products/{product_id}",
+            "PATCH",
+            lambda ctx, i: RequestSpec(
+                f"/products/{ctx.take('update', i)}",
+                json={"price": 20000 + i},
+                token=ctx.pools["pool_seller_token"][0],
+            ),
+        ),
+        Endpoint(
+            "DELETE /products/{product_id}",
+            "DELETE",
+            lambda ctx, i: RequestSpec(
+                f"/products/{ctx.take('delete', i)}", token=ctx.pools["pool_seller_token"][0]
+            ),
+        ),
+        Endpoint(
+            "POST /products/{product_id}/reservation",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                f"/products/{ctx.take('reserve', i)}/reservation",
+                token=ctx.buyer_tokens[i % len(ctx.buyer_tokens)],
+            ),
+        ),
+        Endpoint(
+            "DELETE /products/{product_id}/reservation",
+            "DELETE",
+            lambda ctx, i: RequestSpec(
+                f"/products/{ctx.take('release', i)[0]}/reservation", token=ctx.take("release", i)[1]
+            ),
+        ),
+        # Runs after the write endpoints so the change feed has events to page through.
+        Endpoint(
+            "GET /products/changes",
+            "GET",
+            lambda ctx, i: RequestSpec(f"/products/changes?since=0&limit={(50, 100, 500)[i % 3]}"),
+        ),
+        Endpoint(
+            "POST /products/{product_id}/reports",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                f"/products/{ctx.take('report', i)}/reports",
+                json={"reason": "bench"},
+                token=ctx.buyer_tokens[i % len(ctx.buyer_tokens)],
+            ),
+        ),
+        Endpoint(
+            "POST /cart",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                "/cart",
+                json={"product_id": ctx.take("cart_add", i), "quantity": 1},
+                token=ctx.buyer_tokens[i % len(ctx.buyer_tokens)],
+            ),
+        ),
+        Endpoint(
+            "GET /cart",
+            "GET",
+            lambda ctx, i: RequestSpec("/cart", token=ctx.buyer_tokens[i % len(ctx.buyer_tokens)]),
+        ),
+        Endpoint(
+            "PATCH /cart/{item_id}",
+            "PATCH",
+            lambda ctx, i: RequestSpec(
+                f"/cart/{ctx.take('cart_items', i)[0]}",
+                json={"selected": bool(i % 2)},
+                token=ctx.take("cart_items", i)[1],
+            ),
+        ),
+        Endpoint(
+            "DELETE /cart/{item_id}",
+            "DELETE",
+            lambda ctx, i: RequestSpec(
+                f"/cart/{ctx.take('cart_items', i)[0]}", token=ctx.take("cart_items", i)[1]
+            ),
+        ),
+        Endpoint(
+            "PUT /likes/{product_id}",
+            "PUT",
+            lambda ctx, i: RequestSpec(
+                f"/likes/{ctx.on_sale_ids[i % len(ctx.on_sale_ids)]}",
+                token=ctx.buyer_tokens[i % len(ctx.buyer_tokens)],
+            ),
+        ),
+        Endpoint(
+            "GET /likes",
+            "GET",
+            lambda ctx, i: RequestSpec("/likes", token=ctx.buyer_tokens[i % len(ctx.buyer_tokens)]),
+        ),
+        Endpoint(
+            "DELETE /likes/{product_id}",
+            "DELETE",
+            lambda ctx, i: RequestSpec(
+                f"/likes/{ctx.take('unlike', i)[0]}", token=ctx.take("unlike", i)[1]
+            ),
+        ),
+        Endpoint(
+            "POST /purchases/buy-now/{product_id}",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                f"/purchases/buy-now/{ctx.take('buy_now', i)}",
+                token=ctx.buyer_tokens[i % len(ctx.buyer_tokens)],
+            ),
+        ),
+        Endpoint(
+            "POST /purchases/checkout-selected",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                "/purchases/checkout-selected", token=ctx.take("checkout_tokens", i)
+            ),
+        ),
+        Endpoint(
+            "GET /purchases/me",
+            "GET",
+            lambda ctx, i: RequestSpec(
+                "/purchases/me", token=ctx.buyer_tokens[i % len(ctx.buyer_tokens)]
+            ),
+        ),
+        Endpoint(
+            "GET /purchases/sales/me",
+            "GET",
+            lambda ctx, i: RequestSpec("/purchases/sales/me", token=ctx.hot_seller_token),
+        ),
+        Endpoint(
+            "POST /saved-searches",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                "/saved-searches",
+                json={
+                    "keyword": ("iPad", "Desk", "Nike", "소설", "Lego")[i % 5],
+                    "min_price": (i % 10) * 10000,
+                },
+                token=ctx.buyer_tokens[i % len(ctx.buyer_tokens)],
+            ),
+        ),
+        Endpoint(
+            "GET /saved-searches",
+            "GET",
+            lambda ctx, i: RequestSpec(
+                "/saved-searches", token=ctx.buyer_tokens[i % len(ctx.buyer_tokens)]
+            ),
+        ),
+        Endpoint(
+            "DELETE /saved-searches/{saved_search_id}",
+            "DELETE",
+            lambda ctx, i: RequestSpec(
+                f"/saved-searches/{ctx.take('saved_searches', i)[0]}",
+                token=ctx.take("saved_searches", i)[1],
+            ),
+        ),
+        Endpoint(
+            "GET /notifications",
+            "GET",
+            lambda ctx, i: RequestSpec(
+                "/notifications?limit=20", token=ctx.buyer_tokens[i % len(ctx.buyer_tokens)]
+            ),
+        ),
+        Endpoint(
+            "POST /notifications/read",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                "/notifications/read",
+                json={"up_to_id": ctx.take("notifications", i)[0]},
+                token=ctx.take("notifications", i)[1],
+            ),
+        ),
+        Endpoint(
+            "GET /admin/products",
+            "GET",
+            lambda ctx, i: RequestSpec("/admin/products", token=ctx.admin_token),
+        ),
+        Endpoint(
+            "GET /admin/products?suspicious",
+            "GET",
+            lambda ctx, i: RequestSpec("/admin/products?suspicious=true", token=ctx.admin_token),
+        ),
+        Endpoint(
+            "POST /admin/products/{product_id}/blind",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                f"/admin/products/{ctx.take('moderation', i)}/blind",
+                json={"reason": "bench"},
+                token=ctx.admin_token,
+            ),
+        ),
+        Endpoint(
+            "POST /admin/products/{product_id}/unblind",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                f"/admin/products/{ctx.take('moderation', i)}/unblind", token=ctx.admin_token
+            ),
+        ),
+        Endpoint(
+            "POST /admin/products/bulk-blind",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                "/admin/products/bulk-blind",
+                json={"product_ids": ctx.take("bulk", i), "reason": "bench"},
+                token=ctx.admin_token,
+            ),
+        ),
+        Endpoint(
+            "POST /admin/products/bulk-unblind",
+            "POST",
+            lambda ctx, i: RequestSpec(
+                "/admin/products/bulk-unblind",
+                json={"product_ids": ctx.take("bulk", i)},
+                token=ctx.admin_token,
+            ),
+        ),
+        Endpoint(
+            "GET /admin/moderation-jobs/{job_id}",
+            "GET",
+            lambda ctx, i: RequestSpec(
+                f"/admin/moderation-jobs/{ctx.take('moderation_jobs', i)}", token=ctx.admin_token
+            ),
+        ),
+        Endpoint(
+            "GET /admin/reports",
+            "GET",
+            lambda ctx, i: RequestSpec("/admin/reports?limit=20", token=ctx.admin_token),
+        ),
+        Endpoint(
+            "DELETE /admin/reports/{product_id}",
+            "DELETE",
+            lambda ctx, i: RequestSpec(f"/admin/reports/{ctx.take('dismiss', i)}", token=ctx.admin_token),
+        ),
+        Endpoint(
+            "GET /admin/duplicates",
+            "GET",
+            lambda ctx, i: RequestSpec("/admin/duplicates?limit=20", token=ctx.admin_token),
+        ),
+        Endpoint(
+            "GET /admin/db/slow-queries",
+            "GET",
+            lambda ctx, i: RequestSpec("/admin/db/slow-queries", token=ctx.admin_token),
+        ),
+    ]
+
+
+def _prepare_context(config, requests_per_endpoint: int) -> BenchContext:
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import insert, select, update
+
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.security import create_access_token, create_refresh_token
+    from app.models import (
+        CartItem,
+        ModerationAction,
+        ModerationJob,
+        ModerationJobStatus,
+        Notification,
+        Product,
+        ProductCategory,
+        ProductCondition,
+        ProductLike,
+        ProductReport,
+        ProductReportStats,
+        ProductStatus,
+        SavedSearch,
+        User,
+    )
+    from app.services.recommendation_service import similar_items
+    from app.services.suggest_service import suggest_index
+    from bench.seed import generate
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        seeded = generate(db, config)
+        users = {
+            user.id: user
+            for user in db.scalars(select(User).where(User.id.in_(seeded.user_ids)))
+        }
+        pool_seller_id = seeded.seller_ids[-1]
+
+        def pool_products(count: int) -> list[int]:
+            rows = [
+                {
+                    "seller_id": pool_seller_id,
+                    "title": f"Pool item {index}",
+                    "price": 15000,
+                    "description": "Benchmark pool listing.",
+                    "category": ProductCategory.ETC,
+                    "condition": ProductCondition.USED,
+                }
+                for index in range(count)
+            ]
+            return list(db.scalars(insert(Product).returning(Product.id), rows))
+
+        buyers = [buyer_id for buyer_id in seeded.buyer_ids if buyer_id != pool_seller_id]
+        checkout_buyers = list(
+            db.scalars(
+                insert(User).returning(User.id),
+                [
+                    {
+                        "email": f"bench-checkout-{index}@example.com",
+                        "nickname": f"bench-checkout-{index}",
+                        "password_hash": users[buyers[0]].password_hash,
+                    }
+                    for index in range(requests_per_endpoint)
+                ],
+            )
+        )
+        checkout_products = pool_products(requests_per_endpoint * 2)
+        db.execute(
+            insert(CartItem),
+            [
+                {
+                    "user_id": checkout_buyers[index // 2],
+                    "product_id": product_id,
+                    "quantity": 1,
+                    "selected": True,
+                }
+                for index, product_id in enumerate(checkout_products)
+            ],
+        )
+        checkout_tokens = [create_access_token(str(buyer_id)) for buyer_id in checkout_buyers]
+
+        item_products = pool_products(requests_per_endpoint)
+        cart_items = []
+        for index, product_id in enumerate(item_products):
+            buyer_id = buyers[index % len(buyers)]
+            item_id = db.scalar(
+                insert(CartItem)
+                .values(user_id=buyer_id, product_id=product_id, quantity=1, selected=False)
+                .returning(CartItem.id)
+            )
+            cart_items.append((item_id, create_access_token(str(buyer_id))))
+
+        def buyer_rows(count: int) -> list[tuple[int, str]]:
+            return [
+                (buyers[index % len(buyers)], create_access_token(str(buyers[index % len(buyers)])))
+                for index in range(count)
+            ]
+
+        release_products = pool_products(requests_per_endpoint)
+        release_holders = buyer_rows(requests_per_endpoint)
+        for product_id, (buyer_id, _) in zip(release_products, release_holders):
+            db.execute(
+                update(Product)
+                .where(Product.id == product_id)
+                .values(
+                    status=ProductStatus.RESERVED,
+                    reserved_by_id=buyer_id,
+                    reserved_until=datetime.utcnow() + timedelta(days=1),
+                )
+            )
+
+        # Likes to remove sit on the tail of on_sale_ids so PUT /likes does not touch them.
+        unlike_holders = buyer_rows(requests_per_endpoint)
+        unlike_products = [seeded.on_sale_ids[-(index + 1)] for index in range(requests_per_endpoint)]
+        db.execute(
+            insert(ProductLike),
+            [
+                {"user_id": buyer_id, "product_id": product_id}
+                for product_id, (buyer_id, _) in zip(unlike_products, unlike_holders)
+            ],
+        )
+
+        dismiss_products = pool_products(requests_per_endpoint)
+        dismiss_reporters = buyer_rows(requests_per_endpoint)
+        db.execute(
+            insert(ProductReport),
+            [
+                {"product_id": product_id, "reporter_id": buyer_id, "reason": "bench"}
+                for product_id, (buyer_id, _) in zip(dismiss_products, dismiss_reporters)
+            ],
+        )
+        db.execute(
+            insert(ProductReportStats),
+            [{"product_id": product_id, "report_count": 1} for product_id in dismiss_products],
+        )
+
+        search_owners = buyer_rows(requests_per_endpoint)
+        search_ids = list(
+            db.scalars(
+                insert(SavedSearch).returning(SavedSearch.id),
+                [{"user_id": buyer_id, "keyword": "bench"} for buyer_id, _ in search_owners],
+            )
+        )
+
+        # Twenty unread notifications per sampled buyer; POST /notifications/read marks up to the newest.
+        notified = buyer_rows(min(len(buyers), 50))
+        notifications = []
+        for buyer_id, token in notified:
+            notification_ids = list(
+                db.scalars(
+                    insert(Notification).returning(Notification.id),
+                    [
+                        {"user_id": buyer_id, "product_id": product_id}
+                        for product_id in seeded.on_sale_ids[:20]
+                    ],
+                )
+            )
+            notifications.append((max(notification_ids), token))
+
+        job_ids = list(
+            db.scalars(
+                insert(ModerationJob).returning(ModerationJob.id),
+                [
+                    {
+                        "action": ModerationAction.BLIND,
+                        "reason": "bench",
+                        "status": ModerationJobStatus.DONE,
+                        "created_by": seeded.admin_id,
+                    }
+                    for _ in range(min(requests_per_endpoint, 50))
+                ],
+            )
+        )
+        bulk_products = pool_products(requests_per_endpoint * 5)
+
+        pools: dict[str, list[Any]] = {
+            "pool_seller_token": [create_access_token(str(pool_seller_id))],
+            "update": pool_products(min(requests_per_endpoint, 50)),
+            "delete": pool_products(requests_per_endpoint),
+            "cart_add": pool_products(min(requests_per_endpoint, 200)),
+            "buy_now": pool_products(requests_per_endpoint),
+            "reserve": pool_products(requests_per_endpoint),
+            "moderation": pool_products(min(requests_per_endpoint, 50)),
+            "report": pool_products(requests_per_endpoint),
+            "checkout_tokens": checkout_tokens,
+            "cart_items": cart_items,
+            "release": [
+                (product_id, token) for product_id, (_, token) in zip(release_products, release_holders)
+            ],
+            "unlike": [
+                (product_id, token) for product_id, (_, token) in zip(unlike_products, unlike_holders)
+            ],
+            "dismiss": dismiss_products,
+            "saved_searches": [
+                (search_id, token) for search_id, (_, token) in zip(search_ids, search_owners)
+            ],
+            "notifications": notifications,
+            "moderation_jobs": job_ids,
+            "bulk": [bulk_products[index : index + 5] for index in range(0, len(bulk_products), 5)],
+        }
+        db.commit()
+
+        # Startup events do not run under ASGITransport, so the in-memory indexes are built here.
+        similar_items.build()
+        suggest_index.build()
+
+        buyer_sample = buyers[: min(len(buyers), 50)]
+        return BenchContext(
+            admin_token=create_access_token(str(seeded.admin_id)),
+            buyer_tokens=[create_access_token(str(buyer_id)) for buyer_id in buyer_sample],
+            buyer_refresh_tokens=[
+                create_refresh_token(str(buyer_id)) for buyer_id in buyer_sample
+            ],
+            seller_tokens=[
+                create_access_token(str(seller_id)) for seller_id in seeded.seller_ids[:20]
+            ],
+            hot_seller_token=create_access_token(str(seeded.seller_ids[0])),
+            login_emails=[users[buyer_id].email for buyer_id in buyer_sample],
+            product_ids=seeded.product_ids,
+            on_sale_ids=seeded.on_sale_ids,
+            seller_ids=seeded.seller_ids,
+            pools=pools,
+        )
+    finally:
+        db.close()
+
+
+async def _drive(app, endpoint: Endpoint, ctx: BenchContext, requests: int, concurrency: int):
+    import httpx
+
+    latencies: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one(index: int) -> None:
+            nonlocal errors
+            spec = endpoint.build(ctx, index)
+            headers = {"Authorization": f"Bearer {spec.token}"} if spec.token else None
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.request(
+                    endpoint.method, spec.path, json=spec.json, headers=headers
+                )
+                latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(index) for index in range(requests)))
+        elapsed = time.perf_counter() - started
+    return EndpointResult(endpoint.name, requests, errors, elapsed, latencies)
+
+
+def _compare(
+    results: dict[str, dict], baseline: dict[str, dict], tolerance: float, noise_ms: float
+) -> list[str]:
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        limit = previous["p95_ms"] * (1 + tolerance)
+        if current["p95_ms"] > limit and current["p95_ms"] - previous["p95_ms"] > noise_ms:
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.2f}ms > baseline {previous['p95_ms']:.2f}ms"
+            )
+    return regressions
+
+
+def _print_table(results: dict[str, dict], baseline: dict[str, dict]) -> None:
+    header = f"{'endpoint':<44}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>10}{'err':>6}{'Δp95':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, row in results.items():
+        previous = baseline.get(name)
+        delta = ""
+        if previous and previous["p95_ms"]:
+            delta = f"{(row['p95_ms'] / previous['p95_ms'] - 1) * 100:+.0f}%"
+        print(
+            f"{name:<44}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}"
+            f"{row['throughput_rps']:>10.1f}{row['errors']:>6}{delta:>9}"
+        )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Seed a database and benchmark every API router in-process. "
+        "The target database is dropped and recreated."
+    )
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--only", action="append", default=[], help="substring filter on endpoint names")
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 growth ratio")
+    parser.add_argument("--noise-ms", type=float, default=2.0, help="ignore p95 deltas below this")
+    parser.add_argument("--output", type=Path, default=None, help="write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    _configure_environment(args.database_url)
+
+    from app.core.database import engine
+    from app.main import app
+    from bench.seed import SeedConfig
+
+    dialect = engine.dialect.name
+    baseline_path = args.baseline or BASELINE_DIR / f"{dialect}.json"
+    ctx = _prepare_context(
+        SeedConfig(users=args.users, products=args.products, seed=args.seed), args.requests
+    )
+
+    endpoints = [
+        endpoint
+        for endpoint in build_endpoints()
+        if not args.only or any(fragment in endpoint.name for fragment in args.only)
+    ]
+    results: dict[str, dict] = {}
+    for endpoint in endpoints:
+        result = asyncio.run(_drive(app, endpoint, ctx, args.requests, args.concurrency))
+        results[endpoint.name] = result.summary()
+
+    baseline_doc = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    baseline = baseline_doc.get("endpoints", {})
+    _print_table(results, baseline)
+
+    report = {
+        "dialect": dialect,
+        "config": {
+            "users": args.users,
+            "products": args.products,
+            "seed": args.seed,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "endpoints": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+        print(f"baseline saved to {baseline_path}")
+        return 0
+
+    if not baseline:
+        print(f"no baseline at {baseline_path}; rerun with --save-baseline to create one")
+        return 0
+    if baseline_doc.get("config") != report["config"]:
+        print("warning: baseline was recorded with a different configuration")
+    regressions = _compare(results, baseline, args.tolerance, args.noise_ms)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
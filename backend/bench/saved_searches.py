@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import argparse
+import random
+import resource
+import sys
+import time
+
+from bench.harness import EndpointResult, _configure_environment
+
+BASE_WORDS = [
+    "iphone", "ipad", "macbook", "galaxy", "airpods", "switch", "lego", "nike", "adidas",
+    "jacket", "sofa", "desk", "lamp", "chair", "bike", "camera", "lens", "monitor",
+    "keyboard", "novel", "manga", "guitar", "stroller", "tent", "watch", "bag",
+    "아이폰", "맥북", "갤럭시", "자전거", "캠핑", "소설", "책상", "의자", "패딩", "운동화",
+]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Saved-search matcher: inverted-index matching of new listings against "
+        "a large population of saved searches, compared with a linear scan."
+    )
+    parser.add_argument("--searches", type=int, default=1_000_000)
+    parser.add_argument("--vocabulary", type=int, default=200_000)
+    parser.add_argument("--listings", type=int, default=2000)
+    parser.add_argument("--scan-listings", type=int, default=5)
+    parser.add_argument("--broad-share", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def build_vocabulary(size: int, rng: random.Random) -> tuple[list[str], list[float]]:
+    # Model names and set numbers give real saved searches a long tail ("lego75192").
+    words = {f"{rng.choice(BASE_WORDS)}{rng.randrange(10, 10**6)}" for _ in range(size)}
+    vocabulary = sorted(words)
+    rng.shuffle(vocabulary)
+    # Zipf-like popularity with a flattened head.
+    cumulative = []
+    total = 0.0
+    for rank in range(len(vocabulary)):
+        total += 1 / (rank + 50)
+        cumulative.append(total)
+    return vocabulary, cumulative
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    _configure_environment("sqlite:///./bench_secondhand.db")
+
+    from app.models import ProductCategory
+    from app.services.saved_search_service import ListingSnapshot, SavedSearchIndex
+
+    rng = random.Random(args.seed)
+    categories = list(ProductCategory)
+    vocabulary, cumulative = build_vocabulary(args.vocabulary, rng)
+
+    def popular_word() -> str:
+        return rng.choices(vocabulary, cum_weights=cumulative)[0]
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    index = SavedSearchIndex()
+    sample = []
+    for search_id in range(1, args.searches + 1):
+        user_id = rng.randrange(1, args.searches // 3 + 2)
+        if rng.random() < args.broad_share:
+            keyword = None
+            category = rng.choice(categories)
+        else:
+            keyword = popular_word()
+            if rng.random() < 0.2:
+                keyword = f"{rng.choice(('new', 'used', 'mint'))} {keyword}"
+            category = rng.choice(categories) if rng.random() < 0.3 else None
+        min_price = rng.choice((None, None, 10000, 50000))
+        max_price = rng.choice((None, None, 300000, 1000000))
+        index.add(search_id, user_id, keyword, category, min_price, max_price)
+        if search_id <= 100_000:
+            sample.append((keyword.lower() if keyword else None, category, min_price, max_price))
+    build_seconds = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    listings = []
+    for product_id in range(args.listings):
+        title = f"{popular_word()} {popular_word()}"
+        listings.append(
+            ListingSnapshot(
+                product_id,
+                0,
+                title,
+                f"{title} {rng.choice(BASE_WORDS)} 상태 좋아요 직거래 가능",
+                rng.choice(categories),
+                int(rng.lognormvariate(11, 1)),
+            )
+        )
+
+    latencies = []
+    candidates = matches = 0
+    for listing in listings:
+        tick = time.perf_counter()
+        candidates += len(index.candidates(listing))
+        matches += len(index.match(listing))
+        latencies.append((time.perf_counter() - tick) * 1000)
+    indexed = EndpointResult("indexed", len(listings), 0, 0, latencies)
+
+    # A linear scan over a sample of the searches, scaled to the full population.
+    scan_latencies = []
+    scale = args.searches / max(1, len(sample))
+    for listing in listings[: args.scan_listings]:
+        title = listing.title.lower()
+        description = listing.description.lower()
+        tick = time.perf_counter()
+        for keyword, category, min_price, max_price in sample:
+            if category is not None and category != listing.category:
+                continue
+            if min_price is not None and min_price > listing.price:
+                continue
+            if max_price is not None and max_price < listing.price:
+                continue
+            if keyword and keyword not in title and keyword not in description:
+                continue
+        scan_latencies.append((time.perf_counter() - tick) * 1000 * scale)
+    scan = EndpointResult("scan", len(scan_latencies), 0, 0, scan_latencies)
+
+    print(f"saved searches      {len(index):>12,}")
+    print(f"build               {build_seconds:>12.2f} s")
+    print(f"max rss growth      {(rss_after - rss_before) / 1024:>12.1f} MiB")
+    print(f"candidates/listing  {candidates / len(listings):>12.1f}")
+    print(f"matches/listing     {matches / len(listings):>12.1f}")
+    print(f"indexed p50/p95     {indexed.percentile(50):>8.3f} / {indexed.percentile(95):.3f} ms")
+    print(f"linear scan p50     {scan.percentile(50):>8.1f} ms (extrapolated to all searches)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
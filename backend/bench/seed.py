@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.geohash import encode as geohash_encode
+from app.core.security import hash_password
+from app.models import (
+    CartItem,
+    Product,
+    ProductCategory,
+    ProductCondition,
+    ProductImage,
+    ProductStatus,
+    Purchase,
+    User,
+    UserRole,
+)
+
+SEED_PASSWORD = "Password123!"
+
+CATEGORY_WEIGHTS = {
+    ProductCategory.ELECTRONICS: 0.36,
+    ProductCategory.CLOTHES: 0.24,
+    ProductCategory.HOME: 0.18,
+    ProductCategory.BOOKS: 0.14,
+    ProductCategory.ETC: 0.08,
+}
+
+# Median price (KRW) and spread of the log-normal price distribution per category.
+PRICE_PROFILE = {
+    ProductCategory.ELECTRONICS: (250000, 0.9),
+    ProductCategory.CLOTHES: (30000, 0.7),
+    ProductCategory.HOME: (45000, 0.8),
+    ProductCategory.BOOKS: (12000, 0.5),
+    ProductCategory.ETC: (20000, 1.0),
+}
+
+TITLE_WORDS = {
+    ProductCategory.ELECTRONICS: (
+        ["Apple", "Samsung", "LG", "Sony", "Nintendo", "Dell", "삼성", "애플"],
+        ["iPad", "Galaxy Tab", "MacBook", "Monitor", "Headphones", "Switch", "노트북", "태블릿"],
+    ),
+    ProductCategory.CLOTHES: (
+        ["Nike", "Adidas", "Uniqlo", "Zara", "North Face", "무신사"],
+        ["Jacket", "Hoodie", "Sneakers", "Jeans", "Padding", "코트", "니트"],
+    ),
+    ProductCategory.HOME: (
+        ["IKEA", "Hanssem", "Dyson", "Philips", "한샘"],
+        ["Desk", "Chair", "Lamp", "Vacuum", "Shelf", "책상", "의자"],
+    ),
+    ProductCategory.BOOKS: (
+        ["O'Reilly", "Hanbit", "Penguin", "민음사"],
+        ["Python Book", "Novel", "Textbook", "Comic Set", "소설", "전공서적"],
+    ),
+    ProductCategory.ETC: (
+        ["Lego", "Yeti", "Coleman", "Canon"],
+        ["Camping Set", "Figure", "Tumbler", "Camera Strap", "캠핑의자"],
+    ),
+}
+
+ADJECTIVES = ["like new", "barely used", "boxed", "S급", "A급", "급처", "with receipt", "bundle"]
+
+SENTENCES = [
+    "Used carefully at home and always kept in a case.",
+    "No scratches on the screen, minor wear on the corners.",
+    "Selling because I upgraded to a newer model.",
+    "Direct trade near the subway station is preferred.",
+    "Shipping is available at the buyer's expense.",
+    "All original accessories and the box are included.",
+    "생활 기스 조금 있고 기능은 모두 정상입니다.",
+    "직거래 우선이며 택배 거래도 가능합니다.",
+    "네고는 정중하게 부탁드립니다.",
+    "Battery health is still above ninety percent.",
+]
+
+# Pickup locations cluster around metro areas: (latitude, longitude, share).
+CITY_CENTERS = [
+    (37.5665, 126.9780, 0.50),
+    (35.1796, 129.0756, 0.15),
+    (37.4563, 126.7052, 0.12),
+    (35.8714, 128.6014, 0.10),
+    (36.3504, 127.3845, 0.07),
+    (35.1595, 126.8526, 0.06),
+]
+
+
+@dataclass
+class SeedConfig:
+    users: int = 200
+    products: int = 2000
+    seller_ratio: float = 0.3
+    max_images: int = 5
+    sold_ratio: float = 0.25
+    reserved_ratio: float = 0.03
+    blinded_ratio: float = 0.01
+    geotagged_ratio: float = 0.8
+    max_cart_items: int = 8
+    days: int = 365
+    seed: int = 42
+
+
+@dataclass
+class SeedResult:
+    admin_id: int
+    user_ids: list[int] = field(default_factory=list)
+    seller_ids: list[int] = field(default_factory=list)
+    buyer_ids: list[int] = field(default_factory=list)
+    product_ids: list[int] = field(default_factory=list)
+    on_sale_ids: list[int] = field(default_factory=list)
+    purchase_count: int = 0
+    cart_item_count: int = 0
+
+
+def _weighted_index(rng: random.Random, cumulative: list[float]) -> int:
+    point = rng.random() * cumulative[-1]
+    lo, hi = 0, len(cumulative) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if cumulative[mid] < point:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _zipf_cumulative(size: int, exponent: float) -> list[float]:
+    cumulative: list[float] = []
+    running = 0.0
+    for rank in range(1, size + 1):
+        running += 1.0 / rank**exponent
+        cumulative.append(running)
+    return cumulative
+
+
+def _title(rng: random.Random, category: ProductCategory) -> str:
+    brands, items = TITLE_WORDS[category]
+    parts = [rng.choice(brands), rng.choice(items)]
+    if rng.random() < 0.6:
+        parts.append(rng.choice(ADJECTIVES))
+    return " ".join(parts)[:120]
+
+
+def _description(rng: random.Random) -> str:
+    # Log-normal sentence count gives mostly short texts with a long tail of multi-KB ones.
+    sentence_count = max(1, min(200, int(rng.lognormvariate(1.8, 0.9))))
+    return " ".join(rng.choice(SENTENCES) for _ in range(sentence_count))
+
+
+def _price(rng: random.Random, category: ProductCategory) -> int:
+    median, sigma = PRICE_PROFILE[category]
+    return max(1000, int(round(rng.lognormvariate(math.log(median), sigma), -2)))
+
+
+def pickup_location(rng: random.Random, cumulative: list[float]) -> tuple[float, float]:
+    # About 9 km of spread around the chosen city.
+    latitude, longitude, _ = CITY_CENTERS[_weighted_index(rng, cumulative)]
+    return latitude + rng.gauss(0, 0.08), longitude + rng.gauss(0, 0.1)
+
+
+def _reset_sequences(db: Session) -> None:
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for table in ("users", "products", "product_images", "cart_items", "purchases"):
+        db.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+            )
+        )
+
+
+def _insert_chunked(db: Session, model, rows: list[dict], chunk_size: int = 5000) -> None:
+    for start in range(0, len(rows), chunk_size):
+        db.execute(insert(model), rows[start : start + chunk_size])
+
+
+def generate(db: Session, config: SeedConfig) -> SeedResult:
+    rng = random.Random(config.seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    # bcrypt is deliberately slow, so every seeded account shares one hash.
+    password_hash = hash_password(SEED_PASSWORD)
+
+    admin = db.query(User).filter(User.role == UserRole.ADMIN).first()
+    if admin is None:
+        admin = User(
+            email="bench-admin@example.com",
+            nickname="bench-admin",
+            password_hash=password_hash,
+            role=UserRole.ADMIN,
+        )
+        db.add(admin)
+        db.flush()
+    result = SeedResult(admin_id=admin.id)
+
+    first_user_id = (db.query(User.id).order_by(User.id.desc()).limit(1).scalar() or 0) + 1
+    user_rows = []
+    for offset in range(config.users):
+        user_id = first_user_id + offset
+        user_rows.append(
+            {
+                "id": user_id,
+                "email": f"bench{user_id}@example.com",
+                "nickname": f"bench{user_id}",
+                "password_hash": password_hash,
+                "role": UserRole.USER,
+                "created_at": now - timedelta(days=rng.randint(0, config.days)),
+            }
+        )
+        result.user_ids.append(user_id)
+    _insert_chunked(db, User, user_rows)
+
+    seller_count = max(1, int(config.users * config.seller_ratio))
+    result.seller_ids = result.user_ids[:seller_count]
+    result.buyer_ids = result.user_ids[seller_count:] or result.user_ids
+    seller_cumulative = _zipf_cumulative(len(result.seller_ids), 1.1)
+
+    categories = list(CATEGORY_WEIGHTS)
+    category_cumulative: list[float] = []
+    running = 0.0
+    for category in categories:
+        running += CATEGORY_WEIGHTS[category]
+        category_cumulative.append(running)
+
+    city_cumulative: list[float] = []
+    running = 0.0
+    for *_, share in CITY_CENTERS:
+        running += share
+        city_cumulative.append(running)
+    # A separate stream, so adding locations left the rest of the seeded data unchanged.
+    location_rng = random.Random(config.seed + 1)
+    reservation_rng = random.Random(config.seed + 2)
+
+    first_product_id = (
+        db.query(Product.id).order_by(Product.id.desc()).limit(1).scalar() or 0
+    ) + 1
+    product_rows = []
+    image_rows = []
+    for offset in range(config.products):
+        product_id = first_product_id + offset
+        category = categories[_weighted_index(rng, category_cumulative)]
+        # Skew creation times towards the recent past like a live marketplace.
+        age_days = config.days * rng.random() ** 2
+        created_at = now - timedelta(days=age_days)
+        roll = rng.random()
+        status = ProductStatus.ON_SALE
+        if roll < config.sold_ratio:
+            status = ProductStatus.SOLD
+        elif roll < config.sold_ratio + config.reserved_ratio:
+            status = ProductStatus.RESERVED
+        is_blinded = rng.random() < config.blinded_ratio
+        seller_id = result.seller_ids[_weighted_index(rng, seller_cumulative)]
+        reserved_by_id = reserved_until = None
+        if status == ProductStatus.RESERVED:
+            # Held by a buyer like a live reservation, so the expiry sweep releases it.
+            reserved_by_id = reservation_rng.choice(result.buyer_ids)
+            reserved_until = now + timedelta(seconds=reservation_rng.randint(1, settings.reservation_minutes * 60))
+            if reserved_by_id == seller_id:
+                status, reserved_by_id, reserved_until = ProductStatus.ON_SALE, None, None
+        latitude = longitude = None
+        if location_rng.random() < config.geotagged_ratio:
+            latitude, longitude = pickup_location(location_rng, city_cumulative)
+        product_rows.append(
+            {
+                "id": product_id,
+                "seller_id": seller_id,
+                "title": _title(rng, category),
+                "price": _price(rng, category),
+                "description": _description(rng),
+                "category": category,
+                "condition": ProductCondition.USED if rng.random() < 0.8 else ProductCondition.NEW,
+                "status": status,
+                "reserved_by_id": reserved_by_id,
+                "reserved_until": reserved_until,
+                "is_blinded": is_blinded,
+                "blind_reason": "bench moderation" if is_blinded else None,
+                "created_at": created_at,
+                "updated_at": created_at,
+                "latitude": latitude,
+                "longitude": longitude,
+                "geohash": geohash_encode(latitude, longitude) if latitude is not None else None,
+            }
+        )
+        for index in range(min(config.max_images, int(rng.expovariate(0.6)) + 1)):
+            image_rows.append(
+                {
+                    "product_id": product_id,
+                    "image_url": f"https://images.example.com/{product_id}/{index}.jpg",
+                }
+            )
+        result.product_ids.append(product_id)
+        if status == ProductStatus.ON_SALE and not is_blinded:
+            result.on_sale_ids.append(product_id)
+    _insert_chunked(db, Product, product_rows)
+    _insert_chunked(db, ProductImage, image_rows)
+
+    purchase_rows = []
+    for row in product_rows:
+        if row["status"] != ProductStatus.SOLD:
+            continue
+        buyer_id = rng.choice(result.buyer_ids)
+        if buyer_id == row["seller_id"]:
+            continue
+        purchase_rows.append(
+            {
+                "buyer_id": buyer_id,
+                "seller_id": row["seller_id"],
+                "product_id": row["id"],
+                "quantity": 1,
+                "amount": row["price"],
+                "purchased_at": row["created_at"] + timedelta(hours=rng.randint(1, 72)),
+            }
+        )
+    _insert_chunked(db, Purchase, purchase_rows)
+    result.purchase_count = len(purchase_rows)
+
+    seller_by_product = {row["id"]: row["seller_id"] for row in product_rows}
+    cart_rows = []
+    if result.on_sale_ids:
+        # Hot items: a Zipf draw over on-sale products concentrates carts on a few listings.
+        item_cumulative = _zipf_cumulative(len(result.on_sale_ids), 0.9)
+        for buyer_id in result.buyer_ids:
+            chosen: set[int] = set()
+            for _ in range(rng.randint(0, config.max_cart_items)):
+                product_id = result.on_sale_ids[_weighted_index(rng, item_cumulative)]
+                if product_id in chosen or seller_by_product[product_id] == buyer_id:
+                    continue
+                chosen.add(product_id)
+                cart_rows.append(
+                    {
+                        "user_id": buyer_id,
+                        "product_id": product_id,
+                        "quantity": 1,
+                        "selected": rng.random() < 0.7,
+                        "created_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 30)),
+                    }
+                )
+    _insert_chunked(db, CartItem, cart_rows)
+    result.cart_item_count = len(cart_rows)
+
+    _reset_sequences(db)
+    db.commit()
+    return result
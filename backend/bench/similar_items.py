@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+from bench.harness import EndpointResult, _configure_environment
+from bench.saved_searches import BASE_WORDS, build_vocabulary
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Similar-items index: build time, memory and query latency of the "
+        "hashed TF-IDF vectors for a large catalogue."
+    )
+    parser.add_argument("--products", type=int, default=500_000)
+    parser.add_argument("--vocabulary", type=int, default=200_000)
+    parser.add_argument("--dimensions", type=int, default=128)
+    parser.add_argument("--memory-mb", type=int, default=320)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--compare-dimensions", type=int, nargs="+", default=[64, 128, 256, 512])
+    parser.add_argument("--quality-sample", type=int, default=20_000)
+    parser.add_argument("--reference-dimensions", type=int, default=4096)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def similarity_kept(rows, dimensions: list[int], reference_dimensions: int, queries: int, rng) -> dict[int, float]:
+    # Hash collisions blur the vectors; score each width by how much of the
+    # best achievable similarity (measured with near collision-free reference
+    # vectors) its top 15 retains, averaged over sample queries.
+    from app.services.recommendation_service import SimilarItemsIndex
+
+    def build(width: int) -> SimilarItemsIndex:
+        index = SimilarItemsIndex(None, dimensions=width, memory_budget_mb=1 << 20)
+        for start in range(0, len(rows), index.build_batch):
+            index.add_many(rows[start : start + index.build_batch], fresh=True)
+        return index
+
+    reference = build(reference_dimensions)
+
+    def true_similarity(source, text: str, product_ids: list[int]) -> float:
+        query = reference.vectorizer.weigh(reference.vectorizer.term_frequencies(text))
+        store = reference.categories[source.category]
+        return sum(float(store.matrix[store.slot_of(product_id)] @ query) for product_id in product_ids)
+
+    sources = rng.sample(rows, queries)
+    texts = [f"{source.title} {source.description}" for source in sources]
+
+    def top(index: SimilarItemsIndex, source, text: str) -> list[int]:
+        return [product_id for product_id, _ in index.query(source.category, text, 15, exclude_id=source.id)]
+
+    best = [true_similarity(source, text, top(reference, source, text)) for source, text in zip(sources, texts)]
+    kept = {}
+    for width in dimensions:
+        index = build(width)
+        ratios = [
+            true_similarity(source, text, top(index, source, text)) / ideal
+            for source, text, ideal in zip(sources, texts, best)
+            if ideal > 0
+        ]
+        kept[width] = sum(ratios) / len(ratios)
+    return kept
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    _configure_environment("sqlite:///./bench_secondhand.db")
+
+    from app.models import ProductCategory
+    from app.services.recommendation_service import SLOT_ENTRY_BYTES, SimilarItemsIndex
+
+    rng = random.Random(args.seed)
+    categories = list(ProductCategory)
+    vocabulary, cumulative = build_vocabulary(args.vocabulary, rng)
+
+    def text() -> str:
+        words = rng.choices(vocabulary, cum_weights=cumulative, k=4) + rng.sample(BASE_WORDS, 2)
+        return " ".join(words)
+
+    rows = [
+        SimpleNamespace(id=product_id, category=rng.choice(categories), title=text(), description=text())
+        for product_id in range(1, args.products + 1)
+    ]
+
+    index = SimilarItemsIndex(None, dimensions=args.dimensions, memory_budget_mb=args.memory_mb)
+    started = time.perf_counter()
+    for start in range(0, len(rows), index.build_batch):
+        index.add_many(rows[start : start + index.build_batch], fresh=True)
+    index.ready = True
+    build_seconds = time.perf_counter() - started
+
+    latencies = []
+    for _ in range(args.queries):
+        source = rng.choice(rows)
+        tick = time.perf_counter()
+        index.query(source.category, f"{source.title} {source.description}", 15, exclude_id=source.id)
+        latencies.append((time.perf_counter() - tick) * 1000)
+    result = EndpointResult("similar", len(latencies), 0, 0, latencies)
+
+    # Incremental updates take the per-id path used by the outbox handler.
+    updates = rng.sample(rows, min(1000, len(rows)))
+    tick = time.perf_counter()
+    for row in updates:
+        index.add_many([row])
+    update_ms = (time.perf_counter() - tick) * 1000 / len(updates)
+
+    kept = similarity_kept(
+        rows[: args.quality_sample], args.compare_dimensions, args.reference_dimensions, 200, rng
+    )
+
+    print(f"indexed products    {len(index):>12,} (budget {index.max_items:,})")
+    print(f"build               {build_seconds:>12.2f} s")
+    print(f"vector memory       {index.nbytes() / 1024 / 1024:>12.1f} MiB")
+    print(f"query p50/p95       {result.percentile(50):>8.3f} / {result.percentile(95):.3f} ms")
+    print(f"update              {update_ms:>12.3f} ms/product")
+    print(f"similarity kept vs {args.reference_dimensions} dimensions ({args.quality_sample:,} products)")
+    for width, ratio in kept.items():
+        capacity = args.memory_mb * 1024 * 1024 // (width * 4 + 9 + SLOT_ENTRY_BYTES)
+        print(f"  {width:>5} dimensions  {ratio:>6.1%}  (budget {capacity:,} products)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+import random
+import resource
+import sys
+import time
+from types import SimpleNamespace
+
+from bench.harness import EndpointResult, _configure_environment
+from bench.saved_searches import BASE_WORDS, build_vocabulary
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Typeahead index: build time, memory and per-keystroke latency of "
+        "prefix lookups over product titles."
+    )
+    parser.add_argument("--products", type=int, default=500_000)
+    parser.add_argument("--vocabulary", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    _configure_environment("sqlite:///./bench_secondhand.db")
+
+    from app.services.suggest_service import SuggestIndex
+
+    rng = random.Random(args.seed)
+    vocabulary, cumulative = build_vocabulary(args.vocabulary, rng)
+    titles = [
+        " ".join(rng.sample(BASE_WORDS, 2) + rng.choices(vocabulary, cum_weights=cumulative, k=2))
+        for _ in range(args.products)
+    ]
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    index = SuggestIndex(None, limit=10)
+    started = time.perf_counter()
+    index.load(SimpleNamespace(id=product_id, title=title) for product_id, title in enumerate(titles, start=1))
+    build_seconds = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Replay keystrokes: every prefix of a word taken from a random title.
+    keystrokes = []
+    while len(keystrokes) < args.queries:
+        word = rng.choice(rng.choice(titles).split())
+        keystrokes.extend(word[:length] for length in range(1, len(word) + 1))
+    # The first pass pays for computing the cached heads of broad prefixes.
+    results = []
+    for label in ("cold", "warm"):
+        latencies = []
+        for text in keystrokes[: args.queries]:
+            tick = time.perf_counter()
+            index.suggest(text, 10)
+            latencies.append((time.perf_counter() - tick) * 1000)
+        results.append(EndpointResult(label, len(latencies), 0, 0, latencies))
+
+    tick = time.perf_counter()
+    for product_id in range(args.products + 1, args.products + 1001):
+        index.upsert(product_id, rng.choice(titles))
+    update_ms = time.perf_counter() - tick  # 1000 inserts, so seconds read as ms each
+
+    print(f"indexed products    {len(index):>12,}")
+    print(f"build               {build_seconds:>12.2f} s")
+    print(f"max rss growth      {(rss_after - rss_before) / 1024:>12.1f} MiB")
+    for result in results:
+        print(
+            f"{result.name} p50/p95/p99  {result.percentile(50):>8.3f} / {result.percentile(95):.3f} "
+            f"/ {result.percentile(99):.3f} ms"
+        )
+    print(f"insert              {update_ms:>12.3f} ms/product")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: list[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+
+class QueryBudgetMixin:
+    engine: Engine
+
+    @contextmanager
+    def assertMaxQueries(self, limit: int, label: str = ""):
+        with QueryCounter(self.engine) as counter:
+            yield counter
+        if counter.count > limit:
+            executed = "\n".join(f"  {index + 1}. {sql}" for index, sql in enumerate(counter.statements))
+            self.fail(
+                f"{label or 'block'} executed {counter.count} statements, budget is {limit}:\n{executed}"
+            )
+
+    def count_queries(self, fn, *args, **kwargs) -> int:
+        with QueryCounter(self.engine) as counter:
+            fn(*args, **kwargs)
+        return counter.count
@@ -0,0 +1,155 @@
+import asyncio
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.admission import (
+    AUTH,
+    BROWSE,
+    CHECKOUT,
+    AdmissionController,
+    AdmissionMiddleware,
+    RouteClass,
+    classify,
+)
+
+
+def make_controller(queue_timeout: float = 0.05) -> AdmissionController:
+    return AdmissionController(
+        capacity=4,
+        checkout_reserved=2,
+        classes=[
+            RouteClass(BROWSE, limit=4, queue_limit=2, queue_timeout=queue_timeout),
+            RouteClass(AUTH, limit=1, queue_limit=1, queue_timeout=queue_timeout),
+            RouteClass(CHECKOUT, limit=4, queue_limit=2, queue_timeout=queue_timeout, uses_reserve=True),
+        ],
+    )
+
+
+class AdmissionControllerTest(unittest.TestCase):
+    def test_route_classification(self):
+        self.assertEqual(classify("POST", "/auth/login"), AUTH)
+        self.assertEqual(classify("POST", "/purchases/buy-now/1"), CHECKOUT)
+        self.assertEqual(classify("GET", "/purchases/me"), BROWSE)
+        self.assertEqual(classify("GET", "/products"), BROWSE)
+        self.assertIsNone(classify("GET", "/metrics"))
+
+    def test_browse_cannot_use_checkout_reserve(self):
+        async def scenario():
+            controller = make_controller()
+            granted = [await controller.acquire(BROWSE) for _ in range(2)]
+            # Only capacity minus the checkout reserve is open to browsing.
+            overflow = await controller.acquire(BROWSE)
+            checkout = [await controller.acquire(CHECKOUT) for _ in range(2)]
+            return granted, overflow, checkout, controller.rejected[BROWSE]
+
+        granted, overflow, checkout, rejected = asyncio.run(scenario())
+        self.assertEqual(granted, [True, True])
+        self.assertFalse(overflow)
+        self.assertEqual(checkout, [True, True])
+        self.assertEqual(rejected, 1)
+
+    def test_bounded_queue_rejects_immediately(self):
+        async def scenario():
+            controller = make_controller(queue_timeout=1.0)
+            await controller.acquire(AUTH)
+            queued = asyncio.create_task(controller.acquire(AUTH))
+            await asyncio.sleep(0)
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            rejected = await controller.acquire(AUTH)
+            elapsed = loop.time() - started
+            controller.release(AUTH)
+            return rejected, elapsed, await queued
+
+        rejected, elapsed, queued = asyncio.run(scenario())
+        self.assertFalse(rejected)
+        self.assertLess(elapsed, 0.1)
+        self.assertTrue(queued)
+
+    def test_release_wakes_checkout_before_browse(self):
+        async def scenario():
+            controller = make_controller(queue_timeout=1.0)
+            for _ in range(2):
+                await controller.acquire(BROWSE)
+            for _ in range(2):
+                await controller.acquire(CHECKOUT)
+            browse_waiter = asyncio.create_task(controller.acquire(BROWSE))
+            checkout_waiter = asyncio.create_task(controller.acquire(CHECKOUT))
+            await asyncio.sleep(0)
+            controller.release(BROWSE)
+            await asyncio.sleep(0.01)
+            state = checkout_waiter.done(), browse_waiter.done()
+            browse_waiter.cancel()
+            return state
+
+        checkout_done, browse_done = asyncio.run(scenario())
+        self.assertTrue(checkout_done)
+        self.assertFalse(browse_done)
+
+    def test_queue_deadline_expires(self):
+        async def scenario():
+            controller = make_controller(queue_timeout=0.02)
+            await controller.acquire(AUTH)
+            result = await controller.acquire(AUTH)
+            return result, len(controller.classes[AUTH].waiters)
+
+        result, waiting = asyncio.run(scenario())
+        self.assertFalse(result)
+        self.assertEqual(waiting, 0)
+
+
+class AdmissionMiddlewareTest(unittest.TestCase):
+    def setUp(self):
+        self.controller = AdmissionController(
+            capacity=4,
+            checkout_reserved=2,
+            classes=[
+                RouteClass(BROWSE, limit=2, queue_limit=4, queue_timeout=0.05),
+                RouteClass(AUTH, limit=1, queue_limit=0, queue_timeout=0.05),
+                RouteClass(CHECKOUT, limit=4, queue_limit=2, queue_timeout=0.05, uses_reserve=True),
+            ],
+        )
+        app = FastAPI()
+        app.add_middleware(AdmissionMiddleware, controller=self.controller, retry_after=3)
+        for path in ("/auth/login", "/products", "/health", "/products/stream"):
+            app.add_api_route(path, lambda: {"ok": True}, methods=["GET", "POST"])
+        self.client = TestClient(app)
+
+    def test_saturated_class_is_shed_with_retry_after(self):
+        # The only auth slot is held, and with no queue the next login is rejected at once.
+        self.assertTrue(asyncio.run(self.controller.acquire(AUTH)))
+
+        response = self.client.post("/auth/login")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "3")
+        body = response.json()
+        self.assertFalse(body["success"])
+        self.assertEqual(body["error"]["code"], "SERVICE_UNAVAILABLE")
+        self.assertEqual(body["error"]["path"], "/auth/login")
+        self.assertEqual(body["error"]["details"], {"route_class": AUTH})
+        self.assertIn("timestamp", body["error"])
+        self.assertEqual(self.controller.rejected[AUTH], 1)
+
+        # Other classes and exempt paths are unaffected.
+        self.assertEqual(self.client.get("/products").status_code, 200)
+        self.assertEqual(self.client.get("/health").status_code, 200)
+        self.assertEqual(self.client.get("/products/stream").status_code, 200)
+
+        self.controller.release(AUTH)
+        self.assertEqual(self.client.post("/auth/login").status_code, 200)
+        self.assertEqual(self.controller.in_flight, 0)
+
+    def test_exempt_paths_pass_when_every_class_is_full(self):
+        for name in (BROWSE, BROWSE, CHECKOUT, CHECKOUT):
+            self.assertTrue(asyncio.run(self.controller.acquire(name)))
+
+        self.assertEqual(self.client.get("/products").status_code, 503)
+        self.assertEqual(self.client.get("/health").status_code, 200)
+        self.assertEqual(self.client.get("/products/stream").status_code, 200)
+        self.assertEqual(self.controller.in_flight, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, update
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models import ArchivedProduct, CartItem, Product, ProductImage, User
+from app.models.entities import SOLD_PRODUCT
+from app.schemas.product import ProductCreate
+from app.services.archive_service import ProductArchiver
+from app.services.product_service import ProductService
+from app.services.purchase_service import PurchaseService
+
+
+class ProductArchiveTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        self.db = SessionLocal()
+        users = [
+            User(email=f"user{index}@example.com", nickname=f"user{index}", password_hash="x")
+            for index in range(3)
+        ]
+        self.db.add_all(users)
+        self.db.commit()
+        self.seller_id, self.buyer_id, self.other_id = [user.id for user in users]
+        self.archiver = ProductArchiver(SessionLocal, timedelta(days=30), batch_size=2, interval=3600)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def create(self, index: int) -> int:
+        return (
+            ProductService(self.db)
+            .create(
+                self.seller_id,
+                ProductCreate(
+                    title=f"Item {index}",
+                    price=1000 + index,
+                    description="desc",
+                    category="etc",
+                    condition="used",
+                    image_urls=[f"https://example.com/{index}.jpg"],
+                ),
+            )
+            .id
+        )
+
+    def count(self, model) -> int:
+        return self.db.scalar(select(func.count()).select_from(model))
+
+    def test_old_sales_move_to_archive_in_resumable_batches(self):
+        product_ids = [self.create(index) for index in range(5)]
+        old_sales, recent_sale, on_sale = product_ids[:3], product_ids[3], product_ids[4]
+        self.db.add(CartItem(user_id=self.other_id, product_id=old_sales[0], quantity=1))
+        self.db.commit()
+        for product_id in [*old_sales, recent_sale]:
+            PurchaseService(self.db).buy_now(self.buyer_id, product_id)
+        self.db.execute(
+            update(Product)
+            .where(Product.id.in_(old_sales))
+            .values(updated_at=datetime.utcnow() - timedelta(days=60))
+        )
+        self.db.commit()
+
+        self.assertEqual(self.archiver.run(max_batches=1), 2)
+        self.assertEqual(self.archiver.run(), 1)
+        self.assertEqual(self.archiver.run(), 0)
+
+        self.db.expire_all()
+        self.assertEqual(
+            sorted(self.db.scalars(select(Product.id)).all()), sorted([recent_sale, on_sale])
+        )
+        self.assertEqual(sorted(self.db.scalars(select(ArchivedProduct.id)).all()), old_sales)
+        self.assertEqual(self.count(ProductImage), 2)
+        self.assertEqual(self.count(CartItem), 0)
+
+        detail = self.client.get(f"/products/{old_sales[0]}").json()
+        self.assertEqual(detail["status"], "sold")
+        self.assertEqual(detail["image_urls"], ["https://example.com/0.jpg"])
+        self.assertEqual(detail["seller_nickname"], "user0")
+
+        headers = {"Authorization": f"Bearer {create_access_token(str(self.buyer_id))}"}
+        purchases = self.client.get("/purchases/me", headers=headers).json()["purchases"]
+        titles = [item["product_title"] for item in purchases]
+        self.assertEqual(sorted(titles), ["Item 0", "Item 1", "Item 2", "Item 3"])
+
+    def test_archivable_scan_uses_sold_index(self):
+        query = (
+            select(Product.id)
+            .where(SOLD_PRODUCT, Product.updated_at < datetime(2024, 1, 1))
+            .order_by(Product.updated_at)
+            .limit(500)
+        )
+        compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+        plan = self.db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+        self.assertTrue(any("ix_products_sold_updated" in row[-1] for row in plan), plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
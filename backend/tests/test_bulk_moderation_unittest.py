@@ -0,0 +1,178 @@
+import json
+import os
+import time
+import unittest
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models import (
+    CartItem,
+    ModerationAction,
+    ModerationJob,
+    ModerationJobStatus,
+    Product,
+    ProductEvent,
+    SellerStats,
+    User,
+    UserRole,
+)
+from app.repositories.moderation_repository import ModerationRepository
+from app.schemas.product import ProductCreate
+from app.services.moderation_service import BulkModerationRunner, moderation_runner
+from app.services.product_service import ProductService
+
+
+class BulkModerationTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        self.db = SessionLocal()
+        admin = User(email="admin@example.com", nickname="admin", password_hash="x", role=UserRole.ADMIN)
+        spammer = User(email="spam@example.com", nickname="spam", password_hash="x")
+        buyer = User(email="buyer@example.com", nickname="buyer", password_hash="x")
+        self.db.add_all([admin, spammer, buyer])
+        self.db.commit()
+        self.admin = {"Authorization": f"Bearer {create_access_token(str(admin.id))}"}
+        self.spammer_id = spammer.id
+        self.buyer_id = buyer.id
+        self.product_ids = [
+            ProductService(self.db)
+            .create(
+                spammer.id,
+                ProductCreate(title=f"Spam {index}", price=100, description="desc", category="etc", condition="new"),
+            )
+            .id
+            for index in range(5)
+        ]
+        self.chunk_size = moderation_runner.chunk_size
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        moderation_runner.chunk_size = self.chunk_size
+        moderation_runner.stop()
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def blinded_ids(self) -> list[int]:
+        self.db.expire_all()
+        return list(self.db.scalars(select(Product.id).where(Product.is_blinded.is_(True)).order_by(Product.id)))
+
+    def test_id_list_blinds_changed_rows_and_clears_carts(self):
+        first, second, already, *_ = self.product_ids
+        ProductService(self.db).blind(already, "earlier report")
+        self.db.add_all(
+            [CartItem(user_id=self.buyer_id, product_id=product_id, quantity=1) for product_id in (first, already)]
+        )
+        self.db.commit()
+        events_before = self.db.scalar(select(func.count()).select_from(ProductEvent))
+
+        response = self.client.post(
+            "/admin/products/bulk-blind",
+            json={"product_ids": [first, second, already, second, 9999], "reason": "spam ring"},
+            headers=self.admin,
+        )
+        self.assertEqual(response.status_code, 202)
+        job = response.json()
+        self.assertEqual(job["status"], "done")
+        self.assertEqual((job["total"], job["processed"], job["changed"]), (4, 4, 2))
+        self.assertEqual(job["cart_items_removed"], 1)
+
+        self.assertEqual(self.blinded_ids(), [first, second, already])
+        self.assertEqual(self.db.get(Product, first).blind_reason, "spam ring")
+        self.assertEqual(self.db.scalar(select(func.count()).select_from(CartItem)), 1)
+        self.assertEqual(self.db.scalar(select(func.count()).select_from(ProductEvent)), events_before + 2)
+        self.assertEqual(self.db.get(SellerStats, self.spammer_id).active_count, 2)
+
+        invalid = self.client.post(
+            "/admin/products/bulk-blind",
+            json={"product_ids": [first], "seller_id": self.spammer_id, "reason": "x"},
+            headers=self.admin,
+        )
+        self.assertEqual(invalid.status_code, 400)
+        buyer = {"Authorization": f"Bearer {create_access_token(str(self.buyer_id))}"}
+        forbidden = self.client.post("/admin/products/bulk-unblind", json={"product_ids": [first]}, headers=buyer)
+        self.assertEqual(forbidden.status_code, 403)
+
+    def test_seller_wide_job_runs_in_chunks_in_the_background(self):
+        moderation_runner.chunk_size = 2
+        job = self.client.post(
+            "/admin/products/bulk-blind",
+            json={"seller_id": self.spammer_id, "reason": "spam ring"},
+            headers=self.admin,
+        ).json()
+        self.assertEqual(job["total"], 5)
+
+        deadline = time.monotonic() + 5
+        while job["status"] not in ("done", "failed") and time.monotonic() < deadline:
+            time.sleep(0.02)
+            job = self.client.get(f"/admin/moderation-jobs/{job['id']}", headers=self.admin).json()
+        self.assertEqual(job["status"], "done")
+        self.assertEqual((job["processed"], job["changed"]), (5, 5))
+        self.assertEqual(self.blinded_ids(), self.product_ids)
+        self.assertEqual(self.db.get(SellerStats, self.spammer_id).active_count, 0)
+
+        moderation_runner.chunk_size = self.chunk_size
+        job = self.client.post(
+            "/admin/products/bulk-unblind", json={"seller_id": self.spammer_id}, headers=self.admin
+        ).json()
+        self.assertEqual(job["status"], "done")
+        self.assertEqual(self.blinded_ids(), [])
+        self.assertEqual(self.client.get("/admin/moderation-jobs/9999", headers=self.admin).status_code, 404)
+
+    def test_a_job_runs_only_on_the_worker_holding_its_lease(self):
+        job = ModerationJob(
+            action=ModerationAction.BLIND,
+            reason="spam ring",
+            product_ids=json.dumps(self.product_ids),
+            total=5,
+            created_by=self.spammer_id,
+        )
+        self.db.add(job)
+        self.db.commit()
+        first = BulkModerationRunner(SessionLocal, chunk_size=2, lease_seconds=60)
+        second = BulkModerationRunner(SessionLocal, chunk_size=2, lease_seconds=60)
+        self.assertNotEqual(first.owner, second.owner)
+
+        repo = ModerationRepository(self.db)
+        now = datetime.utcnow()
+        self.assertTrue(repo.claim_job(job.id, first.owner, now, now + timedelta(seconds=60)))
+        self.db.commit()
+        self.assertEqual(repo.list_claimable_job_ids(now), [])
+        second.run(job.id)
+        self.assertEqual(self.blinded_ids(), [])
+
+        # The first worker went away with its lease; once it expires the job is taken over.
+        self.db.get(ModerationJob, job.id).lease_until = now - timedelta(seconds=1)
+        self.db.commit()
+        self.assertEqual(repo.list_claimable_job_ids(datetime.utcnow()), [job.id])
+        second.run(job.id)
+        self.db.expire_all()
+        job = self.db.get(ModerationJob, job.id)
+        self.assertEqual(job.status, ModerationJobStatus.DONE)
+        self.assertEqual((job.processed, job.changed), (5, 5))
+        self.assertEqual(job.owner, second.owner)
+
+        # A late chunk from the old owner is rolled back instead of counted again.
+        self.assertFalse(repo.record_progress(job.id, first.owner, datetime.utcnow(), 2, 2, 0))
+        self.db.rollback()
+        first.run(job.id)
+        self.db.expire_all()
+        self.assertEqual(self.db.get(ModerationJob, job.id).processed, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
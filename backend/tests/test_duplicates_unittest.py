@@ -0,0 +1,128 @@
+import os
+import unittest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, engine
+from app.core.minhash import band_keys, signature, similarity
+from app.core.security import create_access_token
+from app.main import app
+from app.models import ProductSignatureBand, ProductViewCount, User, UserRole
+from app.services.popularity_service import view_counter
+
+LISTING = (
+    "Nintendo Switch OLED white, bought last year, barely used. "
+    "Comes with the original box, dock, two joy-cons and a screen protector."
+)
+REPOST = (
+    "Nintendo Switch OLED white, bought last year, barely used!! "
+    "Comes with the original box, dock, two joy-cons and a screen protector"
+)
+OTHER = "Camping tent for four people, used twice, no holes, packs down small."
+
+
+class DuplicateListingTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        self.policy = settings.duplicate_listing_policy
+        self.db = SessionLocal()
+        admin = User(email="admin@example.com", nickname="admin", password_hash="x", role=UserRole.ADMIN)
+        spammer = User(email="spam@example.com", nickname="spam", password_hash="x")
+        honest = User(email="honest@example.com", nickname="honest", password_hash="x")
+        self.db.add_all([admin, spammer, honest])
+        self.db.commit()
+        self.admin = self.auth(admin.id)
+        self.spammer = self.auth(spammer.id)
+        self.honest = self.auth(honest.id)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        settings.duplicate_listing_policy = self.policy
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def auth(self, user_id: int) -> dict[str, str]:
+        return {"Authorization": f"Bearer {create_access_token(str(user_id))}"}
+
+    def create(self, headers: dict[str, str], title: str, description: str):
+        payload = {"title": title, "price": 300000, "description": description, "category": "etc", "condition": "used"}
+        return self.client.post("/products", json=payload, headers=headers)
+
+    def clusters(self) -> list[list[int]]:
+        items = self.client.get("/admin/duplicates", headers=self.admin).json()["items"]
+        return [[listing["id"] for listing in item["listings"]] for item in items]
+
+    def test_signatures_estimate_similarity_and_band_in_batches(self):
+        listing, repost, other = (signature(text) for text in (LISTING, REPOST, OTHER))
+        self.assertGreater(similarity(listing, repost), 0.8)
+        self.assertLess(similarity(listing, other), 0.2)
+        self.assertEqual(listing.dtype, np.uint32)
+        batch = band_keys(np.stack([listing, repost]))
+        self.assertTrue((batch[0] == band_keys(listing)).all())
+        self.assertTrue((batch[0] == batch[1]).any())
+
+    def test_reposts_are_flagged_into_per_seller_clusters(self):
+        original = self.create(self.spammer, "Switch OLED", LISTING).json()["id"]
+        repost = self.create(self.spammer, "Switch OLED!!", REPOST).json()["id"]
+        again = self.create(self.spammer, "Switch OLED", LISTING).json()["id"]
+        tent = self.create(self.spammer, "Tent", OTHER).json()["id"]
+        # The same text from another seller is a different item.
+        self.create(self.honest, "Switch OLED", LISTING)
+        self.assertEqual(self.clusters(), [[original, repost, again]])
+
+        self.client.patch(f"/products/{tent}", json={"description": REPOST}, headers=self.spammer)
+        self.client.patch(f"/products/{repost}", json={"title": "Tent", "description": OTHER}, headers=self.spammer)
+        self.assertEqual(self.clusters(), [[original, again, tent]])
+
+        self.client.post(f"/admin/products/{again}/blind", json={"reason": "repost"}, headers=self.admin)
+        self.client.post(f"/admin/products/{tent}/blind", json={"reason": "repost"}, headers=self.admin)
+        self.assertEqual(self.clusters(), [])
+
+    def test_reject_policy_refuses_the_repost(self):
+        settings.duplicate_listing_policy = "reject"
+        original = self.create(self.spammer, "Switch OLED", LISTING).json()["id"]
+        response = self.create(self.spammer, "Switch OLED!!", REPOST)
+        self.assertEqual(response.status_code, 409)
+        self.assertIn(str(original), response.json()["error"]["message"])
+        self.assertEqual(self.create(self.spammer, "Tent", OTHER).status_code, 200)
+        self.assertEqual(self.create(self.honest, "Switch OLED", LISTING).status_code, 200)
+
+    def test_deleted_listing_leaves_nothing_for_the_next_one(self):
+        self.create(self.spammer, "Switch OLED", LISTING)
+        repost = self.create(self.spammer, "Switch OLED!!", REPOST).json()["id"]
+        self.client.get(f"/products/{repost}")
+        view_counter.flush()
+        self.assertEqual(self.client.delete(f"/products/{repost}", headers=self.spammer).status_code, 200)
+
+        # SQLite hands the deleted id out again.
+        tent = self.create(self.spammer, "Tent", OTHER)
+        self.assertEqual(tent.status_code, 200)
+        self.assertEqual(tent.json()["id"], repost)
+        self.assertEqual(self.clusters(), [])
+        views = select(ProductViewCount).where(ProductViewCount.product_id == repost)
+        self.assertEqual(self.db.scalars(views).all(), [])
+
+    def test_candidate_lookup_reads_the_bucket_index(self):
+        stmt = select(ProductSignatureBand.product_id).where(
+            ProductSignatureBand.seller_id == 1, ProductSignatureBand.bucket.in_([1, 2, 3])
+        )
+        compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+        plan = self.db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+        self.assertTrue(any("ix_signature_bands_seller_bucket" in row[-1] for row in plan), plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
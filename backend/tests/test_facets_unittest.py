@@ -0,0 +1,129 @@
+import os
+import unittest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.database import Base, SessionLocal, engine
+from app.main import app
+from app.models import Product, ProductCategory, User
+from app.models.entities import BUYABLE_PRODUCT
+from app.schemas.product import ProductCreate
+from app.services.outbox_service import outbox_poller
+from app.services.product_service import ProductService, facet_cache
+from app.services.purchase_service import PurchaseService
+from tests.query_budget import QueryBudgetMixin
+
+
+class FacetTest(QueryBudgetMixin, unittest.TestCase):
+    engine = engine
+
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        facet_cache.clear()
+        outbox_poller.last_id = 0
+        self.db = SessionLocal()
+        seller = User(email="seller@example.com", nickname="seller", password_hash="x")
+        buyer = User(email="buyer@example.com", nickname="buyer", password_hash="x")
+        self.db.add_all([seller, buyer])
+        self.db.commit()
+        self.seller_id = seller.id
+        self.buyer_id = buyer.id
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def create(self, title: str, category: str, condition: str) -> int:
+        return (
+            ProductService(self.db)
+            .create(
+                self.seller_id,
+                ProductCreate(
+                    title=title, price=1000, description=title, category=category, condition=condition
+                ),
+            )
+            .id
+        )
+
+    def test_facets_come_from_one_cached_group_by(self):
+        self.create("Lamp one", "home", "used")
+        self.create("Lamp two", "home", "new")
+        sold = self.create("Lamp book", "books", "used")
+        hidden = self.create("Lamp spam", "books", "new")
+        self.create("Chair", "home", "used")
+        ProductService(self.db).blind(hidden, "spam")
+        PurchaseService(self.db).buy_now(self.buyer_id, sold)
+
+        params = {"keyword": "Lamp", "category": "home", "facets": "category,condition,status"}
+        with self.assertMaxQueries(5, "list with facets (miss)"):
+            body = self.client.get("/products", params=params).json()
+        with self.assertMaxQueries(4, "list with facets (hit)"):
+            self.assertEqual(self.client.get("/products", params=params).json(), body)
+
+        facets = body["facets"]
+        # The category facet ignores the selected category; the others apply it.
+        self.assertEqual(facets["category"]["home"], 2)
+        self.assertEqual(facets["category"]["books"], 1)
+        self.assertEqual(facets["category"]["etc"], 0)
+        self.assertEqual(facets["condition"], {"new": 1, "used": 1})
+        self.assertEqual(facets["status"], {"on_sale": 2, "reserved": 0, "sold": 0})
+        self.assertEqual(body["total"], 2)
+
+        self.create("Lamp three", "home", "new")
+        outbox_poller.poll()
+        refreshed = self.client.get("/products", params=params).json()["facets"]
+        self.assertEqual(refreshed["condition"], {"new": 2, "used": 1})
+
+    def test_price_condition_and_status_filters(self):
+        cheap = self.create("Cheap lamp", "home", "used")
+        self.create("New lamp", "home", "new")
+        sold = self.create("Sold lamp", "home", "used")
+        hidden = self.create("Hidden lamp", "home", "used")
+        ProductService(self.db).blind(hidden, "spam")
+        PurchaseService(self.db).buy_now(self.buyer_id, sold)
+
+        on_sale = self.client.get(
+            "/products", params={"status": "on_sale", "condition": "used", "max_price": 1000}
+        ).json()
+        sold_items = self.client.get("/products", params={"status": "sold", "min_price": 1000}).json()
+        above = self.client.get("/products", params={"min_price": 1001}).json()
+        invalid = self.client.get("/products", params={"min_price": 10, "max_price": 5})
+
+        self.assertEqual([item["id"] for item in on_sale["items"]], [cheap])
+        self.assertEqual([item["id"] for item in sold_items["items"]], [sold])
+        self.assertEqual(above["total"], 0)
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_buyable_listing_uses_partial_index(self):
+        stmt = (
+            select(Product.id)
+            .where(BUYABLE_PRODUCT, Product.category == ProductCategory.HOME)
+            .order_by(Product.created_at.desc())
+            .limit(20)
+        )
+        compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+        plan = self.db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+        self.assertTrue(
+            any("ix_products_buyable_category_created" in row[-1] for row in plan), plan
+        )
+
+    def test_unknown_facet_is_rejected(self):
+        response = self.client.get("/products", params={"facets": "category,color"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIsNone(self.client.get("/products").json()["facets"])
+
+
+if __name__ == "__main__":
+    unittest.main()
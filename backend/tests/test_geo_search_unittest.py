@@ -0,0 +1,135 @@
+import os
+import sqlite3
+import unittest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.core.database import Base, SessionLocal, _install_math_functions, engine
+from app.core.geohash import cover_circle, covering_prefixes, distance_km, encode, prefix_upper_bound
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Product, User
+from app.repositories.product_repository import ProductRepository
+
+CITY_HALL = (37.5665, 126.9780)
+GANGNAM = (37.4979, 127.0276)
+BUSAN = (35.1796, 129.0756)
+
+
+class GeoSearchTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        self.db = SessionLocal()
+        seller = User(email="seller@example.com", nickname="seller", password_hash="x")
+        self.db.add(seller)
+        self.db.commit()
+        self.seller = {"Authorization": f"Bearer {create_access_token(str(seller.id))}"}
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def create(self, title: str, location: tuple[float, float] | None = None):
+        payload = {"title": title, "price": 1000, "description": "desc", "category": "etc", "condition": "used"}
+        if location:
+            payload["latitude"], payload["longitude"] = location
+        return self.client.post("/products", json=payload, headers=self.seller)
+
+    def search(self, **params) -> list[tuple[str, float | None]]:
+        response = self.client.get("/products", params={"lat": CITY_HALL[0], "lng": CITY_HALL[1], **params})
+        return [(item["title"], item["distance_km"]) for item in response.json()["items"]]
+
+    def test_geohash_cells_cover_the_search_circle(self):
+        self.assertEqual(encode(57.64911, 10.40744, 11), "u4pruydqqvj")
+        self.assertEqual(prefix_upper_bound("wydz"), "wye")
+        self.assertEqual(prefix_upper_bound("w9"), "wb")
+        self.assertIsNone(prefix_upper_bound("zz"))
+        self.assertAlmostEqual(distance_km(*CITY_HALL, *GANGNAM), 8.9, delta=0.2)
+
+        prefixes = covering_prefixes(*CITY_HALL, 10)
+        self.assertLessEqual(len(prefixes), 48)
+        for point in (CITY_HALL, GANGNAM, (37.6565, 126.9780), (37.5665, 126.8650)):
+            self.assertTrue(any(encode(*point).startswith(prefix) for prefix in prefixes), point)
+        inside, boundary = cover_circle(*CITY_HALL, 10)
+        self.assertTrue(inside)
+        self.assertLessEqual(set(inside + boundary), set(prefixes))
+        self.assertIn(encode(*GANGNAM, 5), boundary)
+
+    def test_radius_filter_and_distance_sort(self):
+        self.create("City hall", CITY_HALL)
+        self.create("Gangnam", GANGNAM)
+        self.create("Busan", BUSAN)
+        self.create("Nowhere")
+
+        self.assertEqual(self.search(radius_km=5), [("City hall", 0.0)])
+        nearby = self.search(radius_km=15, sort="distance")
+        self.assertEqual([title for title, _ in nearby], ["City hall", "Gangnam"])
+        self.assertAlmostEqual(nearby[1][1], 8.9, delta=0.2)
+        self.assertEqual(len(self.client.get("/products").json()["items"]), 4)
+
+        self.assertEqual(self.client.get("/products", params={"lat": 37.5, "lng": 127.0}).status_code, 400)
+        self.assertEqual(self.client.get("/products", params={"sort": "distance"}).status_code, 400)
+        self.assertEqual(self.create("Half", (37.5, None)).status_code, 400)
+
+        busan = self.db.scalar(select(Product).where(Product.title == "Busan"))
+        moved = self.client.patch(
+            f"/products/{busan.id}", json={"latitude": GANGNAM[0], "longitude": GANGNAM[1]}, headers=self.seller
+        )
+        self.assertEqual(moved.status_code, 200)
+        self.assertEqual([title for title, _ in self.search(radius_km=15)], ["Busan", "Gangnam", "City hall"])
+
+    def test_radius_search_starts_from_the_geohash_index(self):
+        nearby = ProductRepository(self.db)._nearby(*CITY_HALL, 10, [Product.is_blinded.is_(False)], False)
+        stmt = select(func.count()).select_from(nearby.subquery())
+        compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+        plan = self.db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+        self.assertTrue(any("COVERING INDEX ix_products_geohash" in row[-1] for row in plan), plan)
+        self.assertFalse(any(row[-1].startswith("SCAN products") for row in plan), plan)
+
+    def test_distance_sort_pages_through_every_listing_in_order(self):
+        # Enough listings that the first pages are ranked from a smaller circle.
+        for step in range(30):
+            self.create(f"Step {step}", (CITY_HALL[0] + step * 0.002, CITY_HALL[1]))
+        self.create("Twin", (CITY_HALL[0] + 0.002, CITY_HALL[1]))
+
+        titles = []
+        for page in range(1, 5):
+            titles += [title for title, _ in self.search(radius_km=10, sort="distance", page=page, page_size=9)]
+        self.assertEqual(titles[:4], ["Step 0", "Twin", "Step 1", "Step 2"])
+        self.assertEqual(titles[4:], [f"Step {step}" for step in range(3, 30)])
+
+    def test_math_functions_are_registered_when_sqlite_lacks_them(self):
+        class WithoutMath:
+            # A real connection that reports the math functions as missing.
+            def __init__(self):
+                self.connection = sqlite3.connect(":memory:")
+                self.registered = []
+
+            def execute(self, sql):
+                raise sqlite3.OperationalError("no such function: sin")
+
+            def create_function(self, name, arity, function, deterministic):
+                self.registered.append(name)
+                self.connection.create_function(name, arity, function, deterministic=deterministic)
+
+        bare = WithoutMath()
+        _install_math_functions(bare, None)
+        self.assertEqual(sorted(bare.registered), ["cos", "radians", "sin"])
+        value = bare.connection.execute("SELECT sin(radians(30)) * cos(radians(60))").fetchone()[0]
+        self.assertAlmostEqual(value, 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
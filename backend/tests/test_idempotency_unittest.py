@@ -0,0 +1,159 @@
+import os
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models import IdempotencyKey, Purchase, User
+from app.schemas.product import ProductCreate
+from app.services.idempotency_service import IdempotencyService, idempotency_cache
+from app.services.product_service import ProductService
+from app.services.purchase_service import PurchaseService
+
+
+class IdempotencyKeyTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        idempotency_cache.clear()
+        self.db = SessionLocal()
+        seller = User(email="seller@example.com", nickname="seller", password_hash="x")
+        buyer = User(email="buyer@example.com", nickname="buyer", password_hash="x")
+        self.db.add_all([seller, buyer])
+        self.db.commit()
+        self.seller_id = seller.id
+        self.buyer_id = buyer.id
+        self.product_id = (
+            ProductService(self.db)
+            .create(
+                seller.id,
+                ProductCreate(title="Camera", price=1000, description="desc", category="etc", condition="used"),
+            )
+            .id
+        )
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def buy(self, user_id: int, key: str, product_id: int | None = None):
+        headers = {
+            "Authorization": f"Bearer {create_access_token(str(user_id))}",
+            "Idempotency-Key": key,
+        }
+        return self.client.post(f"/purchases/buy-now/{product_id or self.product_id}", headers=headers)
+
+    def test_retry_replays_the_first_response_without_touching_products(self):
+        first = self.buy(self.buyer_id, "retry-1")
+        self.assertEqual(first.status_code, 200)
+
+        statements = []
+
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            retry = self.buy(self.buyer_id, "retry-1")
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.json(), first.json())
+        self.assertFalse([sql for sql in statements if "products" in sql], statements)
+
+        # Another worker has no cached copy and reads the stored response instead.
+        idempotency_cache.clear()
+        self.assertEqual(self.buy(self.buyer_id, "retry-1").json(), first.json())
+        self.assertEqual(self.db.scalar(select(func.count()).select_from(Purchase)), 1)
+
+        # A new key is a new purchase attempt, which now fails because the item is sold.
+        self.assertEqual(self.buy(self.buyer_id, "retry-2").status_code, 409)
+
+    def test_failures_replay_and_keys_are_bound_to_one_request(self):
+        own = self.buy(self.seller_id, "own-item")
+        self.assertEqual(own.status_code, 400)
+        idempotency_cache.clear()
+        replay = self.buy(self.seller_id, "own-item")
+        self.assertEqual(replay.status_code, 400)
+        self.assertEqual(replay.json()["error"]["message"], own.json()["error"]["message"])
+
+        self.assertEqual(self.buy(self.seller_id, "own-item", product_id=9999).status_code, 422)
+
+    def test_concurrent_duplicate_waits_for_the_first_request(self):
+        calls = []
+        results = {}
+
+        def operation(complete) -> dict:
+            calls.append(1)
+            time.sleep(0.3)
+            return {"purchase_id": 42}
+
+        def attempt(name: str) -> None:
+            db = SessionLocal()
+            try:
+                results[name] = IdempotencyService(db).execute(self.buyer_id, "dup", "POST /x", operation)
+            finally:
+                db.close()
+
+        first = threading.Thread(target=attempt, args=("first",))
+        first.start()
+        time.sleep(0.1)
+        attempt("second")
+        first.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, {"first": {"purchase_id": 42}, "second": {"purchase_id": 42}})
+
+    def test_response_commits_with_the_purchase(self):
+        request = f"POST /purchases/buy-now/{self.product_id}"
+
+        def operation(complete) -> dict:
+            PurchaseService(self.db).buy_now(
+                self.buyer_id,
+                self.product_id,
+                before_commit=lambda purchases: complete({"purchase_id": purchases[0].id}),
+            )
+            # The worker dies after the purchase commits, before anything else runs.
+            raise RuntimeError("worker died")
+
+        with self.assertRaises(RuntimeError):
+            IdempotencyService(self.db).execute(self.buyer_id, "died", request, operation)
+
+        idempotency_cache.clear()
+        retry = self.buy(self.buyer_id, "died")
+        purchase_id = self.db.scalar(select(Purchase.id))
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.json(), {"purchase_id": purchase_id})
+        self.assertEqual(self.db.scalar(select(func.count()).select_from(Purchase)), 1)
+
+    def test_abandoned_claim_is_taken_over(self):
+        self.db.add(
+            IdempotencyKey(
+                user_id=self.buyer_id,
+                key="crashed",
+                request="POST /x",
+                created_at=datetime.utcnow() - timedelta(minutes=5),
+            )
+        )
+        self.db.commit()
+        body = IdempotencyService(self.db).execute(self.buyer_id, "crashed", "POST /x", lambda complete: {"ok": True})
+        self.assertEqual(body, {"ok": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import os
+import unittest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+
+from app.core.counter_buffer import CounterBuffer
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Product, ProductLike, User
+from app.schemas.product import ProductCreate
+from app.services.like_service import like_counter
+from app.services.product_service import ProductService
+
+
+class LikeCounterTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        like_counter.flush()
+        self.db = SessionLocal()
+        users = [
+            User(email=f"user{index}@example.com", nickname=f"user{index}", password_hash="x")
+            for index in range(3)
+        ]
+        self.db.add_all(users)
+        self.db.commit()
+        self.seller_id, *self.fan_ids = [user.id for user in users]
+        self.product_id = (
+            ProductService(self.db)
+            .create(
+                self.seller_id,
+                ProductCreate(title="Lamp", price=1000, description="desc", category="etc", condition="used"),
+            )
+            .id
+        )
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def headers(self, user_id: int) -> dict[str, str]:
+        return {"Authorization": f"Bearer {create_access_token(str(user_id))}"}
+
+    def test_buffer_merges_increments_and_retries_failed_flushes(self):
+        flushed = []
+        failing = [True]
+
+        def flush(deltas):
+            if failing[0]:
+                raise RuntimeError("database unavailable")
+            flushed.append(deltas)
+
+        buffer = CounterBuffer(flush, interval=60)
+        for _ in range(5):
+            buffer.add(1, 1)
+        buffer.add(1, -1)
+        buffer.add(2, 1)
+        buffer.add(3, 1)
+        buffer.add(3, -1)
+        with self.assertRaises(RuntimeError):
+            buffer.flush()
+        self.assertEqual(buffer.pending(1), 4)
+
+        failing[0] = False
+        buffer.add(2, 1)
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(flushed, [{1: 4, 2: 2}])
+        self.assertEqual(buffer.flush(), 0)
+
+    def test_likes_are_idempotent_and_flushed_in_one_batch(self):
+        fan, other = self.fan_ids
+        path = f"/likes/{self.product_id}"
+        self.assertEqual(self.client.put(path, headers=self.headers(fan)).json()["like_count"], 1)
+        self.assertEqual(self.client.put(path, headers=self.headers(fan)).json()["like_count"], 1)
+        self.assertEqual(self.client.put(path, headers=self.headers(other)).json()["like_count"], 2)
+        self.assertEqual(self.client.delete(path, headers=self.headers(other)).json()["like_count"], 1)
+        self.assertEqual(self.client.delete(path, headers=self.headers(other)).json()["like_count"], 1)
+        self.assertEqual(self.client.put("/likes/9999", headers=self.headers(fan)).status_code, 404)
+        self.assertEqual(len(self.db.scalars(select(ProductLike)).all()), 1)
+
+        updated_at = self.db.get(Product, self.product_id).updated_at
+        statements = []
+
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            self.assertEqual(like_counter.flush(), 1)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        self.assertEqual(len([sql for sql in statements if sql.startswith("UPDATE products")]), 1)
+
+        self.db.expire_all()
+        product = self.db.get(Product, self.product_id)
+        self.assertEqual(product.like_count, 1)
+        self.assertEqual(product.updated_at, updated_at)
+
+        listing = self.client.get("/products").json()["items"]
+        self.assertEqual(listing[0]["like_count"], 1)
+        wishlist = self.client.get("/likes", headers=self.headers(fan)).json()["items"]
+        self.assertEqual([item["id"] for item in wishlist], [self.product_id])
+
+    def test_deleting_a_liked_product_drops_it_from_wishlists(self):
+        fan = self.fan_ids[0]
+        self.client.put(f"/likes/{self.product_id}", headers=self.headers(fan))
+        deleted = self.client.delete(f"/products/{self.product_id}", headers=self.headers(self.seller_id))
+        self.assertEqual(deleted.status_code, 200)
+
+        wishlist = self.client.get("/likes", headers=self.headers(fan))
+        self.assertEqual(wishlist.status_code, 200)
+        self.assertEqual(wishlist.json()["items"], [])
+        self.assertEqual(self.db.scalars(select(ProductLike)).all(), [])
+        self.assertEqual(like_counter.pending(self.product_id), 0)
+
+    def test_wishlist_pages_and_skips_blinded_listings(self):
+        fan = self.fan_ids[0]
+        service = ProductService(self.db)
+        product_ids = [self.product_id] + [
+            service.create(
+                self.seller_id,
+                ProductCreate(title=f"Lamp {index}", price=1000, description="desc", category="etc", condition="used"),
+            ).id
+            for index in range(3)
+        ]
+        for product_id in product_ids:
+            self.client.put(f"/likes/{product_id}", headers=self.headers(fan))
+        service.blind(product_ids[2], "spam")
+
+        first = self.client.get("/likes", params={"limit": 2}, headers=self.headers(fan)).json()
+        self.assertEqual([item["id"] for item in first["items"]], [product_ids[3], product_ids[1]])
+        self.assertIsNotNone(first["next_before_id"])
+        second = self.client.get(
+            "/likes", params={"limit": 2, "before_id": first["next_before_id"]}, headers=self.headers(fan)
+        ).json()
+        self.assertEqual([item["id"] for item in second["items"]], [product_ids[0]])
+        self.assertIsNone(second["next_before_id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
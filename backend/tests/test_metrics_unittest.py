@@ -0,0 +1,83 @@
+import os
+import unittest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.database import Base, SlowQueryRecorder, engine
+from app.core.metrics import registry
+from app.main import app
+from app.repositories.product_repository import ProductRepository
+
+
+class MetricsTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        registry.reset()
+        self.client = TestClient(app)
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def test_metrics_are_grouped_by_route_template(self):
+        self.client.get("/products")
+        self.client.get("/products/101")
+        self.client.get("/products/202")
+
+        body = self.client.get("/metrics").text
+
+        self.assertIn(
+            'http_requests_total{method="GET",route="/products/{product_id}",status="404"} 2',
+            body,
+        )
+        self.assertIn(
+            'http_request_duration_seconds_count{method="GET",route="/products"} 1', body
+        )
+        self.assertNotIn("/products/101", body)
+
+    def test_sql_statements_are_attributed_to_the_route(self):
+        self.client.get("/products")
+
+        body = self.client.get("/metrics").text
+
+        # One count(*) plus one page query; eager loads are skipped for an empty page.
+        self.assertIn('db_statements_total{method="GET",route="/products"} 2', body)
+        self.assertIn('http_request_db_statements_bucket{method="GET",route="/products",le="2"} 1', body)
+
+    def test_slow_query_recorder_captures_method_and_plan(self):
+        recorder_engine = create_engine(str(engine.url))
+        recorder = SlowQueryRecorder(threshold_ms=0, capacity=5, explain_top=2)
+        recorder.install(recorder_engine)
+        try:
+            with Session(recorder_engine) as db:
+                ProductRepository(db).list(
+                    page=1,
+                    page_size=10,
+                    keyword="lamp",
+                    category=None,
+                    sort="latest",
+                    include_blinded=False,
+                )
+            recorder._explainer.shutdown(wait=True)
+        finally:
+            recorder_engine.dispose()
+
+        entries = recorder.snapshot()
+        self.assertTrue(entries)
+        self.assertTrue(all(entry["method"] == "ProductRepository.list" for entry in entries))
+        explained = [entry for entry in entries if entry["plan"]]
+        self.assertTrue(explained)
+        self.assertTrue(any("products" in line for entry in explained for line in entry["plan"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
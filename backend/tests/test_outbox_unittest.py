@@ -0,0 +1,168 @@
+import os
+import unittest
+from datetime import timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, engine
+from app.main import app
+from app.models import ProductEvent, User
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.errors import ServiceError
+from app.services.outbox_service import OutboxPoller
+from app.services.product_service import ProductService
+from app.services.purchase_service import PurchaseService
+
+
+class OutboxTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        self.db = SessionLocal()
+        seller = User(email="seller@example.com", nickname="seller", password_hash="x")
+        buyer = User(email="buyer@example.com", nickname="buyer", password_hash="x")
+        self.db.add_all([seller, buyer])
+        self.db.commit()
+        self.seller_id = seller.id
+        self.buyer_id = buyer.id
+
+    def tearDown(self):
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def create_product(self, title: str) -> int:
+        return (
+            ProductService(self.db)
+            .create(
+                self.seller_id,
+                ProductCreate(
+                    title=title, price=1000, description=title, category="books", condition="used"
+                ),
+            )
+            .id
+        )
+
+    def events(self) -> list[tuple[int, str]]:
+        return [
+            (event.product_id, event.event_type)
+            for event in self.db.scalars(select(ProductEvent).order_by(ProductEvent.id))
+        ]
+
+    def test_events_are_written_with_the_change(self):
+        first = self.create_product("Novel")
+        second = self.create_product("Atlas")
+        service = ProductService(self.db)
+        service.update(self.seller_id, first, ProductUpdate(price=900))
+        service.blind(second, "spam")
+        with self.assertRaises(ServiceError):
+            service.update(self.buyer_id, first, ProductUpdate(price=1))
+        PurchaseService(self.db).buy_now(self.buyer_id, first)
+        with self.assertRaises(ServiceError):
+            PurchaseService(self.db).buy_now(self.buyer_id, first)
+        self.db.rollback()
+        service.unblind(second)
+        service.delete(self.seller_id, second)
+
+        self.assertEqual(
+            self.events(),
+            [
+                (first, "created"),
+                (second, "created"),
+                (first, "updated"),
+                (second, "blinded"),
+                (first, "sold"),
+                (second, "unblinded"),
+                (second, "deleted"),
+            ],
+        )
+
+    def test_poller_applies_batches_and_revisits_gaps(self):
+        poller = OutboxPoller(SessionLocal, interval=60, batch_size=2, retention=timedelta(days=1))
+        batches = []
+        poller.register(lambda events: batches.append([event.product_id for event in events]))
+
+        for product_id in (1, 2, 3):
+            self.db.add(ProductEvent(id=product_id, product_id=product_id, event_type="updated"))
+        # Id 4 is still in flight in another transaction when the poller runs.
+        self.db.add(ProductEvent(id=5, product_id=5, event_type="updated"))
+        self.db.commit()
+
+        self.assertEqual(poller.poll(), 4)
+        self.assertEqual(batches, [[1, 2], [3, 5]])
+        self.assertEqual(poller.last_id, 5)
+
+        self.db.add(ProductEvent(id=4, product_id=4, event_type="sold"))
+        self.db.commit()
+        self.assertEqual(poller.poll(), 1)
+        self.assertEqual(batches[-1], [4])
+        self.assertEqual(poller.poll(), 0)
+
+    def test_delta_sync_returns_changed_products_and_tombstones(self):
+        client = TestClient(app)
+        previous_settle = settings.changes_settle_seconds
+        settings.changes_settle_seconds = 0
+        try:
+            start = client.get("/products/changes").json()
+            kept = self.create_product("Kept")
+            blinded = self.create_product("Blinded")
+            removed = self.create_product("Removed")
+            service = ProductService(self.db)
+            service.update(self.seller_id, kept, ProductUpdate(price=800))
+            service.blind(blinded, "spam")
+            service.delete(self.seller_id, removed)
+
+            first = client.get("/products/changes", params={"since": start["cursor"], "limit": 4}).json()
+            rest = client.get("/products/changes", params={"since": first["cursor"]}).json()
+            idle = client.get("/products/changes", params={"since": rest["cursor"]}).json()
+
+            self.db.execute(delete(ProductEvent).where(ProductEvent.id <= first["cursor"]))
+            self.db.commit()
+            expired = client.get("/products/changes", params={"since": start["cursor"]})
+        finally:
+            settings.changes_settle_seconds = previous_settle
+
+        self.assertEqual(start, {"cursor": 0, "has_more": False, "items": [], "deleted_ids": []})
+        self.assertTrue(first["has_more"])
+        self.assertEqual([item["id"] for item in first["items"]], [kept])
+        self.assertEqual(first["items"][0]["price"], 800)
+        self.assertEqual(first["deleted_ids"], [blinded, removed])
+        self.assertFalse(rest["has_more"])
+        self.assertEqual(rest["deleted_ids"], [blinded, removed])
+        self.assertEqual(idle["items"] + idle["deleted_ids"], [])
+        self.assertEqual(idle["cursor"], rest["cursor"])
+        self.assertEqual(expired.status_code, 410)
+
+    def test_pruning_keeps_the_cursor_high_water_mark(self):
+        client = TestClient(app)
+        start = client.get("/products/changes").json()
+        for title in ("First", "Second", "Third"):
+            self.create_product(title)
+        cursor = client.get("/products/changes").json()["cursor"]
+
+        poller = OutboxPoller(SessionLocal, interval=1, batch_size=10, retention=timedelta(0))
+        poller._prune()
+        self.assertEqual(self.db.scalars(select(ProductEvent.id)).all(), [cursor])
+
+        self.assertEqual(client.get("/products/changes", params={"since": start["cursor"]}).status_code, 410)
+        self.assertEqual(client.get("/products/changes", params={"since": cursor + 5}).status_code, 410)
+        current = client.get("/products/changes", params={"since": cursor})
+        self.assertEqual(current.status_code, 200)
+        self.assertEqual(current.json()["cursor"], cursor)
+
+        self.create_product("Fourth")
+        self.assertGreater(self.db.scalar(select(ProductEvent.id).order_by(ProductEvent.id.desc())), cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.database import Base, SessionLocal, engine
+from app.main import app
+from app.models import Product, ProductViewCount, User
+from app.schemas.product import ProductCreate
+from app.services.popularity_service import PopularityRanker, hour_start, view_counter
+from app.services.product_service import ProductService
+
+
+class PopularityTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        view_counter.flush()
+        self.db = SessionLocal()
+        seller = User(email="seller@example.com", nickname="seller", password_hash="x")
+        self.db.add(seller)
+        self.db.commit()
+        self.product_ids = [
+            ProductService(self.db)
+            .create(
+                seller.id,
+                ProductCreate(
+                    title=f"Item {index}", price=1000, description="desc", category="etc", condition="used"
+                ),
+            )
+            .id
+            for index in range(3)
+        ]
+        self.ranker = PopularityRanker(
+            SessionLocal, half_life=timedelta(hours=24), window=timedelta(days=7), interval=300
+        )
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def popular(self) -> list[int]:
+        items = self.client.get("/products", params={"sort": "popular"}).json()["items"]
+        return [item["id"] for item in items]
+
+    def test_views_are_buffered_and_ranked(self):
+        first, second, third = self.product_ids
+        for product_id in [first, second, second, second]:
+            self.assertEqual(self.client.get(f"/products/{product_id}").status_code, 200)
+        self.assertEqual(self.db.scalars(select(ProductViewCount)).all(), [])
+        self.assertEqual(view_counter.flush(), 2)
+        self.assertEqual(
+            self.db.scalar(select(ProductViewCount.views).where(ProductViewCount.product_id == second)), 3
+        )
+
+        updated_at = self.db.get(Product, first).updated_at
+        self.assertEqual(self.ranker.run(), 2)
+        self.assertEqual(self.popular(), [second, first, third])
+        self.db.expire_all()
+        self.assertEqual(self.db.get(Product, first).updated_at, updated_at)
+
+    def test_refused_views_are_not_counted(self):
+        first = self.product_ids[0]
+        self.db.get(Product, first).is_blinded = True
+        self.db.commit()
+        self.assertEqual(self.client.get(f"/products/{first}").status_code, 403)
+        self.assertEqual(self.client.get("/products/999999").status_code, 404)
+        self.assertEqual(view_counter.pending(first), 0)
+
+    def test_old_views_decay_and_age_out(self):
+        first, second, _ = self.product_ids
+        now = hour_start(datetime.utcnow())
+        self.db.add_all(
+            [
+                ProductViewCount(product_id=first, hour=now - timedelta(hours=48), views=6),
+                ProductViewCount(product_id=second, hour=now, views=2),
+            ]
+        )
+        self.db.commit()
+        self.ranker.run(now)
+        self.db.expire_all()
+        self.assertAlmostEqual(self.db.get(Product, first).popularity_score, 1.5)
+        self.assertEqual(self.popular()[0], second)
+
+        later = now + timedelta(days=8)
+        self.assertEqual(self.ranker.run(later), 2)
+        self.db.expire_all()
+        self.assertEqual(self.db.scalars(select(Product.popularity_score)).all(), [0.0, 0.0, 0.0])
+        self.assertEqual(self.db.scalars(select(ProductViewCount)).all(), [])
+
+    def test_popular_sort_reads_the_index_in_order(self):
+        stmt = (
+            select(Product)
+            .order_by(Product.popularity_score.desc(), Product.created_at.desc())
+            .limit(10)
+        )
+        compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+        plan = self.db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+        self.assertTrue(any("ix_products_popularity" in row[-1] for row in plan), plan)
+        self.assertFalse(any("TEMP B-TREE" in row[-1] for row in plan), plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import unittest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.quantile_sketch import LogHistogram
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Product, ProductCategory, ProductCondition, User, UserRole
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.price_anomaly_service import PriceStats, price_anomaly_job, price_stats, robust_scores
+from app.services.product_service import ProductService
+
+
+class PriceAnomalyTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        self.min_samples = price_stats.min_samples
+        price_stats.min_samples = 20
+        price_stats.reset(np.array([], dtype=np.int64), np.array([]))
+        self.db = SessionLocal()
+        admin = User(email="admin@example.com", nickname="admin", password_hash="x", role=UserRole.ADMIN)
+        seller = User(email="seller@example.com", nickname="seller", password_hash="x")
+        self.db.add_all([admin, seller])
+        self.db.commit()
+        self.admin = {"Authorization": f"Bearer {create_access_token(str(admin.id))}"}
+        self.seller_id = seller.id
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        price_stats.min_samples = self.min_samples
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def create(self, price: int, category: str = "electronics") -> Product:
+        payload = ProductCreate(title="Phone", price=price, description="desc", category=category, condition="used")
+        return ProductService(self.db).create(self.seller_id, payload)
+
+    def test_vectorized_scores_match_per_group_statistics(self):
+        rng = np.random.default_rng(3)
+        groups = rng.integers(0, 4, size=2000)
+        log_prices = rng.normal(10 + groups, 0.5)
+        reference = rng.random(2000) > 0.1
+        scores = robust_scores(groups, log_prices, reference, group_count=5, min_samples=10, min_mad=0.01)
+
+        for group in range(4):
+            values = log_prices[reference & (groups == group)]
+            median = np.median(values)
+            mad = np.median(np.abs(values - median))
+            expected = 0.6745 * (log_prices[groups == group] - median) / mad
+            np.testing.assert_allclose(scores[groups == group], expected)
+
+        histogram = LogHistogram()
+        histogram.reset(log_prices[groups == 0])
+        median, mad = histogram.summary()
+        self.assertAlmostEqual(median, np.median(log_prices[groups == 0]), delta=histogram.bin_width)
+        self.assertAlmostEqual(mad, 0.6745 * 0.5, delta=0.05)
+
+        stats = PriceStats(min_samples=10)
+        self.assertIsNone(stats.score(ProductCategory.ELECTRONICS, ProductCondition.USED, 1000))
+
+    def test_underpriced_listing_is_scored_on_create_and_surfaced_to_admins(self):
+        market = [self.create(price).id for price in range(95_000, 105_000, 400)]
+        self.assertIsNone(self.db.get(Product, market[0]).price_anomaly_score)
+        price_anomaly_job.run()
+        self.db.expire_all()
+        self.assertNotIn(None, [self.db.get(Product, product_id).price_anomaly_score for product_id in market])
+        self.assertEqual(price_anomaly_job.run(), 0)
+
+        scam = self.create(9_000)
+        fair = self.create(99_000)
+        self.assertLess(scam.price_anomaly_score, -3.5)
+        self.assertLess(abs(fair.price_anomaly_score), 1)
+        # Too few book listings to know the going price.
+        self.assertIsNone(self.create(9_000, category="books").price_anomaly_score)
+
+        items = self.client.get("/admin/products?suspicious=true", headers=self.admin).json()["items"]
+        self.assertEqual([item["id"] for item in items], [scam.id])
+
+        ProductService(self.db).update(self.seller_id, scam.id, ProductUpdate(price=98_000))
+        self.db.expire_all()
+        self.assertLess(abs(self.db.get(Product, scam.id).price_anomaly_score), 1)
+        self.assertEqual(self.client.get("/admin/products?suspicious=true", headers=self.admin).json()["items"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import threading
+import unittest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.pubsub import ProductChange, ProductChangeBroker, broker
+from app.main import app
+from app.models import User
+from app.schemas.product import ProductCreate
+from app.services.product_service import ProductService
+from app.services.purchase_service import PurchaseService
+
+
+class ProductChangeBrokerTest(unittest.TestCase):
+    def test_thousands_of_idle_subscribers_only_wake_matching_ones(self):
+        local_broker = ProductChangeBroker(max_pending=4)
+
+        async def scenario():
+            subscriptions = [local_broker.subscribe([index % 1000, 5000 + index]) for index in range(5000)]
+            publisher = threading.Thread(
+                target=local_broker.publish, args=(ProductChange(product_id=7, event="sold", status="sold"),)
+            )
+            publisher.start()
+            publisher.join()
+            await asyncio.sleep(0.01)
+
+            woken = [subscription for subscription in subscriptions if not subscription.queue.empty()]
+            delivered = woken[0].queue.get_nowait() if woken else None
+            for subscription in subscriptions:
+                local_broker.unsubscribe(subscription)
+            return len(woken), delivered
+
+        woken, delivered = asyncio.run(scenario())
+        self.assertEqual(woken, 5)
+        self.assertEqual(delivered.status, "sold")
+        self.assertEqual(local_broker.subscriber_count(7), 0)
+        self.assertEqual(local_broker._by_product, {})
+
+    def test_slow_subscriber_is_marked_for_resync(self):
+        local_broker = ProductChangeBroker(max_pending=2)
+
+        async def scenario():
+            subscription = local_broker.subscribe([1])
+            for price in range(5):
+                local_broker.publish(ProductChange(product_id=1, event="updated", price=price + 1))
+            await asyncio.sleep(0.01)
+            return subscription
+
+        subscription = asyncio.run(scenario())
+        self.assertTrue(subscription.overflowed)
+        self.assertEqual(subscription.queue.qsize(), 2)
+
+    def test_change_round_trips_through_json(self):
+        change = ProductChange(product_id=3, event="blinded", status="on_sale", price=100, is_blinded=True)
+        self.assertEqual(ProductChange.from_json(change.to_json()), change)
+
+
+class ProductChangePublishTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        self.db = SessionLocal()
+        seller = User(email="seller@example.com", nickname="seller", password_hash="x")
+        buyer = User(email="buyer@example.com", nickname="buyer", password_hash="x")
+        self.db.add_all([seller, buyer])
+        self.db.commit()
+        self.seller_id = seller.id
+        self.buyer_id = buyer.id
+
+    def tearDown(self):
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def test_services_publish_after_commit(self):
+        product = ProductService(self.db).create(
+            self.seller_id,
+            ProductCreate(
+                title="Desk lamp",
+                price=12000,
+                description="Warm light",
+                category="home",
+                condition="used",
+            ),
+        )
+        product_id = product.id
+
+        def write():
+            db = SessionLocal()
+            try:
+                ProductService(db).blind(product_id, "spam")
+                ProductService(db).unblind(product_id)
+                PurchaseService(db).buy_now(self.buyer_id, product_id)
+            finally:
+                db.close()
+
+        async def scenario():
+            subscription = broker.subscribe([product_id])
+            try:
+                await asyncio.to_thread(write)
+                return [await asyncio.wait_for(subscription.queue.get(), 1) for _ in range(3)]
+            finally:
+                broker.unsubscribe(subscription)
+
+        changes = asyncio.run(scenario())
+        self.assertEqual([change.event for change in changes], ["blinded", "unblinded", "sold"])
+        self.assertTrue(changes[0].is_blinded)
+        self.assertEqual(changes[2].status, "sold")
+
+    def test_stream_rejects_invalid_ids(self):
+        client = TestClient(app)
+        self.assertEqual(client.get("/products/stream", params={"ids": "1,x"}).status_code, 400)
+        too_many = ",".join(str(index) for index in range(1, 200))
+        self.assertEqual(client.get("/products/stream", params={"ids": too_many}).status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
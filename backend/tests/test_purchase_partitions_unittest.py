@@ -0,0 +1,92 @@
+import os
+import unittest
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Purchase, User
+from app.repositories.partition_repository import month_partition_ddl, month_partition_name
+from app.schemas.product import ProductCreate
+from app.services.partition_service import add_months, month_start
+from app.services.product_service import ProductService
+from app.services.purchase_service import PurchaseService
+
+
+class PurchasePartitionTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        self.db = SessionLocal()
+        seller = User(email="seller@example.com", nickname="seller", password_hash="x")
+        buyer = User(email="buyer@example.com", nickname="buyer", password_hash="x")
+        self.db.add_all([seller, buyer])
+        self.db.commit()
+        self.seller_id = seller.id
+        self.buyer_id = buyer.id
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def test_month_partitions_roll_over_year_end(self):
+        month = month_start(datetime(2025, 11, 17, 8, 30))
+        self.assertEqual(month, datetime(2025, 11, 1))
+        self.assertEqual(
+            [add_months(month, offset) for offset in range(3)],
+            [datetime(2025, 11, 1), datetime(2025, 12, 1), datetime(2026, 1, 1)],
+        )
+        self.assertEqual(add_months(datetime(2026, 1, 1), -1), datetime(2025, 12, 1))
+        self.assertEqual(month_partition_name("purchases", month), "purchases_y2025m11")
+        self.assertEqual(
+            month_partition_ddl("purchases", datetime(2025, 12, 1), datetime(2026, 1, 1)),
+            "CREATE TABLE IF NOT EXISTS purchases_y2025m12 PARTITION OF purchases "
+            "FOR VALUES FROM ('2025-12-01') TO ('2026-01-01')",
+        )
+
+    def test_history_can_be_bounded_by_purchase_date(self):
+        purchase_dates = [datetime(2025, 1, 10), datetime(2025, 2, 10), datetime(2025, 3, 10)]
+        for index, purchased_at in enumerate(purchase_dates):
+            product = ProductService(self.db).create(
+                self.seller_id,
+                ProductCreate(
+                    title=f"Item {index}", price=1000, description="desc", category="etc", condition="used"
+                ),
+            )
+            purchase = PurchaseService(self.db).buy_now(self.buyer_id, product.id)
+            self.db.execute(
+                update(Purchase).where(Purchase.id == purchase.id).values(purchased_at=purchased_at)
+            )
+        self.db.commit()
+
+        def titles(path: str, user_id: int, **params) -> list[str]:
+            headers = {"Authorization": f"Bearer {create_access_token(str(user_id))}"}
+            body = self.client.get(path, params=params, headers=headers).json()
+            return [item["product_title"] for item in body["purchases"]]
+
+        self.assertEqual(titles("/purchases/me", self.buyer_id), ["Item 2", "Item 1", "Item 0"])
+        self.assertEqual(
+            titles("/purchases/me", self.buyer_id, since="2025-02-01T00:00:00", until="2025-03-01T00:00:00"),
+            ["Item 1"],
+        )
+        self.assertEqual(
+            titles("/purchases/sales/me", self.seller_id, since="2025-02-10T09:00:00+09:00"),
+            ["Item 2", "Item 1"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
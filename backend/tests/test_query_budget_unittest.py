@@ -0,0 +1,207 @@
+import os
+import unittest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token, hash_password
+from app.main import app
+from app.models import CartItem, SellerStats, User, UserRole
+from app.routers.products import to_detail, to_summary
+from app.schemas.cart import CartItemCreate, CartItemUpdate
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.cart_service import CartService
+from app.services.product_service import ProductService
+from app.services.purchase_service import PurchaseService
+from tests.query_budget import QueryBudgetMixin
+
+
+class QueryBudgetTest(QueryBudgetMixin, unittest.TestCase):
+    engine = engine
+
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        self.db = SessionLocal()
+        password_hash = hash_password("Password123!")
+        self.admin = User(
+            email="admin@example.com",
+            nickname="admin",
+            password_hash=password_hash,
+            role=UserRole.ADMIN,
+        )
+        self.buyer = User(email="buyer@example.com", nickname="buyer", password_hash=password_hash)
+        self.sellers = [
+            User(email=f"seller{i}@example.com", nickname=f"seller{i}", password_hash=password_hash)
+            for i in range(5)
+        ]
+        self.db.add_all([self.admin, self.buyer, *self.sellers])
+        self.db.commit()
+        # Signup creates the seller_stats row, so listing writes only ever increment it.
+        self.db.add_all([SellerStats(seller_id=seller.id) for seller in self.sellers])
+        self.db.commit()
+        # Plain ids so that expired instances never add refresh queries to a measured block.
+        self.admin_id = self.admin.id
+        self.buyer_id = self.buyer.id
+        self.seller_ids = [seller.id for seller in self.sellers]
+
+    def tearDown(self):
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def payload(self, index: int) -> ProductCreate:
+        return ProductCreate(
+            title=f"Item {index}",
+            price=1000 + index,
+            description=f"Item {index} description",
+            category="electronics",
+            condition="used",
+            image_urls=[f"https://example.com/{index}/a.jpg", f"https://example.com/{index}/b.jpg"],
+        )
+
+    def seed_products(self, count: int) -> list[int]:
+        service = ProductService(self.db)
+        return [
+            service.create(self.seller_ids[index % len(self.seller_ids)], self.payload(index)).id
+            for index in range(count)
+        ]
+
+    def fill_cart(self, product_ids: list[int]) -> None:
+        for product_id in product_ids:
+            self.db.add(CartItem(user_id=self.buyer_id, product_id=product_id, quantity=1))
+        self.db.commit()
+
+    def auth(self, user_id: int) -> dict[str, str]:
+        return {"Authorization": f"Bearer {create_access_token(str(user_id))}"}
+
+    def test_product_service_budgets(self):
+        service = ProductService(self.db)
+        seller_id = self.seller_ids[0]
+
+        # Duplicate detection adds the LSH candidate lookup and the signature/band inserts.
+        with self.assertMaxQueries(14, "ProductService.create"):
+            product = service.create(seller_id, self.payload(0))
+            to_detail(product)
+        product_id = product.id
+        self.seed_products(20)
+
+        for page_size in (1, 20):
+            self.db.expire_all()
+            with self.assertMaxQueries(4, f"ProductService.list page_size={page_size}"):
+                _, items = service.list(
+                    page=1,
+                    page_size=page_size,
+                    keyword=None,
+                    category=None,
+                    sort="latest",
+                    include_blinded=False,
+                )
+                [to_summary(item) for item in items]
+
+        self.db.expire_all()
+        with self.assertMaxQueries(3, "ProductService.get"):
+            to_detail(service.get(product_id))
+
+        with self.assertMaxQueries(11, "ProductService.update"):
+            to_detail(service.update(seller_id, product_id, ProductUpdate(price=500, image_urls=[])))
+
+        with self.assertMaxQueries(9, "ProductService.blind"):
+            to_detail(service.blind(product_id, "spam"))
+
+        with self.assertMaxQueries(9, "ProductService.unblind"):
+            to_detail(service.unblind(product_id))
+
+        # Deleting also clears every row keyed by the product (delete_dependents).
+        with self.assertMaxQueries(15, "ProductService.delete"):
+            service.delete(seller_id, product_id)
+
+    def test_cart_service_budgets(self):
+        product_ids = self.seed_products(20)
+        service = CartService(self.db)
+
+        with self.assertMaxQueries(9, "CartService.add"):
+            item = service.add(self.buyer_id, CartItemCreate(product_id=product_ids[0], quantity=1))
+        item_id = item.id
+        self.fill_cart(product_ids[1:])
+
+        self.db.expire_all()
+        with self.assertMaxQueries(2, "CartService.list"):
+            for cart_item in service.list(self.buyer_id):
+                cart_item.product.title
+
+        with self.assertMaxQueries(6, "CartService.update"):
+            service.update(self.buyer_id, item_id, CartItemUpdate(selected=False))
+
+        with self.assertMaxQueries(3, "CartService.delete"):
+            service.delete(self.buyer_id, item_id)
+
+    def test_purchase_service_budgets(self):
+        product_ids = self.seed_products(21)
+        service = PurchaseService(self.db)
+
+        with self.assertMaxQueries(9, "PurchaseService.buy_now"):
+            service.buy_now(self.buyer_id, product_ids[0])
+
+        # Checkout issues a conditional UPDATE and an INSERT per item, plus one
+        # seller_stats UPDATE per seller, so its budget is linear in the cart size.
+        for items in (1, 19):
+            self.fill_cart(product_ids[1 : 1 + items] if items == 1 else product_ids[2:])
+            with self.assertMaxQueries(3 + 8 * items, f"buy_selected_cart_items x{items}"):
+                service.buy_selected_cart_items(self.buyer_id)
+
+        self.db.expire_all()
+        with self.assertMaxQueries(2, "PurchaseService.my_purchases"):
+            for purchase in service.my_purchases(self.buyer_id):
+                purchase.product.title
+
+        with self.assertMaxQueries(2, "PurchaseService.my_sales"):
+            for purchase in service.my_sales(self.seller_ids[0]):
+                purchase.product.title
+
+    def measure_list_endpoints(self, page_size: int) -> dict[str, int]:
+        client = TestClient(app)
+        budgets = {
+            f"/products?page_size={page_size}": (4, None),
+            f"/products?page_size={page_size}&keyword=Item": (4, None),
+            "/admin/products": (5, self.admin_id),
+            "/cart": (3, self.buyer_id),
+            "/purchases/me": (3, self.buyer_id),
+            "/purchases/sales/me": (3, self.seller_ids[0]),
+        }
+        counts = {}
+        for path, (limit, user_id) in budgets.items():
+            headers = self.auth(user_id) if user_id else None
+            with self.assertMaxQueries(limit, path) as counter:
+                response = client.get(path, headers=headers)
+            self.assertEqual(response.status_code, 200, path)
+            counts[path.replace(f"page_size={page_size}", "page_size=N")] = counter.count
+        return counts
+
+    def test_list_endpoints_do_not_grow_with_n(self):
+        purchase_service = PurchaseService(self.db)
+        product_ids = self.seed_products(2)
+        self.fill_cart(product_ids[1:])
+        purchase_service.buy_now(self.buyer_id, product_ids[0])
+        single = self.measure_list_endpoints(page_size=1)
+
+        # Spread 50 listings, cart items and purchases across every seller.
+        product_ids = self.seed_products(110)
+        self.fill_cart(product_ids[:50])
+        for product_id in product_ids[50:]:
+            purchase_service.buy_now(self.buyer_id, product_id)
+        many = self.measure_list_endpoints(page_size=50)
+
+        self.assertEqual(single, many)
+
+
+if __name__ == "__main__":
+    unittest.main()
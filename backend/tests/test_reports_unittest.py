@@ -0,0 +1,121 @@
+import os
+import unittest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Product, ProductEvent, ProductReportStats, SellerStats, User, UserRole
+from app.schemas.product import ProductCreate
+from app.services.product_service import ProductService
+
+
+class ProductReportTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        self.threshold = settings.report_auto_blind_threshold
+        settings.report_auto_blind_threshold = 3
+        self.db = SessionLocal()
+        admin = User(email="admin@example.com", nickname="admin", password_hash="x", role=UserRole.ADMIN)
+        seller = User(email="seller@example.com", nickname="seller", password_hash="x")
+        reporters = [
+            User(email=f"reporter{index}@example.com", nickname=f"reporter{index}", password_hash="x")
+            for index in range(3)
+        ]
+        self.db.add_all([admin, seller, *reporters])
+        self.db.commit()
+        self.admin = {"Authorization": f"Bearer {create_access_token(str(admin.id))}"}
+        self.seller_id = seller.id
+        self.reporter_ids = [reporter.id for reporter in reporters]
+        self.scam, self.odd = [
+            ProductService(self.db)
+            .create(
+                seller.id,
+                ProductCreate(title=title, price=100, description="desc", category="etc", condition="new"),
+            )
+            .id
+            for title in ("Too good to be true", "Odd listing")
+        ]
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        settings.report_auto_blind_threshold = self.threshold
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def report(self, user_id: int, product_id: int, reason: str = "scam"):
+        headers = {"Authorization": f"Bearer {create_access_token(str(user_id))}"}
+        return self.client.post(f"/products/{product_id}/reports", json={"reason": reason}, headers=headers)
+
+    def queue(self) -> list[tuple[int, int]]:
+        items = self.client.get("/admin/reports", headers=self.admin).json()["items"]
+        return [(item["product_id"], item["report_count"]) for item in items]
+
+    def test_reports_rank_the_queue_and_auto_blind_at_threshold(self):
+        first, second, third = self.reporter_ids
+        self.assertEqual(self.report(first, self.scam).json()["report_count"], 1)
+        self.assertEqual(self.report(first, self.scam).json()["report_count"], 1)
+        self.assertEqual(self.report(second, self.scam, "fake photos").json()["report_count"], 2)
+        self.assertEqual(self.report(first, self.odd).json()["report_count"], 1)
+        self.assertEqual(self.report(self.seller_id, self.odd).status_code, 400)
+        self.assertEqual(self.report(first, 9999).status_code, 404)
+
+        self.assertEqual(self.queue(), [(self.scam, 2), (self.odd, 1)])
+        top = self.client.get("/admin/reports", headers=self.admin).json()["items"][0]
+        self.assertEqual(top["recent_reasons"], ["fake photos", "scam"])
+
+        crossed = self.report(third, self.scam).json()
+        self.assertEqual((crossed["report_count"], crossed["is_blinded"]), (3, True))
+        self.db.expire_all()
+        self.assertTrue(self.db.get(Product, self.scam).is_blinded)
+        self.assertEqual(self.db.get(SellerStats, self.seller_id).active_count, 1)
+        events = self.db.scalars(select(ProductEvent.event_type).where(ProductEvent.product_id == self.scam))
+        self.assertIn("blinded", list(events))
+        self.assertEqual(self.queue(), [(self.odd, 1)])
+
+        self.assertEqual(self.client.delete(f"/admin/reports/{self.odd}", headers=self.admin).status_code, 200)
+        self.assertEqual(self.queue(), [])
+        self.assertEqual(self.client.delete(f"/admin/reports/{self.odd}", headers=self.admin).status_code, 404)
+        self.assertEqual(self.report(first, self.odd).json()["report_count"], 1)
+
+    def test_reports_do_not_outlive_a_deleted_listing(self):
+        first, second, _ = self.reporter_ids
+        self.report(first, self.odd, "spam")
+        self.report(second, self.odd, "spam")
+        ProductService(self.db).delete(self.seller_id, self.odd)
+
+        # SQLite hands the deleted id out again.
+        lamp = ProductService(self.db).create(
+            self.seller_id, ProductCreate(title="Lamp", price=100, description="desc", category="etc", condition="new")
+        )
+        self.assertEqual(lamp.id, self.odd)
+        self.assertEqual(self.queue(), [])
+        self.assertEqual(self.report(first, lamp.id).json()["report_count"], 1)
+
+    def test_queue_reads_the_priority_index(self):
+        stmt = (
+            select(ProductReportStats)
+            .order_by(ProductReportStats.report_count.desc(), ProductReportStats.last_reported_at.desc())
+            .limit(20)
+        )
+        compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+        plan = self.db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+        self.assertTrue(any("ix_report_stats_priority" in row[-1] for row in plan), plan)
+        self.assertFalse(any("TEMP B-TREE" in row[-1] for row in plan), plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import os
 import unittest
 from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from types import SimpleNamespace
 
 from pydantic import ValidationError
@@ -26,6 +27,7 @@ from app.services.cart_service import CartService
 from app.services.errors import ServiceError
 from app.services.product_service import ProductService
 from app.services.purchase_service import PurchaseService
+from app.services.reservation_service import ReservationService, reservation_sweeper
 
 
 class RequirementsServiceTest(unittest.TestCase):
@@ -325,6 +327,38 @@ class RequirementsServiceTest(unittest.TestCase):
         finally:
             verify_db.close()
 
+    def test_reservation_hold_checkout_and_expiry(self):
+        seller = self.signup_and_login("seller9@example.com", "seller9", "Password123!")
+        holder = self.signup_and_login("buyer9a@example.com", "buyer9a", "Password123!")
+        other = self.signup_and_login("buyer9b@example.com", "buyer9b", "Password123!")
+
+        held = self.create_product(seller.id, "Flash Sale Item", 10000)
+        expiring = self.create_product(seller.id, "Expiring Hold", 20000)
+        reservations = ReservationService(self.db)
+
+        held_until = reservations.reserve(holder.id, held.id)
+        # Reserving again keeps the original expiry instead of extending the hold.
+        self.assertEqual(reservations.reserve(holder.id, held.id), held_until)
+        self.db.expire_all()
+        self.assertEqual(self.db.get(Product, held.id).reserved_until, held_until)
+        with self.assertRaises(ServiceError) as ctx:
+            reservations.reserve(other.id, held.id)
+        self.assertEqual(ctx.exception.status_code, 409)
+        with self.assertRaises(ServiceError):
+            PurchaseService(self.db).buy_now(other.id, held.id)
+        purchase = PurchaseService(self.db).buy_now(holder.id, held.id)
+        self.assertEqual(purchase.product_id, held.id)
+
+        until = reservations.reserve(holder.id, expiring.id)
+        self.db.expire_all()
+        self.assertEqual(self.db.get(Product, expiring.id).status, ProductStatus.RESERVED)
+        reservation_sweeper.sweep(now=until + timedelta(seconds=1))
+        self.db.expire_all()
+        released = self.db.get(Product, expiring.id)
+        self.assertEqual(released.status, ProductStatus.ON_SALE)
+        self.assertIsNone(released.reserved_by_id)
+        PurchaseService(self.db).buy_now(other.id, expiring.id)
+
 
 if __name__ == "__main__":
     unittest.main()
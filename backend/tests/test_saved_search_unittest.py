@@ -0,0 +1,199 @@
+import os
+import unittest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Notification, ProductCategory, User
+from app.schemas.product import ProductCreate
+from app.services.product_service import ProductService
+from app.services.saved_search_service import ListingSnapshot, SavedSearchIndex, saved_search_alerts
+
+
+def listing(title: str, category=ProductCategory.HOME, price: int = 10000, seller_id: int = 99):
+    return ListingSnapshot(1, seller_id, title, f"{title} in good shape", category, price)
+
+
+class SavedSearchIndexTest(unittest.TestCase):
+    def test_matches_keyword_substrings_and_filters(self):
+        index = SavedSearchIndex()
+        index.add(1, 10, "desk lamp", None, None, None)
+        index.add(2, 11, "Lamp", ProductCategory.BOOKS, None, None)
+        index.add(3, 12, "lamp", None, 5000, 20000)
+        index.add(4, 13, "lamp", None, None, 5000)
+        index.add(5, 14, None, ProductCategory.HOME, None, None)
+        index.add(6, 99, "lamp", None, None, None)
+        index.add(7, 15, "램프", None, None, None)
+        index.add(8, 16, "sofa", None, None, None)
+
+        self.assertEqual(sorted(index.match(listing("Vintage DESK LAMPS"))), [1, 3, 5])
+        self.assertEqual(sorted(index.match(listing("무드 램프를 팝니다", seller_id=1))), [5, 7])
+        self.assertEqual(index.match(listing("Poster", category=ProductCategory.ETC)), [])
+
+        index.add(9, 17, "phone", None, None, None)
+        index.add(10, 18, "자전거", None, None, None)
+        index.add(11, 19, "s2_ ultra", None, None, None)
+        index.add(12, 20, "100%", None, None, None)
+        self.assertEqual(index.match(listing("Apple iPhone 13", category=ProductCategory.ETC)), [9])
+        self.assertEqual(index.match(listing("중고자전거 팝니다", category=ProductCategory.ETC)), [10])
+        self.assertEqual(index.match(listing("Galaxy S24 Ultra", category=ProductCategory.ETC)), [11])
+
+        self.assertTrue(index.remove(9))
+        self.assertFalse(index.remove(9))
+        self.assertEqual(index.match(listing("Apple iPhone 13", category=ProductCategory.ETC)), [])
+        self.assertEqual(len(index), 11)
+        self.assertEqual(sorted(index.compacted().match(listing("Vintage DESK LAMPS"))), [1, 3, 5])
+
+    def test_candidates_ignore_unrelated_searches(self):
+        index = SavedSearchIndex()
+        for search_id in range(1, 20001):
+            index.add(search_id, search_id, f"word{search_id}", None, None, None)
+        index.add(20001, 1, "bicycle", None, None, None)
+
+        self.assertEqual(len(index.candidates(listing("Road bicycle"))), 1)
+
+
+class SavedSearchAlertTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        saved_search_alerts.index = SavedSearchIndex()
+        saved_search_alerts.drain()
+        self.db = SessionLocal()
+        users = [
+            User(email=f"user{index}@example.com", nickname=f"user{index}", password_hash="x")
+            for index in range(3)
+        ]
+        self.db.add_all(users)
+        self.db.commit()
+        self.seller_id, self.first_id, self.second_id = [user.id for user in users]
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def auth(self, user_id: int) -> dict[str, str]:
+        return {"Authorization": f"Bearer {create_access_token(str(user_id))}"}
+
+    def test_new_listing_is_delivered_to_matching_inboxes(self):
+        first = self.auth(self.first_id)
+        second = self.auth(self.second_id)
+        self.client.post("/saved-searches", json={"keyword": "bike"}, headers=first)
+        self.client.post(
+            "/saved-searches", json={"keyword": "road bike", "max_price": 300000}, headers=first
+        )
+        removed = self.client.post("/saved-searches", json={"keyword": "bike"}, headers=second).json()
+        self.assertEqual(
+            self.client.post("/saved-searches", json={"min_price": 10}, headers=second).status_code,
+            400,
+        )
+        self.client.delete(f"/saved-searches/{removed['id']}", headers=second)
+
+        product = ProductService(self.db).create(
+            self.seller_id,
+            ProductCreate(
+                title="Road bike",
+                price=250000,
+                description="Carbon frame",
+                category="etc",
+                condition="used",
+            ),
+        )
+        self.assertEqual(saved_search_alerts.drain(), 1)
+
+        inbox = self.client.get("/notifications", headers=first).json()
+        self.assertEqual([item["product_id"] for item in inbox["items"]], [product.id])
+        self.assertEqual(inbox["unread_count"], 1)
+        self.assertEqual(self.client.get("/notifications", headers=second).json()["items"], [])
+
+        self.client.post("/notifications/read", json={"up_to_id": inbox["items"][0]["id"]}, headers=first)
+        self.assertEqual(self.client.get("/notifications", headers=first).json()["unread_count"], 0)
+
+    def test_alerts_fire_exactly_when_the_search_returns_the_listing(self):
+        first = self.auth(self.first_id)
+        keywords = ["phone", "자전거", "galaxy s24", "GALAXY", "s2_", "100%", "bike"]
+        for keyword in keywords:
+            self.client.post("/saved-searches", json={"keyword": keyword}, headers=first)
+        titles = ["Apple iPhone 13", "중고자전거 팝니다", "Galaxy  S24", "Galaxy S24 Ultra", "100% cotton", "Bicycle"]
+        service = ProductService(self.db)
+        for title in titles:
+            service.create(
+                self.seller_id,
+                ProductCreate(title=title, price=1000, description="desc", category="etc", condition="used"),
+            )
+        saved_search_alerts.drain()
+
+        searches = {item["id"]: item["keyword"] for item in self.client.get("/saved-searches", headers=first).json()}
+        alerted = {(searches[row.saved_search_id], row.product_id) for row in self.db.scalars(select(Notification))}
+        expected = {
+            (keyword, item["id"])
+            for keyword in keywords
+            for item in self.client.get("/products", params={"keyword": keyword}).json()["items"]
+        }
+        # One notification per user per listing: the lowest matching search id.
+        first_match = {}
+        for keyword, product_id in sorted(expected, key=lambda pair: keywords.index(pair[0])):
+            first_match.setdefault(product_id, keyword)
+        self.assertEqual(alerted, {(keyword, product_id) for product_id, keyword in first_match.items()})
+        self.assertEqual(len(first_match), 5)
+
+    def test_deleted_search_leaves_the_index(self):
+        first = self.auth(self.first_id)
+        created = self.client.post("/saved-searches", json={"keyword": "bike"}, headers=first).json()
+        saved_search_alerts.refresh()
+        self.assertEqual(len(saved_search_alerts.index), 1)
+        self.client.delete(f"/saved-searches/{created['id']}", headers=first)
+        saved_search_alerts.refresh()
+        self.assertEqual(len(saved_search_alerts.index), 0)
+
+    def test_deleted_listing_leaves_no_notifications(self):
+        first = self.auth(self.first_id)
+        self.client.post("/saved-searches", json={"keyword": "bike"}, headers=first)
+        service = ProductService(self.db)
+        payload = ProductCreate(title="Bike", price=1000, description="desc", category="etc", condition="used")
+        delivered = service.create(self.seller_id, payload)
+        self.assertEqual(saved_search_alerts.drain(), 1)
+        queued = service.create(self.seller_id, payload)
+
+        service.delete(self.seller_id, delivered.id)
+        service.delete(self.seller_id, queued.id)
+        self.assertEqual(saved_search_alerts.drain(), 0)
+        inbox = self.client.get("/notifications", headers=first)
+        self.assertEqual(inbox.status_code, 200)
+        self.assertEqual(inbox.json()["items"], [])
+
+    def test_blinded_listing_is_hidden_from_the_inbox(self):
+        first = self.auth(self.first_id)
+        self.client.post("/saved-searches", json={"keyword": "bike"}, headers=first)
+        service = ProductService(self.db)
+        payload = ProductCreate(title="Bike", price=1000, description="desc", category="etc", condition="used")
+        kept = service.create(self.seller_id, payload)
+        blinded = service.create(self.seller_id, payload)
+        self.assertEqual(saved_search_alerts.drain(), 2)
+
+        service.blind(blinded.id, "spam")
+        inbox = self.client.get("/notifications", headers=first).json()
+        self.assertEqual([item["product_id"] for item in inbox["items"]], [kept.id])
+        self.assertEqual(inbox["unread_count"], 1)
+
+        service.unblind(blinded.id)
+        inbox = self.client.get("/notifications", headers=first).json()
+        self.assertEqual([item["product_id"] for item in inbox["items"]], [blinded.id, kept.id])
+        self.assertEqual(inbox["unread_count"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Product, ProductStatus, SellerStats, User
+from app.schemas.product import ProductCreate
+from app.services.product_service import ProductService
+from app.services.purchase_service import PurchaseService
+from app.services.seller_service import invalidate_sellers, seller_cache
+
+
+class SellerStorefrontTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        seller_cache.clear()
+        self.db = SessionLocal()
+        seller = User(email="seller@example.com", nickname="seller", password_hash="x")
+        buyer = User(email="buyer@example.com", nickname="buyer", password_hash="x")
+        self.db.add_all([seller, buyer])
+        self.db.commit()
+        self.seller_id = seller.id
+        self.buyer_id = buyer.id
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def create(self, index: int) -> int:
+        return (
+            ProductService(self.db)
+            .create(
+                self.seller_id,
+                ProductCreate(
+                    title=f"Item {index}", price=1000, description="desc", category="etc", condition="used"
+                ),
+            )
+            .id
+        )
+
+    def storefront(self, headers=None, **params):
+        return self.client.get(f"/sellers/{self.seller_id}/products", params=params, headers=headers)
+
+    def test_keyset_pages_cover_every_listing_once(self):
+        product_ids = [self.create(index) for index in range(7)]
+        # Ties on created_at are broken by id, so no row is skipped or repeated.
+        self.db.execute(
+            update(Product).where(Product.id.in_(product_ids[2:5])).values(created_at=datetime(2024, 1, 1))
+        )
+        self.db.commit()
+        expected = [
+            product_id
+            for product_id, in self.db.execute(
+                select(Product.id).order_by(Product.created_at.desc(), Product.id)
+            ).all()
+        ]
+
+        seen, cursor = [], None
+        while True:
+            body = self.storefront(limit=2, **({"cursor": cursor} if cursor else {})).json()
+            seen.extend(item["id"] for item in body["items"])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, expected)
+        self.assertEqual(self.storefront(cursor="not-a-cursor").status_code, 400)
+        self.assertEqual(self.client.get("/sellers/9999/products").status_code, 404)
+
+    def test_header_counts_follow_sales_and_blinds(self):
+        # No seller_stats row yet, as for sellers that predate the table.
+        sold, hidden, *_ = [self.create(index) for index in range(4)]
+        self.assertIsNotNone(self.db.get(SellerStats, self.seller_id))
+        PurchaseService(self.db).buy_now(self.buyer_id, sold)
+        ProductService(self.db).blind(hidden, "spam")
+        seller_cache.clear()
+
+        body = self.storefront().json()
+        self.assertEqual(
+            body["seller"],
+            {"id": self.seller_id, "nickname": "seller", "active_count": 2, "sold_count": 1},
+        )
+        self.assertEqual(len(body["items"]), 3)
+        self.assertEqual([item["id"] for item in self.storefront(status="sold").json()["items"]], [sold])
+
+        # The header is served from cache until the outbox reports the seller's change.
+        self.create(4)
+        self.assertEqual(self.storefront().json()["seller"]["active_count"], 2)
+        invalidate_sellers([SimpleNamespace(seller_id=self.seller_id)])
+        self.assertEqual(self.storefront().json()["seller"]["active_count"], 3)
+
+        owner = {"Authorization": f"Bearer {create_access_token(str(self.seller_id))}"}
+        self.assertEqual(len(self.storefront(headers=owner).json()["items"]), 5)
+
+    def test_status_filter_uses_storefront_index(self):
+        stmt = (
+            select(Product)
+            .where(Product.seller_id == 1, Product.status == ProductStatus.ON_SALE)
+            .order_by(Product.created_at.desc(), Product.id)
+            .limit(20)
+        )
+        compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+        plan = self.db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+        self.assertTrue(any("ix_products_seller_status_created" in row[-1] for row in plan), plan)
+        self.assertFalse(any("TEMP B-TREE" in row[-1] for row in plan), plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import unittest
+from types import SimpleNamespace
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+
+from app.core.database import Base, SessionLocal, engine
+from app.main import app
+from app.models import ProductCategory, User
+from app.schemas.product import ProductCreate
+from app.services import recommendation_service
+from app.services.product_service import ProductService
+from app.services.purchase_service import PurchaseService
+from app.services.recommendation_service import SimilarItemsIndex
+
+
+class SimilarItemsTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        self.db = SessionLocal()
+        seller = User(email="seller@example.com", nickname="seller", password_hash="x")
+        buyer = User(email="buyer@example.com", nickname="buyer", password_hash="x")
+        self.db.add_all([seller, buyer])
+        self.db.commit()
+        self.seller_id = seller.id
+        self.buyer_id = buyer.id
+        self.original_index = recommendation_service.similar_items
+        self.index = SimilarItemsIndex(SessionLocal, dimensions=256, memory_budget_mb=4)
+        recommendation_service.similar_items = self.index
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        recommendation_service.similar_items = self.original_index
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def create(self, title: str, description: str, category: str = "etc") -> int:
+        return (
+            ProductService(self.db)
+            .create(
+                self.seller_id,
+                ProductCreate(
+                    title=title, price=1000, description=description, category=category, condition="used"
+                ),
+            )
+            .id
+        )
+
+    def similar(self, product_id: int) -> list[int]:
+        response = self.client.get(f"/products/{product_id}/similar", params={"limit": 3})
+        return [item["id"] for item in response.json()]
+
+    def test_similar_items_rank_by_text_and_skip_unlisted(self):
+        source = self.create("Trek road bike", "Carbon road bike, 54cm frame")
+        close = self.create("Giant road bike", "Aluminium road bike with carbon fork")
+        korean = self.create("로드 자전거", "자전거를 팝니다 road bike")
+        self.create("Desk lamp", "Warm light lamp for desk")
+        self.create("Road bike helmet", "Helmet for road cycling", category="clothes")
+        sold = self.create("Specialized road bike", "Carbon road bike")
+        hidden = self.create("Cheap road bike", "road bike road bike")
+        PurchaseService(self.db).buy_now(self.buyer_id, sold)
+        ProductService(self.db).blind(hidden, "spam")
+        self.index.build()
+
+        similar = self.similar(source)
+        self.assertEqual(similar[:2], [close, korean])
+        self.assertFalse({sold, hidden} & set(similar))
+
+        newer = self.create("Cannondale road bike", "Carbon road bike, like new")
+        ProductService(self.db).blind(close, "spam")
+        self.index.on_events([SimpleNamespace(product_id=newer), SimpleNamespace(product_id=close)])
+
+        similar = self.similar(source)
+        self.assertEqual(similar[:2], [newer, korean])
+        self.assertNotIn(close, similar)
+        self.assertEqual(self.client.get(f"/products/{hidden}/similar").status_code, 404)
+
+    def test_memory_budget_evicts_oldest(self):
+        index = SimilarItemsIndex(SessionLocal, dimensions=64, memory_budget_mb=1)
+        rows = [
+            SimpleNamespace(id=product_id, category=ProductCategory.BOOKS, title=f"novel {product_id}", description="")
+            for product_id in range(1, index.max_items + 501)
+        ]
+        for start in range(0, len(rows), 1000):
+            index.add_many(rows[start : start + 1000], fresh=True)
+
+        self.assertLessEqual(len(index), index.max_items)
+        books = index.categories[ProductCategory.BOOKS]
+        self.assertEqual(int(books.ids[books.size - 1]), len(rows))
+        self.assertIsNone(books.slot_of(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
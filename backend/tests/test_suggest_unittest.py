@@ -0,0 +1,113 @@
+import os
+import unittest
+from types import SimpleNamespace
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_secondhand.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from fastapi.testclient import TestClient
+
+from app.core.database import Base, SessionLocal, engine
+from app.main import app
+from app.models import User
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services import suggest_service
+from app.services.product_service import ProductService
+from app.services.purchase_service import PurchaseService
+from app.services.suggest_service import SuggestIndex
+
+
+class SuggestIndexTest(unittest.TestCase):
+    def test_word_prefixes_and_korean_syllables_in_progress(self):
+        index = SuggestIndex(None, limit=10)
+        index.upsert(1, "Trek Road Bike")
+        index.upsert(2, "로드 자전거 팝니다")
+        index.upsert(3, "닭가슴살 1kg")
+        index.upsert(4, "Café table")
+        index.upsert(5, "Road lamp")
+
+        def ids(text: str) -> list[int]:
+            return [item.product_id for item in index.suggest(text, 5)]
+
+        self.assertEqual(ids("bi"), [1])
+        self.assertEqual(ids("road b"), [1])
+        self.assertEqual(ids("자저"), [2])
+        self.assertEqual(ids("자전ㄱ"), [2])
+        self.assertEqual(ids("잔"), [])
+        self.assertEqual(ids("닭"), [3])
+        self.assertEqual(ids("달"), [3])
+        self.assertEqual(ids("cafe"), [4])
+        self.assertEqual(ids("ro"), [5, 1])
+
+    def test_large_prefix_ranges_keep_newest_head(self):
+        index = SuggestIndex(None, limit=5)
+        for product_id in range(1, 2001):
+            index.upsert(product_id, f"bike {product_id}")
+        self.assertEqual([item.product_id for item in index.suggest("b", 3)], [2000, 1999, 1998])
+
+        index.upsert(5000, "bike new")
+        index.remove(2000)
+        index.upsert(1999, "lamp")
+        self.assertEqual([item.product_id for item in index.suggest("b", 3)], [5000, 1998, 1997])
+
+
+class SuggestEndpointTest(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        self.db = SessionLocal()
+        seller = User(email="seller@example.com", nickname="seller", password_hash="x")
+        buyer = User(email="buyer@example.com", nickname="buyer", password_hash="x")
+        self.db.add_all([seller, buyer])
+        self.db.commit()
+        self.seller_id = seller.id
+        self.buyer_id = buyer.id
+        self.original_index = suggest_service.suggest_index
+        self.index = SuggestIndex(SessionLocal, limit=10)
+        suggest_service.suggest_index = self.index
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        suggest_service.suggest_index = self.original_index
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        engine.dispose()
+        if os.path.exists("test_secondhand.db"):
+            os.remove("test_secondhand.db")
+
+    def create(self, title: str) -> int:
+        return (
+            ProductService(self.db)
+            .create(
+                self.seller_id,
+                ProductCreate(title=title, price=1000, description="desc", category="etc", condition="used"),
+            )
+            .id
+        )
+
+    def test_rebuild_and_events_keep_suggestions_current(self):
+        kept = self.create("Trek road bike")
+        sold = self.create("Giant road bike")
+        renamed = self.create("Road helmet")
+        PurchaseService(self.db).buy_now(self.buyer_id, sold)
+        self.index.build()
+
+        def titles(q: str) -> list[str]:
+            return [item["title"] for item in self.client.get("/products/suggest", params={"q": q}).json()]
+
+        self.assertEqual(titles("road"), ["Road helmet", "Trek road bike"])
+
+        ProductService(self.db).update(self.seller_id, renamed, ProductUpdate(title="Desk lamp"))
+        ProductService(self.db).delete(self.seller_id, kept)
+        self.index.on_events([SimpleNamespace(product_id=renamed), SimpleNamespace(product_id=kept)])
+
+        self.assertEqual(titles("road"), [])
+        self.assertEqual(titles("LAMP"), ["Desk lamp"])
+        self.assertEqual(titles(""), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,6 +13,8 @@ type AdminProduct = {
   is_blinded: boolean;
   blind_reason: string | null;
   seller_nickname: string;
+  price: number;
+  price_anomaly_score: number | null;
 };
 
 export default function AdminPage() {
@@ -24,12 +26,14 @@ export default function AdminPage() {
   const [isAdmin, setIsAdmin] = useState(false);
   const [isLoading, setIsLoading] = useState(true);
   const [isMutating, setIsMutating] = useState(false);
+  const [suspiciousOnly, setSuspiciousOnly] = useState(false);
 
   const load = async () => {
     setIsLoading(true);
     try {
       setError("");
-      const data = await request<{ items: AdminProduct[] }>("/admin/products", { auth: true });
+      const path = suspiciousOnly ? "/admin/products?suspicious=true" : "/admin/products";
+      const data = await request<{ items: AdminProduct[] }>(path, { auth: true });
       setItems(data.items);
       setReasonById((prev) => {
         const next = { ...prev };
@@ -69,7 +73,7 @@ export default function AdminPage() {
     if (isAdmin) {
       void load();
     }
-  }, [isAdmin]);
+  }, [isAdmin, suspiciousOnly]);
 
   if (isAccessChecking) {
     return <p className="text-sm text-slate-600">권한 확인 중...</p>;
@@ -117,6 +121,10 @@ export default function AdminPage() {
       <p className="font-semibold">{item.title}</p>
       <p className="text-sm">판매자: {item.seller_nickname}</p>
       <p className="text-sm">상태: {item.status}</p>
+      <p className="text-sm">
+        가격: {item.price.toLocaleString()}원
+        {item.price_anomaly_score !== null && ` (시세 대비 점수 ${item.price_anomaly_score.toFixed(1)})`}
+      </p>
       <p className="text-sm">블라인드: {item.is_blinded ? `Y (${item.blind_reason})` : "N"}</p>
       <div className="mt-2 flex gap-2">
         <input
@@ -155,6 +163,14 @@ export default function AdminPage() {
   return (
     <section className="space-y-3">
       <h1 className="text-xl font-bold">관리자 상품 관리</h1>
+      <label className="flex items-center gap-2 text-sm">
+        <input
+          type="checkbox"
+          checked={suspiciousOnly}
+          onChange={(e) => setSuspiciousOnly(e.target.checked)}
+        />
+        시세보다 지나치게 싼 상품만 보기
+      </label>
       {isLoading && <p className="text-sm text-slate-600">관리자 목록 로딩 중...</p>}
       {error && <p className="text-sm text-red-600">{error}</p>}
 